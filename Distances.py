@@ -1,10 +1,9 @@
-import json
-import unidecode
-from thefuzz import fuzz
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from jellyfish import _jellyfish as jellyfish
-import nltk 
+import functools
+import normalized_fields
+from text_normalization import fold, content_tokens, TEXT_NORMALIZATION_CACHE_SIZE
+
+# thefuzz, jellyfish e rapidfuzz (dependência do thefuzz) são importados no primeiro uso para
+# reduzir o cold start
 
 class distances:
     
@@ -12,31 +11,22 @@ class distances:
     def __init__(self, s1, s2):
         self.s1 = s1
         self.s2 = s2
-        
-        nltk.data.path.append("/opt/nltk_data")
-
-        self.stop_words = set(stopwords.words("portuguese"))
-        
-        self.normalized_s1 = unidecode.unidecode(s1).lower()
-        self.normalized_s2 = unidecode.unidecode(s2).lower()
-            
-    
+        # Normalização memorizada no nível do módulo (text_normalization), compartilhada por todas as comparações
+        self.normalized_s1 = fold(s1)
+        self.normalized_s2 = fold(s2)
+
     def jaro_winkler_similarity(self):
+        from jellyfish import _jellyfish as jellyfish
+
         return 100 * jellyfish.jaro_winkler_similarity(
             self.normalized_s1, self.normalized_s2
         )
     
     def find_abbreviation_match(self):
-        normalized_s1_tokens = [
-            word
-            for word in word_tokenize(self.normalized_s1)
-            if word not in self.stop_words
-        ]
-        normalized_s2_tokens = [
-            word
-            for word in word_tokenize(self.normalized_s2)
-            if word not in self.stop_words
-        ]
+        from thefuzz import fuzz
+
+        normalized_s1_tokens = content_tokens(self.normalized_s1)
+        normalized_s2_tokens = content_tokens(self.normalized_s2)
 
         s1_abbreviation = [token[0] for token in normalized_s1_tokens]
         s2_abbreviation = [token[0] for token in normalized_s2_tokens]
@@ -45,10 +35,194 @@ class distances:
 
         return score
 
-    def norm_score(self, jw_weight=1, ab_weight=0.2):
-        jw_score = self.jaro_winkler_similarity()
+    def norm_score(self, jw_weight=1, ab_weight=0.2, cutoff=None):
+        """
+        Score de similaridade (0 a 100) combinando Jaro-Winkler e abreviação.
+
+        Com cutoff, o score só é calculado se ainda puder chegar a ele: primeiro um limite
+        superior pelos comprimentos e pelo prefixo comum, depois a abreviação (barata) com esse
+        limite no lugar do Jaro-Winkler, e só então o Jaro-Winkler. Abaixo do corte o retorno é
+        0; a partir dele, o score é o mesmo de sempre.
+        """
+        key = (self.normalized_s1, self.normalized_s2, jw_weight, ab_weight)
+        score = _known_score(key)
+        if score is None:
+            score = self._compute_score(jw_weight, ab_weight, cutoff)
+            if score is None:
+                return 0
+            _remember_score(key, score)
+        return score if cutoff is None or score >= cutoff else 0
+
+    def _compute_score(self, jw_weight, ab_weight, cutoff):
+        # None quando os limites já mostram que o score não chega ao cutoff
+        if cutoff is None:
+            return _combine(self.jaro_winkler_similarity(), self.find_abbreviation_match(), jw_weight, ab_weight)
+
+        jw_bound = _jaro_winkler_bound(self.normalized_s1, self.normalized_s2)
+        if _upper_bound(jw_bound, jw_weight, ab_weight) < cutoff:
+            return None
         ab_score = self.find_abbreviation_match()
-        if jw_score == 0 or ab_score == 0:
+        if ab_score == 0:
             return 0
-        jw_score = (jw_score - 50) * 2
-        return (jw_weight * jw_score + ab_score * ab_weight) / (jw_weight + ab_weight)
\ No newline at end of file
+        if _combine(jw_bound, ab_score, jw_weight, ab_weight) < cutoff:
+            return None
+        return _combine(self.jaro_winkler_similarity(), ab_score, jw_weight, ab_weight)
+
+
+def _known_score(key):
+    """
+    norm_score já calculado para key no memo da mensagem (normalized_fields); None se ainda não
+    foi calculado.
+    """
+    campos = normalized_fields.current()
+    return campos.score(key) if campos is not None else None
+
+
+def _remember_score(key, score):
+    campos = normalized_fields.current()
+    if campos is not None:
+        campos.store_score(key, score)
+
+
+def _combine(jw_score, ab_score, jw_weight, ab_weight):
+    if jw_score == 0 or ab_score == 0:
+        return 0
+    jw_score = (jw_score - 50) * 2
+    return (jw_weight * jw_score + ab_score * ab_weight) / (jw_weight + ab_weight)
+
+
+def _upper_bound(jw_score, jw_weight, ab_weight):
+    # Maior norm_score possível dado o Jaro-Winkler, supondo a abreviação perfeita (100)
+    return (jw_weight * (jw_score - 50) * 2 + 100 * ab_weight) / (jw_weight + ab_weight)
+
+
+def _jaro_winkler_bound(s1, s2):
+    """
+    Maior Jaro-Winkler (0 a 100) possível entre s1 e s2 sem compará-los caractere a caractere.
+
+    No Jaro, os caracteres em comum são no máximo o comprimento do menor texto, então
+    jaro <= (2 + menor/maior) / 3; o bônus de Winkler usa o prefixo comum real (até 4). A margem
+    cobre arredondamentos de ponto flutuante.
+    """
+    l1, l2 = len(s1), len(s2)
+    if not l1 or not l2:
+        return 0
+    jaro = (2 + min(l1, l2) / max(l1, l2)) / 3
+    prefixo = 0
+    for c1, c2 in zip(s1[:4], s2[:4]):
+        if c1 != c2:
+            break
+        prefixo += 1
+    return 100 * (jaro + prefixo * 0.1 * (1 - jaro)) + 1e-9
+
+
+@functools.lru_cache(maxsize=TEXT_NORMALIZATION_CACHE_SIZE)
+def _abbreviation(normalized):
+    # Iniciais dos tokens sem stopwords, como em find_abbreviation_match
+    return " ".join(token[0] for token in content_tokens(normalized))
+
+
+def _score_normalized(query, query_abbreviation, candidates, jw_weight, ab_weight, score_cutoff):
+    """
+    norm_score de query contra cada candidato, todos já normalizados, com a mesma ordem de
+    cálculo de norm_score(cutoff=...): o Jaro-Winkler, que é o mais caro, fica por último e é
+    dispensado quando a abreviação é 0 ou quando os limites já impedem atingir score_cutoff.
+    query_abbreviation é calculada só se algum candidato precisar dela.
+    """
+    from jellyfish import _jellyfish as jellyfish
+    from thefuzz import fuzz
+
+    scores = []
+    for candidate in candidates:
+        key = (query, candidate, jw_weight, ab_weight)
+        score = _known_score(key)
+        if score is not None:
+            scores.append(score if score_cutoff is None or score >= score_cutoff else 0)
+            continue
+        jw_bound = None
+        if score_cutoff is not None:
+            jw_bound = _jaro_winkler_bound(query, candidate)
+            if _upper_bound(jw_bound, jw_weight, ab_weight) < score_cutoff:
+                scores.append(0)
+                continue
+        if query_abbreviation is None:
+            query_abbreviation = _abbreviation(query)
+        ab_score = fuzz.ratio(query_abbreviation, _abbreviation(candidate))
+        if ab_score == 0:
+            score = 0
+        elif jw_bound is not None and _combine(jw_bound, ab_score, jw_weight, ab_weight) < score_cutoff:
+            scores.append(0)
+            continue
+        else:
+            score = _combine(100 * jellyfish.jaro_winkler_similarity(query, candidate), ab_score, jw_weight, ab_weight)
+        _remember_score(key, score)
+        scores.append(score if score_cutoff is None or score >= score_cutoff else 0)
+    return scores
+
+
+def _score_batch(list_a, list_b, jw_weight, ab_weight, score_cutoff):
+    """
+    Matriz (NumPy) len(list_a) x len(list_b) com o norm_score de cada par, calculada em lote
+    pelo rapidfuzz.process.cdist (em C, sem um laço do Python por par): o Jaro-Winkler dos textos
+    normalizados e o fuzz.ratio das abreviações, arredondado como no thefuzz, combinados como em
+    _combine. Os scores são idênticos aos do norm_score (scripts/bench_score_many.py confere).
+    """
+    import numpy as np
+    from rapidfuzz import fuzz, process
+    from rapidfuzz.distance import JaroWinkler
+
+    normalized_a = [fold(text) for text in list_a]
+    normalized_b = [fold(text) for text in list_b]
+    if not normalized_a or not normalized_b:
+        return np.zeros((len(normalized_a), len(normalized_b)), dtype=float)
+    jw_score = 100 * process.cdist(normalized_a, normalized_b, scorer=JaroWinkler.similarity, dtype=np.float64)
+    ab_score = np.rint(process.cdist([_abbreviation(text) for text in normalized_a],
+                                     [_abbreviation(text) for text in normalized_b],
+                                     scorer=fuzz.ratio, dtype=np.float64))
+    # Para o jellyfish, o Jaro-Winkler com um texto vazio é 0 (no rapidfuzz, dois vazios dão 1)
+    vazios = (np.array([not text for text in normalized_a])[:, None]
+              | np.array([not text for text in normalized_b])[None, :])
+    scores = (jw_weight * ((jw_score - 50) * 2) + ab_score * ab_weight) / (jw_weight + ab_weight)
+    scores[vazios | (jw_score == 0) | (ab_score == 0)] = 0
+    if score_cutoff is not None:
+        scores[scores < score_cutoff] = 0
+    return scores
+
+
+def score_many(query, candidates, jw_weight=1, ab_weight=0.2, score_cutoff=None):
+    """
+    distances(query, candidato).norm_score() para cada candidato, num array do NumPy, calculado
+    em lote (_score_batch). Com score_cutoff, qualquer score abaixo do corte sai como 0.
+
+    Não passa pelo memo de scores da mensagem: para laços que param no
+    primeiro candidato acima do limiar, use iter_norm_scores.
+    """
+    return _score_batch([query], list(candidates), jw_weight, ab_weight, score_cutoff)[0]
+
+
+def score_matrix(list_a, list_b, jw_weight=1, ab_weight=0.2, score_cutoff=None):
+    """
+    Como cdist, mas em listas do Python e par a par: usa o memo de scores da mensagem e os
+    limites de norm_score(cutoff=...) de cada par. Para listas pequenas, como os blocos do
+    name_matching, em que montar o lote não compensa.
+    """
+    normalized_b = [fold(candidate) for candidate in list_b]
+    return [_score_normalized(fold(query), None, normalized_b, jw_weight, ab_weight, score_cutoff) for query in list_a]
+
+
+def cdist(list_a, list_b, jw_weight=1, ab_weight=0.2, score_cutoff=None):
+    """
+    Matriz len(list_a) x len(list_b) com o norm_score de cada par, calculada em lote como em score_many.
+    """
+    return _score_batch(list(list_a), list(list_b), jw_weight, ab_weight, score_cutoff)
+
+
+def iter_norm_scores(query, candidates, jw_weight=1, ab_weight=0.2):
+    """
+    Gera, na ordem, o norm_score de query contra cada candidato, para os laços dos validadores
+    que param no primeiro nome acima do limiar: cada candidato só é pontuado quando o laço chega
+    nele, então os que vêm depois do primeiro encontrado não custam nada (e um candidato que não
+    é str, como None, só dá erro se for alcançado, como antes).
+    """
+    for candidate in candidates:
+        yield distances(query, candidate).norm_score(jw_weight, ab_weight)
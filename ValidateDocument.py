@@ -2,11 +2,22 @@ from datetime import datetime
 import logging
 from abc import ABC, abstractmethod
 from functools import wraps
+from contextlib import nullcontext
 import os
-from mongodb_connections import MongoDBConnections
+from mongodb_connections import MongoDBConnections, is_mongo_unavailable
+from validation_metrics import ValidationMetrics, ValidationTimer, estimated_cost_ms, UNKNOWN_COST_MS
+import result_cache
+from models import is_document_model
+import validation_profiling
+import normalized_fields
 from enum import Enum
 import traceback
 import re
+import time
+from copy import deepcopy
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 UUID = os.environ['UUID']
@@ -15,6 +26,12 @@ AGREGADOR = os.environ["AGREGADOR"]
 SIMILARITY_LIST = os.environ["SIMILARITY_LIST"]
 DOCUMENT_ID = os.environ["DOCUMENT_ID"]
 DOCUMENT_LABEL = os.environ["DOCUMENT_LABEL"]
+PARALLEL_WORKERS = int(os.environ.get('PARALLEL_WORKERS', '4'))
+PARALLEL_VALIDATIONS_ENABLED = os.environ.get('PARALLEL_VALIDATIONS_ENABLED', 'true').lower() not in {'false', '0', 'no'}
+
+# Estado de cada chamada de validação (documentos faltantes e leituras no Mongo). Fica por thread
+# porque, no modo paralelo, várias validações da mesma instância executam ao mesmo tempo.
+_call_state = threading.local()
 
 class ValidationResultCode(Enum):
     NAO_ENCONTRADO = 404
@@ -26,44 +43,215 @@ class ValidationResultCode(Enum):
     OK = 200
 
 
+class RequiredDocsCache:
+    """
+    Documentos buscados por required_docs para uma instância de validador (ou seja, uma mensagem).
+
+    As validações que pedem o mesmo documento reaproveitam a primeira busca; cada chamada recebe
+    uma cópia, já que algumas validações alteram os documentos recebidos. Buscas que falham não
+    são guardadas, então a próxima validação tenta de novo.
+    """
+
+    def __init__(self, connection=None):
+        self._values = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Conexão compartilhada (ex.: a da validação em lote); sem ela, cada thread abre a sua
+        self._shared_connection = connection
+        self.hits = 0
+
+    def connection(self):
+        if self._shared_connection is not None:
+            return self._shared_connection
+        # Uma conexão por thread: no modo paralelo cada thread conta as próprias leituras no Mongo
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = MongoDBConnections()
+        return conn
+
+    def get(self, key, loader):
+        """
+        Retorna (cópia do valor, se foi reaproveitado). loader só é chamado na primeira vez que a chave é pedida.
+        """
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            hit = key in self._values
+            if hit:
+                with self._lock:
+                    self.hits += 1
+            else:
+                self._values[key] = loader()
+            return deepcopy(self._values[key]), hit
+
+
+_required_docs_cache_lock = threading.Lock()
+
+
+def _get_required_docs_cache(validator):
+    with _required_docs_cache_lock:
+        cache = validator.__dict__.get('_required_docs_cache')
+        if cache is None:
+            cache = validator._required_docs_cache = RequiredDocsCache()
+    return cache
+
+
+def _fetch_required_docs(validator, docs, include_matriz=False, include_docs_same_type_from_proposal=False):
+    """
+    Busca (ou reaproveita do RequiredDocsCache) os documentos pedidos por required_docs.
+    Retorna o dicionário de documentos a ser passado para a validação e registra no estado
+    da chamada os documentos faltantes, as leituras no Mongo e os reaproveitamentos.
+    """
+    docs_json = {}
+    required_docs_missed = []
+    cache = _get_required_docs_cache(validator)
+    mongo_conn = cache.connection()
+    mongo_reads_start = mongo_conn.reads
+    hits = 0
+
+    def fetch(key, loader):
+        nonlocal hits
+        value, hit = cache.get(key, loader)
+        hits += hit
+        return value
+
+    # Garante que UUID e AGREGADOR sejam atualizados para cada execução se vier de os.environ
+    current_uuid = os.environ.get('UUID', UUID)
+    current_doc_id = os.environ.get('DOCUMENT_ID', DOCUMENT_ID)
+    current_agregador = os.environ.get('AGREGADOR', AGREGADOR)
+    current_doc_label = os.environ.get('DOCUMENT_LABEL', DOCUMENT_LABEL)
+    parent_company = fetch(('parent_company', current_uuid), lambda: mongo_conn.lookup_parent_company(current_uuid))
+
+    if include_matriz:
+        docs_json['matriz'] = {}
+
+    similarity_list = SIMILARITY_LIST.split("|")
+    for doc in docs:
+        # Busca dados no MongoDB com base no parâmetro
+        if include_docs_same_type_from_proposal and doc in similarity_list :
+            docs_json[doc] = fetch(('similarity_documents', current_agregador, doc, current_doc_id),
+                                   lambda: mongo_conn.similarity_documents(current_agregador, doc, current_doc_id))
+            
+        else:
+            docs_json[doc] = fetch(('document', doc, current_doc_label, current_uuid),
+                                   lambda: mongo_conn.request_data_mongodb(doc, current_doc_label, current_uuid))
+            if docs_json[doc] is None and doc not in required_docs_missed:
+                required_docs_missed.append(doc)
+            if include_matriz and parent_company:
+                docs_json['matriz'][doc] = fetch(('document', doc, current_doc_label, parent_company),
+                                                 lambda: mongo_conn.request_data_mongodb(doc, current_doc_label, parent_company))
+                if docs_json['matriz'][doc] is None and doc not in required_docs_missed:
+                    required_docs_missed.append(doc)
+    # Armazena os dados de documentos faltantes
+    _call_state.required_docs_missed = required_docs_missed
+    _call_state.mongo_reads = getattr(_call_state, 'mongo_reads', 0) + mongo_conn.reads - mongo_reads_start
+    _call_state.required_docs_hits = getattr(_call_state, 'required_docs_hits', 0) + hits
+    return docs_json
+
+
 def required_docs(*docs, include_matriz=False, include_docs_same_type_from_proposal=False):
     def decorator(func):
         @wraps(func)
         def wrapper(self, *func_args, **func_kwargs):
-            docs_json = {}
-            required_docs_missed = []
-            mongo_conn = MongoDBConnections()
-
-            # Garante que UUID e AGREGADOR sejam atualizados para cada execução se vier de os.environ
-            current_uuid = os.environ.get('UUID', UUID)
-            current_doc_id = os.environ.get('DOCUMENT_ID', DOCUMENT_ID)
-            current_agregador = os.environ.get('AGREGADOR', AGREGADOR)
-            current_doc_label = os.environ.get('DOCUMENT_LABEL', DOCUMENT_LABEL)
-            parent_company = mongo_conn.lookup_parent_company(current_uuid)
-
-            if include_matriz:
-                docs_json['matriz'] = {}
-
-            similarity_list = SIMILARITY_LIST.split("|")
-            for doc in docs:
-                # Busca dados no MongoDB com base no parâmetro
-                if include_docs_same_type_from_proposal and doc in similarity_list :
-                    docs_json[doc] = mongo_conn.similarity_documents(current_agregador, doc, current_doc_id)
-                    
-                else:
-                    docs_json[doc] = mongo_conn.request_data_mongodb(doc, current_doc_label, current_uuid)
-                    if docs_json[doc] is None and doc not in required_docs_missed:
-                        required_docs_missed.append(doc)
-                    if include_matriz and parent_company:
-                        docs_json['matriz'][doc] = mongo_conn.request_data_mongodb(doc, current_doc_label, parent_company)
-                        if docs_json['matriz'][doc] is None and doc not in required_docs_missed:
-                            required_docs_missed.append(doc)
-            # Armazena os dados de documentos faltantes
-            self._required_docs_missed_cache = required_docs_missed
+            # Documentos já buscados para a chave do cache de resultados são reaproveitados
+            prefetched = getattr(_call_state, 'prefetched_docs', None)
+            _call_state.prefetched_docs = None
+            if prefetched is not None and prefetched[0] is wrapper:
+                docs_json = prefetched[1]
+                if isinstance(docs_json, Exception):
+                    # O Mongo já falhou na busca da chave: a validação falha do mesmo jeito, sem nova espera
+                    raise docs_json
+            else:
+                docs_json = _fetch_required_docs(self, docs, include_matriz, include_docs_same_type_from_proposal)
             return func(self, *func_args, **func_kwargs, **docs_json)
+
+        # Usado pelo cache de resultados para incluir os documentos na chave
+        wrapper._required_docs = (docs, include_matriz, include_docs_same_type_from_proposal)
         return wrapper
     return decorator
 
+# Conjunto coringa: a validação lê (ou escreve) qualquer campo
+TODOS_OS_CAMPOS = frozenset({'*'})
+
+
+def accesses(reads=None, writes=()):
+    """
+    Declara os campos lidos e escritos por uma validação, no formato 'objeto.campo'
+    (ex.: 'dados_extraidos.data_emissao'). '*' representa qualquer campo.
+
+    Validações sem declaração são tratadas como se lessem todos os campos e não escrevessem
+    nenhum. validate() usa essas declarações para executar quem escreve um campo antes de
+    quem o lê e para decidir quais validações podem rodar ao mesmo tempo.
+    """
+    def decorator(func):
+        func._reads = TODOS_OS_CAMPOS if reads is None else frozenset(reads)
+        func._writes = frozenset(writes)
+        return func
+    return decorator
+
+
+def cacheable(version):
+    """
+    Permite guardar o resultado da validação no cache de resultados (variável RESULT_CACHE).
+
+    A chave é um hash do validador, do nome e da versão da regra, dos campos lidos (os declarados
+    em @accesses, ou todos os de cartao_proposta e dados_extraidos), dos argumentos e dos documentos
+    de required_docs. A versão deve ser incrementada sempre que a lógica da regra mudar.
+
+    Não deve ser usado em validações que dependem da data atual. Validações que escrevem campos
+    (@accesses(writes=...)) nunca são lidas do cache, pois o efeito colateral não seria refeito.
+    """
+    def decorator(func):
+        func._cache_version = str(version)
+        return func
+    return decorator
+
+
+def _model_fields(obj):
+    if obj is None:
+        return {}
+    if is_document_model(obj):
+        return obj.to_dict()
+    return vars(obj)
+
+
+def _result_cache_key(validator, func, args, kwargs):
+    version = getattr(func, '_cache_version', None)
+    if version is None or getattr(func, '_writes', None) or not result_cache.enabled():
+        return None
+    spec = getattr(func, '_required_docs', None)
+    docs_json = {}
+    if spec is not None:
+        try:
+            docs_json = _fetch_required_docs(validator, *spec)
+        except Exception as e:
+            # A busca não é refeita: required_docs relança o erro e a validação o trata do jeito de
+            # sempre (Mongo fora ou circuito aberto vira SERVICO_INDISPONIVEL sem pagar o timeout de novo)
+            _call_state.prefetched_docs = (func, e)
+            return None
+        # Se a validação executar, required_docs usa estes documentos em vez de buscá-los de novo
+        _call_state.prefetched_docs = (func, docs_json)
+    try:
+        reads = getattr(func, '_reads', TODOS_OS_CAMPOS)
+        campos = {}
+        for nome_objeto in ('cartao_proposta', 'dados_extraidos'):
+            for campo, valor in _model_fields(getattr(validator, nome_objeto, None)).items():
+                nome_campo = f'{nome_objeto}.{campo}'
+                if '*' in reads or nome_campo in reads:
+                    campos[nome_campo] = valor
+        return result_cache.make_key(type(validator).__name__, func.__name__, version,
+                                     validator.get_validate_type(), campos, args, kwargs, docs_json)
+    except Exception as e:
+        # Entrada que não vira chave: a validação executa normalmente, sem cache
+        logger.warning(f'[WARN] Não foi possível calcular a chave de cache de {func.__name__}: {e}')
+        return None
+
+
+def _conflict(campos_a, campos_b):
+    return bool(campos_a) and bool(campos_b) and ('*' in campos_a or '*' in campos_b or not campos_a.isdisjoint(campos_b))
+
+
 def check_error(campo, valid):
     if valid:
         return ValidationResultCode.OK
@@ -77,10 +265,49 @@ def check_error(campo, valid):
         return ValidationResultCode.INVALIDO
 
 
+_NON_CACHEABLE_RESULTS = {
+    ValidationResultCode.ESPERAR_DOCUMENTOS.name,
+    ValidationResultCode.ERRO_INTERNO.name,
+    ValidationResultCode.SERVICO_INDISPONIVEL.name
+}
+
+
 def create_validation_decorator(error_key_name: str):
     def validation_decorator(func):
         @wraps(func)
         def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, '_profiler', None)
+            with profiler.capture(func.__name__) if profiler is not None else nullcontext():
+                timer = ValidationTimer()
+                _call_state.required_docs_missed = []
+                mongo_reads_start = getattr(_call_state, 'mongo_reads', 0)
+                hits_start = getattr(_call_state, 'required_docs_hits', 0)
+                memo_lookups_start, memo_hits_start = normalized_fields.score_counters()
+
+                cache_key = _result_cache_key(self, func, args, kwargs)
+                connection = _get_required_docs_cache(self).connection
+                output = result_cache.get(cache_key, connection) if cache_key is not None else None
+                if output is None:
+                    output = _run_validation(self, *args, **kwargs)
+                    # Resultados que dependem de algo transitório (documento ainda não disponível, erro, Mongo fora) não são guardados
+                    if cache_key is not None and output is not None and output.get(error_key_name) not in _NON_CACHEABLE_RESULTS:
+                        result_cache.put(cache_key, output, connection)
+                _call_state.prefetched_docs = None
+                wall_ms, cpu_ms = timer.elapsed_ms()
+                memo_lookups, memo_hits = normalized_fields.score_counters()
+
+            metrics = getattr(self, '_metrics', None)
+            if metrics is not None:
+                # O tempo de uma validação perfilada inclui o custo do profiler e não entra no custo histórico
+                metrics.record(func.__name__, wall_ms, cpu_ms,
+                               output.get(error_key_name) if output is not None else None,
+                               getattr(_call_state, 'mongo_reads', 0) - mongo_reads_start,
+                               getattr(_call_state, 'required_docs_hits', 0) - hits_start,
+                               memo_lookups - memo_lookups_start, memo_hits - memo_hits_start,
+                               update_cost=profiler is None)
+            return output
+
+        def _run_validation(self, *args, **kwargs):
             # Chama a função original
             name_fn = func.__name__
             val_name_fn = name_fn[name_fn.find('_')+1:]
@@ -110,14 +337,24 @@ def create_validation_decorator(error_key_name: str):
                     }
 
             except Exception as e:
-                # Outros erros não mapeados
-                logger.exception(f"Erro não mapeado encontrado durante a validação {val_name_fn}: {e}")
-                result = {
-                    "valid": False,
-                    "percent_match": 0,
-                    "trecho_encontrado": "",
-                    error_key_name: ValidationResultCode.ERRO_INTERNO.value
-                }
+                if is_mongo_unavailable(e):
+                    # Mongo lento/fora do ar ou circuito aberto: a mensagem será reenfileirada
+                    logger.warning(f"Mongo indisponível durante a validação {val_name_fn}: {e}")
+                    result = {
+                        "valid": False,
+                        "percent_match": 0,
+                        "trecho_encontrado": "",
+                        error_key_name: ValidationResultCode.SERVICO_INDISPONIVEL.value
+                    }
+                else:
+                    # Outros erros não mapeados
+                    logger.exception(f"Erro não mapeado encontrado durante a validação {val_name_fn}: {e}")
+                    result = {
+                        "valid": False,
+                        "percent_match": 0,
+                        "trecho_encontrado": "",
+                        error_key_name: ValidationResultCode.ERRO_INTERNO.value
+                    }
 
             if not isinstance(result, dict):
                 logger.info(f"Necessário fornecer como output um payload válido para '{name_fn}'.")
@@ -127,13 +364,18 @@ def create_validation_decorator(error_key_name: str):
             target = result.get('target', val_name_fn)
             trecho_procurado = result.get('trecho_procurado', getattr(self.cartao_proposta, target, None))
             trecho_encontrado = result.get('trecho_encontrado', getattr(self.dados_extraidos, target, None))
+            # Campos com modelo aninhado (ex.: Endereco) saem no payload como dict
+            if is_document_model(trecho_procurado):
+                trecho_procurado = trecho_procurado.to_dict()
+            if is_document_model(trecho_encontrado):
+                trecho_encontrado = trecho_encontrado.to_dict()
 
             score = max(0, float(result.get('percent_match', 100)))
 
             errorcode = result.get(error_key_name, check_error(trecho_encontrado, valid).value)
 
             if error_key_name == 'regras_subscricao_errors' and errorcode == ValidationResultCode.ESPERAR_DOCUMENTOS.value:
-                docs_missed = getattr(self, '_required_docs_missed_cache', [])
+                docs_missed = getattr(_call_state, 'required_docs_missed', [])
                 logger.info(f'[INFO] {docs_missed} não disponível ainda para {target}.')
                 return {
                     "valid": False,
@@ -163,7 +405,10 @@ validate = create_validation_decorator("regras_subscricao_errors")
 fraud_validate = create_validation_decorator("fraud_errors")
 
 class ValidateDocument(ABC):
-        
+
+    # Quando True, validate() executa em paralelo, num pool de threads, as validações de uma mesma onda.
+    # Só deve ser ligado em classes cujas validações que alteram estado compartilhado o declaram com @accesses.
+    parallel_validations = False
           
     @abstractmethod
     def set_validate_functions_list(self):
@@ -179,34 +424,213 @@ class ValidateDocument(ABC):
     def set_validate_fraud_functions_list(self):
         pass
 
-    def validate(self):
-        document_validations = {}
-        
+    @property
+    def required_docs_hits(self):
+        """
+        Quantas vezes um documento de required_docs foi reaproveitado em vez de buscado de novo no Mongo.
+        """
+        cache = self.__dict__.get('_required_docs_cache')
+        return cache.hits if cache is not None else 0
+
+    def get_validations_list(self):
         if(self.get_validate_type() == "signature"):
-            validacoes = self.set_validate_sign_functions_list()
+            return self.set_validate_sign_functions_list()
         elif self.get_validate_type() == "fraud_metadata":
-            validacoes = self.set_validate_fraud_functions_list()
+            return self.set_validate_fraud_functions_list()
         else:
-            validacoes = self.set_validate_functions_list()
-        
-        for val in validacoes:
-            fn = getattr(self, val)
-            try:
-                output_fn = fn()
-            except Exception as e:
-                logger.error(f"Erro Validaçao: {val}")
-                logger.error(f"Exception: {e}")
-                logger.error(f"Traceback: {traceback.print_exc()}")
-                output_fn = {
-                    "valid": False,
-                    "target": val.replace("validacao_", ""),
-                    "trecho_procurado": '',
-                    "trecho_encontrado": '',
-                    "percent_match": 0,
-                    "regras_subscricao_errors": ValidationResultCode(500).name
-                }
-                document_validations[val] = output_fn
-            if output_fn is not None and hasattr(fn, '_validate'):
+            return self.set_validate_functions_list()
+
+    def _estimated_cost_ms(self, val, document_type):
+        # Custo desconhecido (container frio, sem custo inicial) conta como UNKNOWN_COST_MS, e não
+        # como 0: uma validação cara sem histórico não pode passar na frente nem escapar do prazo
+        custo = estimated_cost_ms(document_type, self.get_validate_type(), val)
+        return UNKNOWN_COST_MS if custo is None else custo
+
+    def _schedule_by_cost(self, validacoes, document_type):
+        return sorted(validacoes, key=lambda val: self._estimated_cost_ms(val, document_type))
+
+    def _exceeds_deadline(self, val, document_type, deadline):
+        return time.monotonic() + self._estimated_cost_ms(val, document_type) / 1000 > deadline
+
+    def _run_single_validation(self, val):
+        """
+        Executa uma validação isolando erros. Retorna o output a ser incluído no resultado ou None.
+        """
+        fn = getattr(self, val)
+        try:
+            output_fn = fn()
+        except Exception as e:
+            logger.error(f"Erro Validaçao: {val}")
+            logger.error(f"Exception: {e}")
+            logger.error(f"Traceback: {traceback.print_exc()}")
+            return {
+                "valid": False,
+                "target": val.replace("validacao_", ""),
+                "trecho_procurado": '',
+                "trecho_encontrado": '',
+                "percent_match": 0,
+                "regras_subscricao_errors": ValidationResultCode(500).name
+            }
+        if output_fn is not None and hasattr(fn, '_validate'):
+            return output_fn
+        return None
+
+    def _access_sets(self, val):
+        fn = getattr(type(self), val, None)
+        return getattr(fn, '_reads', TODOS_OS_CAMPOS), getattr(fn, '_writes', frozenset())
+
+    def _build_dependencies(self, validacoes):
+        """
+        Monta o grafo de dependências entre as validações a partir das declarações de @accesses.
+
+        B depende de A quando A escreve um campo que B lê (quem escreve executa antes, para que
+        os leitores vejam o valor preenchido) ou quando ambas escrevem o mesmo campo (vale a
+        ordem declarada). Retorna {validação: conjunto de validações das quais depende}.
+        """
+        acessos = {val: self._access_sets(val) for val in validacoes}
+        deps = {val: set() for val in validacoes}
+        for i, val_a in enumerate(validacoes):
+            reads_a, writes_a = acessos[val_a]
+            for val_b in validacoes[i + 1:]:
+                reads_b, writes_b = acessos[val_b]
+                if _conflict(writes_a, reads_b) or _conflict(writes_a, writes_b):
+                    deps[val_b].add(val_a)
+                elif _conflict(writes_b, reads_a):
+                    deps[val_a].add(val_b)
+        return deps
+
+    def _with_dependencies(self, validacoes, solicitadas, deps):
+        """
+        Inclui, recursivamente, as validações das quais as solicitadas dependem.
+        """
+        necessarias = set(solicitadas)
+        pendentes = list(solicitadas)
+        while pendentes:
+            for dep in deps[pendentes.pop()]:
+                if dep not in necessarias:
+                    necessarias.add(dep)
+                    pendentes.append(dep)
+        return [val for val in validacoes if val in necessarias]
+
+    def _plan_waves(self, validacoes, deps):
+        """
+        Agrupa as validações em ondas: cada onda depende apenas das anteriores, então as
+        validações de uma mesma onda podem executar em qualquer ordem (ou ao mesmo tempo).
+        Dentro da onda é mantida a ordem recebida.
+        """
+        restantes = list(validacoes)
+        planejadas = set()
+        ondas = []
+        while restantes:
+            onda = [val for val in restantes if deps[val] <= planejadas]
+            if not onda:
+                logger.warning(f'[WARN] Dependência circular entre {restantes}; seguindo a ordem declarada.')
+                onda = restantes[:1]
+            ondas.append(onda)
+            planejadas.update(onda)
+            restantes = [val for val in restantes if val not in planejadas]
+        return ondas
+
+    def _validate_sequential(self, ondas, deps, document_type, deadline):
+        document_validations = {}
+        adiadas = set()
+        executadas = 0
+        for val in (val for onda in ondas for val in onda):
+            # Quem depende de uma validação adiada também é adiado, para não ler um campo que não foi preenchido.
+            # Ao menos uma validação é executada por chamada, garantindo progresso entre as mensagens adiadas
+            if deps[val] & adiadas or (deadline is not None and executadas > 0 and self._exceeds_deadline(val, document_type, deadline)):
+                adiadas.add(val)
+                self.validacoes_adiadas.append(val)
+                continue
+
+            executadas += 1
+            output_fn = self._run_single_validation(val)
+            if output_fn is not None:
                 document_validations[val] = output_fn
-                
         return document_validations
+
+    def _validate_parallel(self, ondas, deps, document_type, deadline):
+        adiada = object()
+
+        def run(i, val):
+            if deadline is not None and i > 0 and self._exceeds_deadline(val, document_type, deadline):
+                return adiada
+            return self._run_single_validation(val)
+
+        document_validations = {}
+        adiadas = set()
+        i = 0
+        with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as pool:
+            # Uma onda só começa depois que a anterior terminou
+            for onda in ondas:
+                futures = []
+                for val in onda:
+                    if deps[val] & adiadas:
+                        adiadas.add(val)
+                        self.validacoes_adiadas.append(val)
+                        continue
+                    # Cada tarefa roda numa cópia do contexto, para enxergar os campos normalizados da mensagem
+                    futures.append((val, pool.submit(contextvars.copy_context().run, run, i, val)))
+                    i += 1
+
+                for val, future in futures:
+                    output_fn = future.result()
+                    if output_fn is adiada:
+                        adiadas.add(val)
+                        self.validacoes_adiadas.append(val)
+                    elif output_fn is not None:
+                        document_validations[val] = output_fn
+        return document_validations
+
+    def validate(self, deadline=None, only=None):
+        """
+        Executa as validações do documento.
+
+        Parâmetros:
+        deadline (float, opcional): instante limite (em time.monotonic()) para terminar as validações.
+                                    Quando informado, as validações são executadas da mais barata para a
+                                    mais cara, segundo o custo histórico (no container frio, o custo inicial
+                                    de validation_metrics, ou UNKNOWN_COST_MS), e as que não caberiam no tempo
+                                    restante são adiadas e listadas em self.validacoes_adiadas.
+        only (list, opcional): restringe o resultado a essas validações (ex.: as adiadas numa execução anterior).
+                               As validações que preenchem campos lidos por elas são reexecutadas para refazer
+                               o estado, mas não entram no resultado.
+
+        A ordem de execução respeita as dependências declaradas com @accesses: quem escreve um
+        campo executa antes de quem o lê, mesmo com a ordenação por custo.
+        """
+        document_type = type(self).__name__.replace('_validate', '')
+        self._metrics = ValidationMetrics(document_type, self.get_validate_type())
+        self.validacoes_adiadas = []
+        self._profiler = validation_profiling.ValidationProfiler(document_type) if validation_profiling.should_sample() else None
+
+        validacoes = self.get_validations_list()
+        deps = self._build_dependencies(validacoes)
+        solicitadas = set(validacoes if only is None else only)
+        if only is not None:
+            validacoes = self._with_dependencies(validacoes, [val for val in validacoes if val in solicitadas], deps)
+        if deadline is not None:
+            validacoes = self._schedule_by_cost(validacoes, document_type)
+        ondas = self._plan_waves(validacoes, deps)
+
+        # As formas normalizadas dos campos (dígitos, texto sem acento, datas) são compartilhadas pelas validações da mensagem
+        with normalized_fields.message_scope() as campos:
+            # Mensagens perfiladas executam em sequência: o cProfile não admite perfis simultâneos em várias threads
+            if PARALLEL_VALIDATIONS_ENABLED and self.parallel_validations and self._profiler is None and len(validacoes) > 1:
+                document_validations = self._validate_parallel(ondas, deps, document_type, deadline)
+            else:
+                document_validations = self._validate_sequential(ondas, deps, document_type, deadline)
+        self.validacoes_adiadas = [val for val in self.validacoes_adiadas if val in solicitadas]
+
+        if self.validacoes_adiadas:
+            logger.info(f'[INFO] Validações adiadas por falta de tempo: {self.validacoes_adiadas}')
+        if campos.score_lookups:
+            logger.info(f'[INFO] Memo de norm_score: {campos.score_hits}/{campos.score_lookups} acertos '
+                        f'({campos.score_hit_rate():.0%})')
+
+        self._metrics.emit()
+        if self._profiler is not None:
+            self._profiler.flush()
+        # Mantém a ordem original das validações no resultado
+        return {val: document_validations[val] for val in self.get_validations_list()
+                if val in document_validations and val in solicitadas}
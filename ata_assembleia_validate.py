@@ -1,17 +1,16 @@
 import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Ata_assembleia:
     razao_social: str
     cnpj: str
@@ -28,8 +27,7 @@ class Ata_assembleia_validations:
     validacao_endereco_empresa: str
     validacao_tempo_mandato: str 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Ata_assembleia_sign:
     ha_assinatura: str
     descricao_assinatura: str
@@ -57,12 +55,12 @@ class ata_assembleia_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
 
         self.message_type = message_type
-        self.cartao_proposta = Ata_assembleia(**cartao_proposta)
+        self.cartao_proposta = Ata_assembleia.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Ata_assembleia_sign(**dados_extraidos)
+            self.dados_extraidos = Ata_assembleia_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Ata_assembleia(**dados_extraidos)
+            self.dados_extraidos = Ata_assembleia.from_dict(dados_extraidos)
     
     
     def set_validate_functions_list(self):
@@ -104,8 +102,8 @@ class ata_assembleia_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -136,6 +134,7 @@ class ata_assembleia_validate(ValidateDocument):
         - TRUE: Se o tempo de mandato for igual entre os documentos;
         - FALSE: Caso contrário.
         """
+        from dateutil.relativedelta import relativedelta
         
         if(estatuto_social is None):
             return {'valid': False, 'percent_match': 0, 'target': 'tempo_mandato',
@@ -143,7 +142,7 @@ class ata_assembleia_validate(ValidateDocument):
                         "regras_subscricao_errors": 409}
         
         tempo_mandato = estatuto_social['tempo_mandato']
-        data_ata_eleicao = datetime.datetime.strptime(self.dados_extraidos.data_ata_eleicao, '%d-%m-%Y').date()
+        data_ata_eleicao = parse_date(self.dados_extraidos.data_ata_eleicao, '%d-%m-%Y').date()
         
         # extrai apenas o numero da variavel tempo_mandato (esta no formato x anos)
         tempo_mandato = re.search(r'\d+', tempo_mandato)
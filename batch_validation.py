@@ -0,0 +1,136 @@
+import logging
+import os
+from copy import deepcopy
+
+import normalized_fields
+from mongodb_connections import MongoDBConnections, DOCUMENT_STATUS_INVALIDOS
+from ValidateDocument import RequiredDocsCache
+
+logger = logging.getLogger(__name__)
+
+# Variáveis de ambiente que identificam a mensagem (as mesmas preenchidas pelo lambda_handler)
+_MESSAGE_ENV = {'UUID': 'uuid', 'AGREGADOR': 'agregador', 'DOCUMENT_ID': 'document_id', 'DOCUMENT_LABEL': 'document_label'}
+
+
+class BatchMongoDBConnections(MongoDBConnections):
+    """
+    Conexão compartilhada pelos itens de um lote, com os beneficiários pré-carregados.
+
+    prefetch() busca numa única consulta ($in) os beneficiários dos itens e, se pedido, os de
+    seus agregadores. As consultas de MongoDBConnections sobre esses beneficiários passam a ser
+    atendidas da memória, reproduzindo a projeção que o Mongo aplicaria; as demais (ex.: matriz de
+    uma filial, funcionários do GFIP) vão ao Mongo normalmente.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._beneficiarios = {}
+        self._agregadores = {}
+
+    def prefetch(self, uuids, agregadores=()):
+        uuids = sorted({uuid for uuid in uuids if uuid is not None} - set(self._beneficiarios))
+        if uuids:
+            self.reads += 1
+            found = {benef.get('id'): benef for benef in self.mdb['beneficiarios'].find({'id': {'$in': uuids}})}
+            # Um uuid sem beneficiário também é uma resposta: a busca individual retornaria None
+            self._beneficiarios.update({uuid: found.get(uuid) for uuid in uuids})
+
+        agregadores = sorted({agr for agr in agregadores if agr is not None} - set(self._agregadores))
+        if agregadores:
+            self.reads += 1
+            grupos = {agr: [] for agr in agregadores}
+            for benef in self.mdb['beneficiarios'].find({'agregador': {'$in': agregadores}}):
+                grupos[benef.get('agregador')].append(benef)
+            self._agregadores.update(grupos)
+
+    def _find_beneficiario(self, uuid):
+        if uuid not in self._beneficiarios:
+            return super()._find_beneficiario(uuid)
+        return deepcopy(self._beneficiarios[uuid])
+
+    def _find_documento(self, uuid, document_type):
+        if uuid not in self._beneficiarios:
+            return super()._find_documento(uuid, document_type)
+        benef = self._beneficiarios[uuid]
+        if benef is None:
+            return None
+        # Mesmo resultado da projeção $elemMatch: só o primeiro documento válido do tipo, ou nenhum
+        for doc in benef.get('documentos') or []:
+            if doc.get('document_type') == document_type.upper() and doc.get('status') not in DOCUMENT_STATUS_INVALIDOS:
+                return {'_id': benef.get('_id'), 'documentos': [deepcopy(doc)]}
+        return {'_id': benef.get('_id')}
+
+    def _find_agregador(self, uuid):
+        if uuid not in self._beneficiarios:
+            return super()._find_agregador(uuid)
+        benef = self._beneficiarios[uuid]
+        return None if benef is None else {'_id': benef.get('_id'), 'agregador': benef.get('agregador')}
+
+    def _find_beneficiarios_agregador(self, agregador):
+        if agregador not in self._agregadores:
+            return super()._find_beneficiarios_agregador(agregador)
+        return deepcopy(self._agregadores[agregador])
+
+
+def _validator_class(document_type):
+    module = __import__(document_type + '_validate')
+    return getattr(module, document_type + '_validate')
+
+
+def _uses_similarity_documents(cls):
+    """
+    Indica se alguma validação da classe busca os documentos do mesmo tipo no agregador.
+    """
+    for attr in dir(cls):
+        spec = getattr(getattr(cls, attr, None), '_required_docs', None)
+        if spec is not None and spec[2]:
+            return True
+    return False
+
+
+def validate_batch(document_type, messages, connection=None):
+    """
+    Valida um lote de mensagens do mesmo tipo de documento (ex.: backfill ou reprocessamento).
+
+    Cada mensagem tem o formato recebido pelo process_document (cartao_proposta,
+    document_information, message_type, uuid, agregador, document_id, document_label). Retorna,
+    na mesma ordem, o resultado de validate() de cada mensagem, igual ao da validação individual.
+
+    Diferenças em relação a validar uma a uma:
+    - uma única conexão com o Mongo para o lote, e os beneficiários (e, se alguma validação
+      usar documentos similares, os dos agregadores) são buscados antes, em consultas $in.
+    Os norm_score repetidos dentro de uma mensagem vêm do memo dela (normalized_fields); entre
+    mensagens diferentes os nomes quase nunca se repetem, e não há cálculo antecipado.
+
+    Os dados do Mongo refletem o momento do pré-carregamento. As mensagens são validadas em
+    sequência, pois a identificação da mensagem (UUID, AGREGADOR...) fica em os.environ.
+    """
+    document_type = document_type.lower()
+    cls = _validator_class(document_type)
+    messages = list(messages)
+
+    if connection is None:
+        connection = BatchMongoDBConnections()
+    if isinstance(connection, BatchMongoDBConnections):
+        agregadores = [m.get('agregador') for m in messages] if _uses_similarity_documents(cls) else ()
+        connection.prefetch([m.get('uuid') for m in messages], agregadores)
+
+    anterior = {var: os.environ.get(var) for var in _MESSAGE_ENV}
+    outputs = []
+    try:
+        for message in messages:
+            for var, campo in _MESSAGE_ENV.items():
+                os.environ[var] = message[campo]
+            with normalized_fields.message_scope():
+                obj_validate = cls(message['cartao_proposta'], message['document_information'], message['message_type'])
+                obj_validate._required_docs_cache = RequiredDocsCache(connection=connection)
+                outputs.append(obj_validate.validate())
+    finally:
+        for var, valor in anterior.items():
+            if valor is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = valor
+
+    logger.info(f'[INFO] Lote de {len(messages)} mensagens de {document_type} validado com {connection.reads} leituras no Mongo.')
+    return outputs
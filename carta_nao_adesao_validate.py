@@ -2,11 +2,10 @@ from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
 
 from dataclasses import dataclass
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Carta_nao_adesao:
     nome: str
 
@@ -21,8 +20,8 @@ class carta_nao_adesao_validate(ValidateDocument):
     
         cartao_proposta["nome"] = cartao_proposta["nome_responsavel"] if "nome_responsavel" in cartao_proposta else cartao_proposta.get("nome")
 
-        self.cartao_proposta = Carta_nao_adesao(**cartao_proposta)
-        self.dados_extraidos = Carta_nao_adesao(**dados_extraidos)
+        self.cartao_proposta = Carta_nao_adesao.from_dict(cartao_proposta)
+        self.dados_extraidos = Carta_nao_adesao.from_dict(dados_extraidos)
         self.message_type = message_type
 
     def set_validate_functions_list(self):
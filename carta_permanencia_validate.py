@@ -1,16 +1,14 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
-from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
-from Distances import distances
+from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate, accesses
+from Distances import distances, iter_norm_scores
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from fraud_tools import ValidadorMetadadosPDF
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Carta_permanencia:
     razao_social: str
     nome: Optional[str] = None
@@ -43,8 +41,7 @@ class Carta_permanencia_validations:
     validacao_nome_congenere: str
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Carta_permanencia_fraud:
     creator: str 
     producer: str
@@ -66,7 +63,7 @@ class Beneficiario:
     # Lógica personalizada para comparação de igualdade
     def __eq__(self, other):
         if isinstance(other, Beneficiario):
-            score = distances(self.beneficiario, other.beneficiario).norm_score()
+            score = distances(self.beneficiario, other.beneficiario).norm_score(cutoff=self.limiar)
             return score >= self.limiar
         return False
 
@@ -78,15 +75,19 @@ class Beneficiario:
 
 
 class carta_permanencia_validate(ValidateDocument):
+
+    # validacao_nome preenche os campos lidos pelas demais e declara isso com @accesses:
+    # ela executa na primeira onda e as outras validações em paralelo na seguinte
+    parallel_validations = True
     
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Carta_permanencia(**cartao_proposta)
+        self.cartao_proposta = Carta_permanencia.from_dict(cartao_proposta)
         self.message_type = message_type
 
         if (message_type == "fraud_metadata"):
-            self.dados_extraidos = Carta_permanencia_fraud(**dados_extraidos)
+            self.dados_extraidos = Carta_permanencia_fraud.from_dict(dados_extraidos)
         else: 
-            self.dados_extraidos = Carta_permanencia(**dados_extraidos)
+            self.dados_extraidos = Carta_permanencia.from_dict(dados_extraidos)
             
             self.congeneres_validas = ["bradesco", "sul america", "notredame", "unimed nacional", "allianz", "care plus", "porto seguro", "omint", "mediservice", "amil"]
             self.acomodacao_apartamento = ["QUARTO", "APARTAMENTO", "INDIVIDUAL", "QUARTO PRIVATIVO", "PARTICULAR"]
@@ -131,8 +132,9 @@ class carta_permanencia_validate(ValidateDocument):
         - TRUE: Se a data de expedição for dentro do período de 60 dias;
         - FALSE: Caso contrário.
         """
+        from dateutil.relativedelta import relativedelta
         
-        data_emissao = datetime.datetime.strptime(self.dados_extraidos.data_emissao, '%d-%m-%Y').date()
+        data_emissao = parse_date(self.dados_extraidos.data_emissao, '%d-%m-%Y').date()
 
         now = datetime.datetime.now().date()
         data_min = now - relativedelta(months=2)
@@ -155,20 +157,22 @@ class carta_permanencia_validate(ValidateDocument):
 
         Por fim, caso não tenha correspondência, retorna nulo.
         """
-        nome_ref = Beneficiario(nome.upper(), limiar)
-        for key in beneficiarios:
-            candidato = Beneficiario(key.upper(), limiar)
-            current_score = distances(nome_ref.beneficiario, candidato.beneficiario).norm_score()
-
-            if len(beneficiarios.keys()) == 1:
+        nome_ref = nome.upper()
+        candidatos = list(beneficiarios)
+        scores = iter_norm_scores(nome_ref, [key.upper() for key in candidatos])
+        for key, current_score in zip(candidatos, scores):
+            # Com mais de um beneficiário, mesmo critério de Beneficiario.__eq__ (score a partir do limiar)
+            if len(candidatos) == 1 or current_score >= limiar:
                 return key, beneficiarios[key], current_score
-            else:
-                if nome_ref == candidato:
-                    return key, beneficiarios[key], current_score
 
         return None
 
     @validate
+    @accesses(
+        reads={'cartao_proposta.nome', 'dados_extraidos.beneficiarios'},
+        writes={'dados_extraidos.nome', 'dados_extraidos.numero_cartao_plano', 'dados_extraidos.data_nascimento',
+                'dados_extraidos.data_inclusao', 'dados_extraidos.data_exclusao', 'dados_extraidos.titular_ou_dependente'}
+    )
     def validacao_nome(self, limiar=90):
         """
         Valida se o nome do beneficiário no cartão proposta está na Carta de Permanência.
@@ -217,12 +221,12 @@ class carta_permanencia_validate(ValidateDocument):
         if(nome_congenere in congeneres_sem_val):
             return {'valid': True, 'percent_match': 100, 'trecho_encontrado': 'Não encontrado. Congênere sem validação.'}
         
-        data_nascimento = datetime.datetime.strptime(self.dados_extraidos.data_nascimento, '%d-%m-%Y').date()
+        data_nascimento = parse_date(self.dados_extraidos.data_nascimento, '%d-%m-%Y').date()
         if(self.dados_extraidos.data_nascimento == None):
             return {'valid': False, 'percent_match': 0, "trecho_encontrado": data_nascimento.strftime('%d/%m/%Y')}
 
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
 
         if date_1 == date_2:
             return {'valid': True, 'percent_match': 100, "trecho_encontrado": data_nascimento.strftime('%d/%m/%Y')}
@@ -241,7 +245,7 @@ class carta_permanencia_validate(ValidateDocument):
         if(self.dados_extraidos.data_inclusao == None):
             return {'valid': False, 'percent_match': 0, 'trecho_encontrado': self.dados_extraidos.data_inclusao}
 
-        data_inclusao = datetime.datetime.strptime(self.dados_extraidos.data_inclusao, '%d-%m-%Y').date()
+        data_inclusao = parse_date(self.dados_extraidos.data_inclusao, '%d-%m-%Y').date()
 
         now = datetime.datetime.now().date()
         if now > data_inclusao:
@@ -258,6 +262,7 @@ class carta_permanencia_validate(ValidateDocument):
         - TRUE: Se a data for inferior a 60 dias
         - FALSE: Caso contrário.
         """
+        from dateutil.relativedelta import relativedelta
 
         data_exclusao = self.dados_extraidos.data_exclusao
 
@@ -268,7 +273,7 @@ class carta_permanencia_validate(ValidateDocument):
         if(data_exclusao in ativas):
             return {'valid': True, 'percent_match': 100}
 
-        data_exclusao = datetime.datetime.strptime(data_exclusao, '%d-%m-%Y').date()
+        data_exclusao = parse_date(data_exclusao, '%d-%m-%Y').date()
 
         now = datetime.datetime.now().date()
         data_min = now - relativedelta(months=2)
@@ -341,10 +346,10 @@ class carta_permanencia_validate(ValidateDocument):
         if(nome_congenere in congeneres_sem_val):
             return {'valid': True, 'percent_match': 100, 'target': 'numero_cartao_plano', "trecho_procurado": self.dados_extraidos.numero_cartao_plano, 'trecho_encontrado': 'Não encontrado. Congênere sem validação.'}
 
-        s1 = ''.join(re.findall( r'\d+', cartao_plano.get('numero_cartao')))
+        s1 = digits(cartao_plano.get('numero_cartao'))
         s2 = None
         if(self.dados_extraidos.numero_cartao_plano != None):
-            s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.numero_cartao_plano))
+            s2 = digits(self.dados_extraidos.numero_cartao_plano)
         
         if s1 == s2:
             return {'valid': True, 'percent_match': 100, 'target': 'numero_cartao_plano',
@@ -1,16 +1,14 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Cartao_plano:
     nome: str
     nome_titular: Optional[str] = None
@@ -35,8 +33,8 @@ class cartao_plano_validate(ValidateDocument):
         
         cartao_proposta["nome"] = cartao_proposta["nome_responsavel"] if "nome_responsavel" in cartao_proposta else cartao_proposta.get("nome")
 
-        self.cartao_proposta = Cartao_plano(**cartao_proposta)
-        self.dados_extraidos = Cartao_plano(**dados_extraidos)
+        self.cartao_proposta = Cartao_plano.from_dict(cartao_proposta)
+        self.dados_extraidos = Cartao_plano.from_dict(dados_extraidos)
         self.message_type = message_type
 
         self.congeneres_validas = ["bradesco", "sulamerica", "notredame", "unimed nacional", "allianz", "care plus", "porto seguro", "omint", "mediservice", "amil"]
@@ -105,8 +103,8 @@ class cartao_plano_validate(ValidateDocument):
         if self.dados_extraidos.data_nascimento.upper() == 'NOT FOUND':
             return {'valid': False, 'percent_match': 0, 'target': 'data_nascimento', 'trecho_encontrado': self.dados_extraidos.data_nascimento, 'regras_subscricao_errors': 404}
 
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
 
         if date_1 == date_2:
             return {'valid': True, 'percent_match': 100}
@@ -133,7 +131,7 @@ class cartao_plano_validate(ValidateDocument):
         if self.dados_extraidos.data_validade.upper() == 'NOT FOUND':
             return {'valid': False, 'percent_match': 0, 'target': 'data_validade', 'trecho_encontrado': self.dados_extraidos.data_validade, 'regras_subscricao_errors': 404}
 
-        data_validade = datetime.datetime.strptime(self.dados_extraidos.data_validade, '%d-%m-%Y').date()
+        data_validade = parse_date(self.dados_extraidos.data_validade, '%d-%m-%Y').date()
         now = datetime.datetime.now().date()
         if now <= data_validade:
             return {'valid': True, 'percent_match': 100}
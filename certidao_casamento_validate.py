@@ -1,15 +1,12 @@
-import re
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
 from Distances import distances
 from ValidateDocument import ValidateDocument, required_docs, validate
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Certidao_casamento:
     nome_titular: str
     nome: str
@@ -36,8 +33,7 @@ class Certidao_casamento_validations:
     
     
     
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Certidao_casamento_sign:
     ha_selo_carimbo: str
     descricao_selo_carimbo: str
@@ -53,12 +49,12 @@ class certidao_casamento_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
 
         self.message_type = message_type
-        self.cartao_proposta = Certidao_casamento(**cartao_proposta)
+        self.cartao_proposta = Certidao_casamento.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Certidao_casamento_sign(**dados_extraidos)
+            self.dados_extraidos = Certidao_casamento_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Certidao_casamento(**dados_extraidos)
+            self.dados_extraidos = Certidao_casamento.from_dict(dados_extraidos)
             self.checa_titular_dependente()
     
     def set_validate_functions_list(self):
@@ -78,7 +74,7 @@ class certidao_casamento_validate(ValidateDocument):
         
         # se o titular for igual ao dependente, então foram atribuidos incorretamente
         # nesse caso, troca os valores dos campos de titular e dependente 
-        if(distances(s1.upper(), s2.upper()).norm_score() >= limiar):
+        if(distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar) >= limiar):
             
             self.dados_extraidos.nome_titular, self.dados_extraidos.nome = (
                 self.dados_extraidos.nome,
@@ -190,8 +186,8 @@ class certidao_casamento_validate(ValidateDocument):
         
         
     def _validar_data_nascimento(self, dn_cp, dn_de):
-        date_1 = datetime.strptime(dn_cp, '%d/%m/%Y')
-        date_2 = datetime.strptime(dn_de, '%d-%m-%Y')
+        date_1 = parse_date(dn_cp, '%d/%m/%Y')
+        date_2 = parse_date(dn_de, '%d-%m-%Y')
 
         is_valid = date_1 == date_2
         score = 100 if is_valid else 0
@@ -245,8 +241,8 @@ class certidao_casamento_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
         
-        tit_cp = ''.join(re.findall(r'\d+', self.cartao_proposta.cpf_titular))
-        tit_de = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf_titular))
+        tit_cp = digits(self.cartao_proposta.cpf_titular)
+        tit_de = digits(self.dados_extraidos.cpf_titular)
         
         return self._validar_cpf(tit_cp, tit_de)
     
@@ -260,8 +256,8 @@ class certidao_casamento_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
         
-        dep_cp = ''.join(re.findall(r'\d+', self.cartao_proposta.cpf))
-        dep_de = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        dep_cp = digits(self.cartao_proposta.cpf)
+        dep_de = digits(self.dados_extraidos.cpf)
          
         return self._validar_cpf(dep_cp, dep_de)
 
@@ -1,15 +1,13 @@
-import re
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
-from Distances import distances
+from Distances import distances, iter_norm_scores
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Certidao_nascimento():
     nome: str
     nome_mae: str
@@ -39,8 +37,8 @@ class Certidao_nascimento_validations:
 class certidao_nascimento_validate(ValidateDocument):
     
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Certidao_nascimento(**cartao_proposta)
-        self.dados_extraidos = Certidao_nascimento(**dados_extraidos)
+        self.cartao_proposta = Certidao_nascimento.from_dict(cartao_proposta)
+        self.dados_extraidos = Certidao_nascimento.from_dict(dados_extraidos)
         self.message_type = message_type
 
     def set_validate_functions_list(self):
@@ -65,7 +63,7 @@ class certidao_nascimento_validate(ValidateDocument):
         Parâmetros:
         n_anos (int, opcional): O número máximo de anos para o qual o dependente pode aceitar o documento. O valor padrão é 8 anos..
         """
-        date = datetime.strptime(
+        date = parse_date(
             self.dados_extraidos.data_nascimento, '%d-%m-%Y')
         match self.cartao_proposta.grau_parentesco:
             case 'Filho' | 'Filha' | 'Enteado' | 'Enteada':
@@ -104,8 +102,8 @@ class certidao_nascimento_validate(ValidateDocument):
         - TRUE: Se os CPFs forem iguais;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(r'\d+', self.cartao_proposta.cpf))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        s1 = digits(self.cartao_proposta.cpf)
+        s2 = digits(self.dados_extraidos.cpf)
 
         is_valid = s1 == s2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
@@ -139,9 +137,9 @@ class certidao_nascimento_validate(ValidateDocument):
         - TRUE: Se as datas de nascimento forem iguais;
         - FALSE: Caso contrário.
         """
-        date_1 = datetime.strptime(
+        date_1 = parse_date(
             self.cartao_proposta.data_nascimento, '%d/%m/%Y')
-        date_2 = datetime.strptime(
+        date_2 = parse_date(
             self.dados_extraidos.data_nascimento, '%d-%m-%Y')
 
         is_valid = date_1 == date_2
@@ -154,8 +152,7 @@ class certidao_nascimento_validate(ValidateDocument):
         nomes_avos = s2_list.split(' | ')
         max_score = 0
         best_s2 = None
-        for s2 in nomes_avos:
-            score = distances(s1, s2).norm_score()
+        for s2, score in zip(nomes_avos, iter_norm_scores(s1, nomes_avos)):
             if score >= limiar:
                 return {'valid': True, 'percent_match': score, 'target': 'nome_titular',
                         "trecho_procurado": s1,
@@ -174,8 +171,7 @@ class certidao_nascimento_validate(ValidateDocument):
                    self.dados_extraidos.nome_mae]
         max_score = 0
         best_s2 = None
-        for s2 in s2_list:
-            score = distances(s1, s2).norm_score()
+        for s2, score in zip(s2_list, iter_norm_scores(s1, s2_list)):
             if score >= limiar:
                 return {'valid': True, 'percent_match': score, 'target': 'nome_titular',
                         "trecho_procurado": s1,
@@ -201,8 +197,7 @@ class certidao_nascimento_validate(ValidateDocument):
                    certidao_casamento['nome']]
         max_score = 0
         best_s2 = None
-        for s2 in s2_list:
-            score = distances(s1, s2).norm_score()
+        for s2, score in zip(s2_list, iter_norm_scores(s1, s2_list)):
             if score >= limiar:
                 return {'valid': True, 'percent_match': score, 'target': 'nome_titular',
                         "trecho_procurado": s1,
@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """
+    Lançada quando uma chamada é recusada porque o circuito está aberto.
+    """
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Circuito '{name}' aberto. Nova tentativa em {retry_after:.1f}s.")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples, compartilhado pelas chamadas de um mesmo container.
+
+    - CLOSED: as chamadas passam; falhas consecutivas são contadas.
+    - OPEN: após failure_threshold falhas seguidas, as chamadas falham imediatamente com
+      CircuitOpenError durante reset_timeout segundos.
+    - HALF_OPEN: passado o reset_timeout, uma chamada de teste é liberada; se der certo o
+      circuito fecha, se falhar volta a abrir.
+
+    is_failure decide quais exceções contam como falha do serviço protegido; as demais
+    são repassadas sem alterar o estado do circuito.
+    """
+
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30, is_failure=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda exc: True)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_after(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 0
+            return max(0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def _before_call(self):
+        with self._lock:
+            state = self._state()
+            if state == self.OPEN or (state == self.HALF_OPEN and self._probe_in_flight):
+                raise CircuitOpenError(self.name, max(0, self.reset_timeout - (time.monotonic() - self._opened_at)))
+            if state == self.HALF_OPEN:
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"[INFO] Circuito '{self.name}' fechado.")
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                # Falha na chamada de teste (HALF_OPEN) ou limite atingido: (re)abre o circuito
+                self._opened_at = time.monotonic()
+                logger.warning(f"[WARN] Circuito '{self.name}' aberto após {self._failures} falhas.")
+
+    def call(self, fn, *args, **kwargs):
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def protect(self, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+        return wrapper
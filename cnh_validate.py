@@ -1,16 +1,14 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class CNH:
     nome: str
     cpf: str
@@ -40,8 +38,8 @@ class cnh_validate(ValidateDocument):
 
         cartao_proposta["responsavel_legal"] = "nome_responsavel" in cartao_proposta
 
-        self.cartao_proposta = CNH(**cartao_proposta)
-        self.dados_extraidos = CNH(**dados_extraidos)
+        self.cartao_proposta = CNH.from_dict(cartao_proposta)
+        self.dados_extraidos = CNH.from_dict(dados_extraidos)
         self.message_type = message_type
 
     def set_validate_functions_list(self):
@@ -80,8 +78,8 @@ class cnh_validate(ValidateDocument):
         - TRUE: Se os CPFs forem iguais;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cpf))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        s1 = digits(self.cartao_proposta.cpf)
+        s2 = digits(self.dados_extraidos.cpf)
 
         is_valid = s1 == s2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
@@ -129,8 +127,8 @@ class cnh_validate(ValidateDocument):
             'trecho_procurado': 'Validação não aplicável ao documento do representante legal',
             'trecho_encontrado': 'Validação não aplicável ao documento do representante legal'}
 
-        date_1 = datetime.datetime.strptime(s1, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
+        date_1 = parse_date(s1, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
 
         is_valid = date_1 == date_2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
@@ -144,7 +142,7 @@ class cnh_validate(ValidateDocument):
         - TRUE: Se a data de validade for maior ou igual à data de hoje (indicando que ainda é válida);
         - FALSE: Caso contrário (indicando que a data de validade já passou).
         """
-        date = datetime.datetime.strptime(self.dados_extraidos.data_validade, '%d-%m-%Y')
+        date = parse_date(self.dados_extraidos.data_validade, '%d-%m-%Y')
 
         is_valid = date >= datetime.datetime.now()
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
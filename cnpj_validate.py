@@ -1,16 +1,13 @@
-import re
-import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
 from Distances import distances
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from fraud_tools import ValidadorMetadadosPDF
+from normalized_fields import digits, parse_date
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Cnpj:
     cnpj: str
     razao_social: str
@@ -27,8 +24,7 @@ class cnpj_validations:
     validacao_data_abertura: str
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Cnpj_fraud:
     creator: str 
     producer: str
@@ -47,12 +43,12 @@ class cnpj_validate(ValidateDocument):
     
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         self.message_type = message_type
-        self.cartao_proposta = Cnpj(**cartao_proposta)
+        self.cartao_proposta = Cnpj.from_dict(cartao_proposta)
 
         if (message_type == "fraud_metadata"):
-            self.dados_extraidos = Cnpj_fraud(**dados_extraidos)
+            self.dados_extraidos = Cnpj_fraud.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Cnpj(**dados_extraidos)
+            self.dados_extraidos = Cnpj.from_dict(dados_extraidos)
    
     def set_validate_functions_list(self):
         return list(cnpj_validations.__annotations__.keys())
@@ -94,7 +90,7 @@ class cnpj_validate(ValidateDocument):
             return {'valid': False, 'percent_match': 0, "trecho_procurado": "Diferente de 2135", 
                 "trecho_encontrado": "", "regras_subscricao_errors": 422}
 
-        s1 = ''.join(re.findall( r'\d+', self.dados_extraidos.natureza_juridica))
+        s1 = digits(self.dados_extraidos.natureza_juridica)
         if s1=='2135':
             return {'valid': False, 'percent_match': 0, "trecho_procurado": "Diferente de 2135", "trecho_encontrado": self.dados_extraidos.natureza_juridica}
         else:
@@ -112,7 +108,7 @@ class cnpj_validate(ValidateDocument):
         """
         s1 = self.cartao_proposta.razao_social
         s2 = self.dados_extraidos.razao_social
-        sim_score = distances(s1.upper(), s2.upper()).norm_score()
+        sim_score = distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar)
         is_valid = sim_score >=limiar
         return {'valid': is_valid, 'percent_match': limiar}  
           
@@ -125,8 +121,8 @@ class cnpj_validate(ValidateDocument):
         - TRUE: Se o CNPJ for igual.
         - FALSE: Se o CNPJ for diferente.
         """
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         is_valid = s1 == s2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0} 
 
@@ -139,8 +135,8 @@ class cnpj_validate(ValidateDocument):
         - TRUE: Se as datas forem iguais.
         - FALSE: Se as datas forem diferentes.
         """
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_abertura, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_abertura, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_abertura, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_abertura, '%d-%m-%Y')
         is_valid = date_1 == date_2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
         
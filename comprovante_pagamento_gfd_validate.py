@@ -1,17 +1,15 @@
 import re
-import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Comprovante_pagamento_gfd:
     razao_social: Optional[str] = None
     cnpj: Optional[str] = None
@@ -32,8 +30,8 @@ class Comprovante_pagamento_gfd_validations:
 class comprovante_pagamento_gfd_validate(ValidateDocument):
     
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Comprovante_pagamento_gfd(**cartao_proposta)
-        self.dados_extraidos = Comprovante_pagamento_gfd(**dados_extraidos)
+        self.cartao_proposta = Comprovante_pagamento_gfd.from_dict(cartao_proposta)
+        self.dados_extraidos = Comprovante_pagamento_gfd.from_dict(dados_extraidos)
         self.message_type = message_type
 
     def set_validate_functions_list(self):
@@ -72,8 +70,8 @@ class comprovante_pagamento_gfd_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -150,8 +148,8 @@ class comprovante_pagamento_gfd_validate(ValidateDocument):
             return {'valid': False, 'percent_match': 0, 'target': 'data_vencimento',
                         "trecho_procurado": "", "trecho_encontrado": "",
                         "regras_subscricao_errors": 409}
-        data_vencimento1 = datetime.datetime.strptime(self.dados_extraidos.data_vencimento, '%d-%m-%Y').date() if self.dados_extraidos.data_vencimento != 'Not Found' else self.dados_extraidos.data_vencimento
-        data_vencimento2 = datetime.datetime.strptime(gfd['data_vencimento'], '%d-%m-%Y').date()
+        data_vencimento1 = parse_date(self.dados_extraidos.data_vencimento, '%d-%m-%Y').date() if self.dados_extraidos.data_vencimento != 'Not Found' else self.dados_extraidos.data_vencimento
+        data_vencimento2 = parse_date(gfd['data_vencimento'], '%d-%m-%Y').date()
 
         if data_vencimento1 == data_vencimento2:
             return {'valid': True, 'percent_match': 100, 'target': 'data_vencimento',
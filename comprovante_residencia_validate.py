@@ -1,18 +1,16 @@
-import re
 import datetime
 from fraud_tools import SimilarTextValidator, ValidadorMetadadosPDF
-from dateutil.relativedelta import relativedelta
-from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
-from Distances import distances
+from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate, accesses, cacheable
+from Distances import distances, iter_norm_scores
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 import os
+from normalized_fields import parse_date
 
  
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Comprovante_residencia:
     nome: str
     endereco_pessoal: Endereco
@@ -28,8 +26,7 @@ class Comprovante_residencia_validations:
     validacao_nome: str
     validacao_fraude_docs_similares: str
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Comprovante_residencia_fraud:
     creator: str 
     producer: str
@@ -46,13 +43,13 @@ class Comprovante_residencia_fraud_validations:
 class comprovante_residencia_validate(ValidateDocument):
     
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Comprovante_residencia(**cartao_proposta)
+        self.cartao_proposta = Comprovante_residencia.from_dict(cartao_proposta)
         self.message_type = message_type
 
         if (message_type == "fraud_metadata"):
-            self.dados_extraidos = Comprovante_residencia_fraud(**dados_extraidos)
+            self.dados_extraidos = Comprovante_residencia_fraud.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Comprovante_residencia(**dados_extraidos)
+            self.dados_extraidos = Comprovante_residencia.from_dict(dados_extraidos)
    
     
     def set_validate_functions_list(self):
@@ -81,6 +78,10 @@ class comprovante_residencia_validate(ValidateDocument):
         return {'valid': is_valid, 'percent_match': score}
 
     @validate
+    @accesses(
+        reads={'dados_extraidos.data_referencia', 'dados_extraidos.vencimento'},
+        writes={'dados_extraidos.data_emissao'}
+    )
     def validacao_data_emissao(self):
         """
         Valida se a data de emissão extraída do comprovante de residência está dentro do intervalo de dois meses a partir da data atual.
@@ -89,10 +90,11 @@ class comprovante_residencia_validate(ValidateDocument):
         - TRUE: Se tiver dentro do intervalo especificado;
         - FALSE: Caso contrário.
         """
-        data_referencia = datetime.datetime.strptime(self.dados_extraidos.data_referencia, '%m/%Y').date() if self.dados_extraidos.data_referencia != 'Not Found' else self.dados_extraidos.data_referencia
+        from dateutil.relativedelta import relativedelta
+        data_referencia = parse_date(self.dados_extraidos.data_referencia, '%m/%Y').date() if self.dados_extraidos.data_referencia != 'Not Found' else self.dados_extraidos.data_referencia
         vencimento = self.dados_extraidos.vencimento
         if(vencimento != 'Not Found' and data_referencia != 'Not Found'):
-            vencimento = datetime.datetime.strptime(vencimento, '%d-%m-%Y').date()
+            vencimento = parse_date(vencimento, '%d-%m-%Y').date()
             data_emissao = vencimento if vencimento > data_referencia else data_referencia
         else:
             data_emissao = data_referencia
@@ -137,8 +139,8 @@ class comprovante_residencia_validate(ValidateDocument):
 
         for documento in [certidao_casamento, escritura_uniao_estavel]:
             if documento is not None:
-                score_1 = distances(documento['nome_titular'], nome_titular_cp).norm_score()
-                score_2 = distances(documento['nome_dependente'], nome_titular_cp).norm_score()
+                score_1 = distances(documento['nome_titular'], nome_titular_cp).norm_score(cutoff=90)
+                score_2 = distances(documento['nome_dependente'], nome_titular_cp).norm_score(cutoff=90)
                 if(score_1 >= 90 or score_2 >= 90):
                     lista_nomes.extend([documento['nome_dependente'], documento['nome_titular']])
 
@@ -148,8 +150,7 @@ class comprovante_residencia_validate(ValidateDocument):
 
         best_score = 0
         invalid_to_return = None
-        for s2 in lista_nomes:
-            score = distances(s1, s2).norm_score()
+        for s2, score in zip(lista_nomes, iter_norm_scores(s1, lista_nomes)):
             if score >= limiar:
                 return {'valid': True, 'percent_match': score, 'target': 'nome',
                         "trecho_procurado": s2,
@@ -217,6 +218,8 @@ class comprovante_residencia_validate(ValidateDocument):
                     'percent_match': 100 - float(highest_score) }
 
     @fraud_validate
+    @cacheable(version=1)
+    @accesses(reads={'dados_extraidos.creationDate'})
     @required_docs('comprovante_residencia')
     def validacao_metadado_datas(self, comprovante_residencia):
         """
@@ -244,7 +247,7 @@ class comprovante_residencia_validate(ValidateDocument):
         if(creation_date_convertida == None or data_emissao_convertida == None):
             return {'valid': True, 'percent_match': 100, "trecho_procurado": "Data de criação: " + str(creation_date) + " | Data de emissão: " + str(data_referencia) , "trecho_encontrado": "Data de criação ou data de emissão não encontrada." }
 
-        data_referencia_convertida = datetime.datetime.strptime(f"01/{data_referencia}", "%d/%m/%Y")
+        data_referencia_convertida = parse_date(f"01/{data_referencia}", "%d/%m/%Y")
 
         creation_date_str = creation_date_convertida.strftime("%d-%m-%Y")
         data_emissao_str = data_emissao_convertida.strftime("%d-%m-%Y")
@@ -1,17 +1,16 @@
 import re
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Contrato_estagio:
     nome: str
     razao_social: str
@@ -34,8 +33,7 @@ class Contrato_estagio_validations:
 
 
     
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Contrato_estagio_sign:
     assinatura_estagiario: str
     assinatura_empresa: str
@@ -56,12 +54,12 @@ class contrato_estagio_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
 
         self.message_type = message_type
-        self.cartao_proposta = Contrato_estagio(**cartao_proposta)
+        self.cartao_proposta = Contrato_estagio.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Contrato_estagio_sign(**dados_extraidos)
+            self.dados_extraidos = Contrato_estagio_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Contrato_estagio(**dados_extraidos)
+            self.dados_extraidos = Contrato_estagio.from_dict(dados_extraidos)
     
     def set_validate_functions_list(self):
         return list(Contrato_estagio_validations.__annotations__.keys())
@@ -163,8 +161,8 @@ class contrato_estagio_validate(ValidateDocument):
         - TRUE: Se os CNPJs forem idênticos após a remoção de caracteres não numéricos;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}  
         else:
@@ -185,9 +183,9 @@ class contrato_estagio_validate(ValidateDocument):
         converted_dates = []
         for date in dates:
             try:
-                converted_dates.append(datetime.strptime(date, "%d-%m-%Y"))
+                converted_dates.append(parse_date(date, "%d-%m-%Y"))
             except ValueError:
-                converted_dates.append(datetime.strptime(date, "%d/%m/%Y"))
+                converted_dates.append(parse_date(date, "%d/%m/%Y"))
 
         # Data atual
         date_now = datetime.now()
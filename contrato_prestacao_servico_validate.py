@@ -1,18 +1,18 @@
 import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
+from name_matching import match_names
 
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from validacao_endereco import Validacao_endereco, Endereco
+from normalized_fields import digits, parse_date
 
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Contrato_prestacao_servico:
     razao_social_matriz: str
     cnpj_matriz: str
@@ -37,8 +37,7 @@ class Contrato_prestacao_servico_validations:
     validacao_data_emissao: str
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Contrato_prestacao_servico_sign:
     ha_assinatura_empresa_contratante: str
     ha_assinatura_empresa_contratada: str
@@ -58,12 +57,12 @@ class contrato_prestacao_servico_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
 
         self.message_type = message_type
-        self.cartao_proposta = Contrato_prestacao_servico(**cartao_proposta)
+        self.cartao_proposta = Contrato_prestacao_servico.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Contrato_prestacao_servico_sign(**dados_extraidos)
+            self.dados_extraidos = Contrato_prestacao_servico_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Contrato_prestacao_servico(**dados_extraidos)
+            self.dados_extraidos = Contrato_prestacao_servico.from_dict(dados_extraidos)
 
     
     def set_validate_functions_list(self):
@@ -134,8 +133,8 @@ class contrato_prestacao_servico_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj_matriz))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj_matriz))
+        s1 = digits(self.cartao_proposta.cnpj_matriz)
+        s2 = digits(self.dados_extraidos.cnpj_matriz)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -151,8 +150,8 @@ class contrato_prestacao_servico_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100, "trecho_procurado": s1, "trecho_encontrado": s2}
         else:
@@ -236,6 +235,7 @@ class contrato_prestacao_servico_validate(ValidateDocument):
         - TRUE: Se estiver em uma vigência válida;
         - FALSE: Caso contrário.
         """
+        from dateutil.relativedelta import relativedelta
 
         s1 = self.dados_extraidos.inicio_vigencia_contrato
         tempo_contrato = self.dados_extraidos.tempo_contrato
@@ -246,7 +246,7 @@ class contrato_prestacao_servico_validate(ValidateDocument):
                         "trecho_encontrado": "Início da vigência: "+ s1 + " | Tempo de contrato: " + tempo_contrato}
 
         try:
-            inicio_vigencia_contrato = datetime.datetime.strptime(s1, '%d-%m-%Y').date()
+            inicio_vigencia_contrato = parse_date(s1, '%d-%m-%Y').date()
         except Exception as e:
             print(e)
             return {'valid': False, 'percent_match': 0, 'target': 'data_emissao',
@@ -354,24 +354,22 @@ class contrato_prestacao_servico_validate(ValidateDocument):
 
         match_contratante = False
         if(ha_assinatura_contratante == True):
-            for responsavel_legal in responsavel_legal_estipulante:
-                for nome in nome_contratante:
-                    sim_score = distances(nome.upper(), responsavel_legal.upper()).norm_score()
-                    if sim_score >= limiar:
-                        match_contratante = True
-                        score = 50
+            pares, _ = match_names([nome.upper() for nome in nome_contratante],
+                                   [responsavel_legal.upper() for responsavel_legal in responsavel_legal_estipulante], limiar)
+            if pares:
+                match_contratante = True
+                score = 50
 
         if(isinstance(ha_assinatura_contratada, str)):
             ha_assinatura_contratada = (lambda x: False if x in {'False', 'false'} else True)(ha_assinatura_contratada)
 
         match_contratada = False
         if(ha_assinatura_contratada == True):
-            for responsavel_legal in responsavel_legal_subestipulante:
-                for nome in nome_contratada:
-                    sim_score = distances(nome.upper(), responsavel_legal.upper()).norm_score()
-                    if sim_score >= limiar:
-                        match_contratada = True
-                        score = 50
+            pares, _ = match_names([nome.upper() for nome in nome_contratada],
+                                   [responsavel_legal.upper() for responsavel_legal in responsavel_legal_subestipulante], limiar)
+            if pares:
+                match_contratada = True
+                score = 50
 
         if(match_contratada and match_contratante):
             valid = True
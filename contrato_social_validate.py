@@ -1,16 +1,14 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Contrato_social:
     razao_social: str
     cnpj: str
@@ -27,8 +25,7 @@ class Contrato_social_validations:
     validacao_tipo_assinatura: str
     #validacao_responsaveis_assinatura: str
 
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Contrato_social_sign:
     ha_assinatura: str
     ha_registro_orgao_competente: str
@@ -52,12 +49,12 @@ class Contrato_social_sign_validations:
 class contrato_social_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         self.message_type = message_type
-        self.cartao_proposta = Contrato_social(**cartao_proposta)
+        self.cartao_proposta = Contrato_social.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Contrato_social_sign(**dados_extraidos)
+            self.dados_extraidos = Contrato_social_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Contrato_social(**dados_extraidos)
+            self.dados_extraidos = Contrato_social.from_dict(dados_extraidos)
     
     
     def set_validate_functions_list(self):
@@ -97,8 +94,8 @@ class contrato_social_validate(ValidateDocument):
         - TRUE: Se os CNPJs forem idênticos após a remoção de caracteres não numéricos;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}  
         else:
@@ -1,18 +1,15 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
 from Distances import distances
 from fraud_tools import SimilarTextValidator, ValidadorMetadadosPDF
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from validacao_endereco import Validacao_endereco, Endereco
-from fraud_tools import ValidadorMetadadosPDF
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Cpts:
     nome: str
     cpf: str
@@ -49,8 +46,7 @@ class Cpts_validations:
     validacao_fraude_docs_similares: str
     
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Cpts_sign:
     assinatura_titular: str
     assinatura_empresa: str
@@ -62,8 +58,7 @@ class Cpts_sign_validations:
 
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Cpts_fraud:
     creator: str 
     producer: str
@@ -77,18 +72,20 @@ class Cpts_fraud_validations:
     validacao_metadado_datas: str
 
 class ctps_validate(ValidateDocument):
-    
-    
+
+    # Validações independentes entre si: podem executar em paralelo
+    parallel_validations = True
+
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         self.message_type = message_type
-        self.cartao_proposta = Cpts(**cartao_proposta)
+        self.cartao_proposta = Cpts.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Cpts_sign(**dados_extraidos)
+            self.dados_extraidos = Cpts_sign.from_dict(dados_extraidos)
         elif(message_type == "fraud_metadata"):
-            self.dados_extraidos = Cpts_fraud(**dados_extraidos)
+            self.dados_extraidos = Cpts_fraud.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Cpts(**dados_extraidos)
+            self.dados_extraidos = Cpts.from_dict(dados_extraidos)
 
     def set_validate_functions_list(self):
         return list(Cpts_validations.__annotations__.keys())
@@ -137,8 +134,8 @@ class ctps_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cpf))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        s1 = digits(self.cartao_proposta.cpf)
+        s2 = digits(self.dados_extraidos.cpf)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -177,8 +174,8 @@ class ctps_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
         if date_1 == date_2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -220,8 +217,8 @@ class ctps_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
 
         if len(s1) > 8 and len(s2) > 8:
             if s1 == s2:
@@ -286,8 +283,8 @@ class ctps_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_admissao, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_admissao, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_admissao, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_admissao, '%d-%m-%Y')
         if date_1 == date_2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -336,7 +333,7 @@ class ctps_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
         
-        data_assinatura = datetime.datetime.strptime(self.dados_extraidos.data_assinatura, '%d-%m-%Y') if self.dados_extraidos.data_assinatura != 'Not Found' else self.dados_extraidos.data_assinatura
+        data_assinatura = parse_date(self.dados_extraidos.data_assinatura, '%d-%m-%Y') if self.dados_extraidos.data_assinatura != 'Not Found' else self.dados_extraidos.data_assinatura
         data_limite = datetime.datetime.now() - datetime.timedelta(days=30)
 
         if data_assinatura == 'Not Found':
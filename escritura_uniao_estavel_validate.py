@@ -1,16 +1,13 @@
-import re
-import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Escritura_uniao_estavel:
     nome_titular: str
     nome: str
@@ -33,8 +30,7 @@ class Escritura_uniao_estavel_validations:
     validacao_data_nascimento_dependente: str
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Escritura_uniao_estavel_sign:
     ha_selo_carimbo: str
     descricao_selo_carimbo: str
@@ -50,12 +46,12 @@ class escritura_uniao_estavel_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
 
         self.message_type = message_type
-        self.cartao_proposta = Escritura_uniao_estavel(**cartao_proposta)
+        self.cartao_proposta = Escritura_uniao_estavel.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Escritura_uniao_estavel_sign(**dados_extraidos)
+            self.dados_extraidos = Escritura_uniao_estavel_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Escritura_uniao_estavel(**dados_extraidos)
+            self.dados_extraidos = Escritura_uniao_estavel.from_dict(dados_extraidos)
             self.checa_titular_dependente()
     
     def set_validate_functions_list(self):
@@ -74,7 +70,7 @@ class escritura_uniao_estavel_validate(ValidateDocument):
         
         # se o titular for igual ao dependente, então foram atribuidos incorretamente
         # nesse caso, troca os valores dos campos de titular e dependente 
-        if(distances(s1.upper(), s2.upper()).norm_score() >= limiar):
+        if(distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar) >= limiar):
             
             self.dados_extraidos.nome_titular, self.dados_extraidos.nome = (
                 self.dados_extraidos.nome,
@@ -157,8 +153,8 @@ class escritura_uniao_estavel_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
         
-        tit_cp = ''.join(re.findall(r'\d+', self.cartao_proposta.cpf_titular))
-        tit_de = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf_titular))
+        tit_cp = digits(self.cartao_proposta.cpf_titular)
+        tit_de = digits(self.dados_extraidos.cpf_titular)
         
         is_valid, score = self._validar_cpf(tit_cp, tit_de)
         
@@ -174,8 +170,8 @@ class escritura_uniao_estavel_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        dep_cp = ''.join(re.findall(r'\d+', self.cartao_proposta.cpf))
-        dep_de = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        dep_cp = digits(self.cartao_proposta.cpf)
+        dep_de = digits(self.dados_extraidos.cpf)
         
         is_valid, score = self._validar_cpf(dep_cp, dep_de)
 
@@ -246,8 +242,8 @@ class escritura_uniao_estavel_validate(ValidateDocument):
         if(s2 == 'Not Found'):
             return {'valid': False, 'percent_match': 0}
 
-        date_1 = datetime.datetime.strptime(s1, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(s2, '%d-%m-%Y')
+        date_1 = parse_date(s1, '%d/%m/%Y')
+        date_2 = parse_date(s2, '%d-%m-%Y')
 
         is_valid = date_1 == date_2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
@@ -284,8 +280,8 @@ class escritura_uniao_estavel_validate(ValidateDocument):
                 "trecho_procurado": s1,
                 "trecho_encontrado": s2}
 
-        date_1 = datetime.datetime.strptime(s1, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(s2, '%d-%m-%Y')
+        date_1 = parse_date(s1, '%d/%m/%Y')
+        date_2 = parse_date(s2, '%d-%m-%Y')
 
         is_valid = date_1 == date_2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0, 
@@ -1,16 +1,12 @@
-import re
-import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)     
-@dataclass
+@document_model
 class Esocial:
     razao_social: str
     nome: str
@@ -35,8 +31,8 @@ class esocial_validate(ValidateDocument):
     #cartao proposta = cartao_proposta + proposta de contratacao?
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         
-        self.cartao_proposta = Esocial(**cartao_proposta)
-        self.dados_extraidos = Esocial(**dados_extraidos)
+        self.cartao_proposta = Esocial.from_dict(cartao_proposta)
+        self.dados_extraidos = Esocial.from_dict(dados_extraidos)
         self.message_type = message_type
         
     
@@ -93,8 +89,8 @@ class esocial_validate(ValidateDocument):
         - TRUE: Se os CNPJs forem idênticos após a remoção de caracteres não numéricos;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -109,8 +105,8 @@ class esocial_validate(ValidateDocument):
         - TRUE: Se os CPFs forem idênticos após a remoção de caracteres não numéricos;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(r'\d+', self.cartao_proposta.cpf))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        s1 = digits(self.cartao_proposta.cpf)
+        s2 = digits(self.dados_extraidos.cpf)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -129,8 +125,8 @@ class esocial_validate(ValidateDocument):
         - Converte as strings de data para objetos datetime antes da comparação.
         - Assume que ambas as datas estão no formato 'dd-mm-yyyy'.
         """
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_admissao, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_admissao, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_admissao, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_admissao, '%d-%m-%Y')
         if date_1 == date_2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -1,17 +1,17 @@
 import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
-from Distances import distances
+from Distances import distances, score_matrix
+from name_matching import assign
 
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Estatuto_social:
     razao_social: str
     cnpj: str
@@ -30,8 +30,7 @@ class Estatuto_social_validations:
     validacao_responsavel_legal: str 
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Estatuto_social_sign:
     ha_assinatura: str
     descricao_assinatura: str
@@ -58,12 +57,12 @@ class estatuto_social_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
 
         self.message_type = message_type
-        self.cartao_proposta = Estatuto_social(**cartao_proposta)
+        self.cartao_proposta = Estatuto_social.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Estatuto_social_sign(**dados_extraidos)
+            self.dados_extraidos = Estatuto_social_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Estatuto_social(**dados_extraidos)
+            self.dados_extraidos = Estatuto_social.from_dict(dados_extraidos)
     
     
     def set_validate_functions_list(self):
@@ -106,8 +105,8 @@ class estatuto_social_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -168,7 +167,7 @@ class estatuto_social_validate(ValidateDocument):
         responsavel_legal = [responsavel_legal] if isinstance(responsavel_legal, str) else responsavel_legal
         for item1 in responsavel_legal:
             for item2 in nomes_assinatura:
-                score = distances(item1.upper(), item2.upper()).norm_score()
+                score = distances(item1.upper(), item2.upper()).norm_score(cutoff=threshold)
                 if score >= threshold:
                     return True, item1, item2, score
 
@@ -265,48 +264,53 @@ class estatuto_social_validate(ValidateDocument):
         #)
 
 
-    def _encontrar_match(self, cargos, nomes_restantes, threshold):
-        """
-        Encontra o primeiro nome do assinante com similaridade acima do limiar.
-        Retorna uma tupla (nome_assinado, nome_esperado) ou None se não houver match.
-        """
-        
-        for nome_esperado in cargos:
-            nome_assinado = next(
-                (nome for nome in nomes_restantes if distances(nome_esperado.upper(), nome.upper()).norm_score() >= threshold),
-                None
-            )
-            if nome_assinado:
-                return nome_assinado, nome_esperado
-        return None
-    
     def verificar_assinaturas(self, cargos_eleitos, regra_assinatura, nome_assinou, threshold=90):
         """
         Verifica se os nomes de quem assinou são similares aos nomes dos responsáveis legais.
         Retorna o resultado final (True/False) e os matches encontrados.
-        """
-        nomes_restantes = set(nome_assinou)
-        resultados = []
 
+        Cada cargo da regra (ex.: ['Diretor', 'Diretor']) precisa de um assinante diferente. A
+        distribuição dos assinantes entre os cargos é feita de uma vez, pelo algoritmo húngaro
+        (name_matching.assign), então não depende da ordem dos nomes. Se a regra não for atendida,
+        os matches retornados são os dos cargos anteriores ao primeiro cargo sem assinante.
+        """
+        assinantes = list(dict.fromkeys(nome_assinou))
+        vagas = []
+        cargo_faltando = False
         for cargo in regra_assinatura:
             # obtém os nomes dos responsáveis legais
             cargos = self._obter_cargos(cargos_eleitos, cargo)
 
             if not cargos:
-                return False, resultados
+                cargo_faltando = True
+                break
 
             if(isinstance(cargos, str)):
                 cargos = [cargos]
-
-            match = self._encontrar_match(cargos, nomes_restantes, threshold)
-            if match:
-                nome_assinado, nome_esperado = match
-                resultados.append(nome_esperado)
-                nomes_restantes.remove(nome_assinado)
-            else:
-                return False, resultados
-
-        return True, resultados
+            vagas.append(cargos)
+
+        # Uma única matriz de scores responsável x assinante para todos os cargos da regra
+        responsaveis = list(dict.fromkeys(nome for cargos in vagas for nome in cargos))
+        scores = score_matrix([nome.upper() for nome in responsaveis], [nome.upper() for nome in assinantes],
+                              score_cutoff=threshold)
+        linha = dict(zip(responsaveis, scores))
+
+        matriz_vagas = []
+        escolhidos = []
+        for cargos in vagas:
+            # Para cada assinante, o responsável do cargo mais parecido com ele
+            melhores = [max(cargos, key=lambda nome: linha[nome][j]) for j in range(len(assinantes))]
+            escolhidos.append(melhores)
+            matriz_vagas.append([linha[nome][j] for j, nome in enumerate(melhores)])
+
+        pares, _ = assign(matriz_vagas, threshold)
+        # Como antes, quando a regra falha só entram os cargos atendidos antes do primeiro que ficou
+        # sem assinante (é o que vai para o score e para os nomes encontrados do retorno inválido)
+        atendidos = {par.row for par in pares}
+        primeira_falha = next((i for i in range(len(vagas)) if i not in atendidos), len(vagas))
+        resultados = [escolhidos[par.row][par.col] for par in pares if par.row < primeira_falha]
+
+        return not cargo_faltando and primeira_falha == len(vagas), resultados
 
     
     @validate
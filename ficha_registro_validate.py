@@ -1,17 +1,14 @@
-import re
-import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Ficha_registro:
     razao_social: str
     cnpj: str
@@ -42,8 +39,7 @@ class Ficha_registro_validations:
     validacao_cbo: str 
     #validacao_rg: str
     
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Ficha_registro_sign:
     espaco_assinatura_empresa: str
     espaco_assinatura_funcionario: str
@@ -64,12 +60,12 @@ class ficha_registro_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         
         self.message_type = message_type
-        self.cartao_proposta = Ficha_registro(**cartao_proposta)
+        self.cartao_proposta = Ficha_registro.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Ficha_registro_sign(**dados_extraidos)
+            self.dados_extraidos = Ficha_registro_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Ficha_registro(**dados_extraidos)
+            self.dados_extraidos = Ficha_registro.from_dict(dados_extraidos)
 
     
     def set_validate_functions_list(self):
@@ -115,7 +111,7 @@ class ficha_registro_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        if not isinstance(self.dados_extraidos.endereco_pessoal, dict):
+        if not isinstance(self.dados_extraidos.endereco_pessoal, (dict, Endereco)):
             return {
                 'valid': False,
                 'percent_match': 0,
@@ -140,8 +136,8 @@ class ficha_registro_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.rg))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.rg))
+        s1 = digits(self.cartao_proposta.rg)
+        s2 = digits(self.dados_extraidos.rg)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -158,8 +154,8 @@ class ficha_registro_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cpf))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        s1 = digits(self.cartao_proposta.cpf)
+        s2 = digits(self.dados_extraidos.cpf)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -176,8 +172,8 @@ class ficha_registro_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_admissao, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_admissao, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_admissao, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_admissao, '%d-%m-%Y')
         if date_1 == date_2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -218,8 +214,8 @@ class ficha_registro_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        date_1 = datetime.datetime.strptime(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
-        date_2 = datetime.datetime.strptime(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
+        date_1 = parse_date(self.cartao_proposta.data_nascimento, '%d/%m/%Y')
+        date_2 = parse_date(self.dados_extraidos.data_nascimento, '%d-%m-%Y')
         if date_1 == date_2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -260,8 +256,8 @@ class ficha_registro_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -277,7 +273,7 @@ class ficha_registro_validate(ValidateDocument):
         - TRUE: Se os endereços forem iguais;
         - FALSE: Caso contrário.
         """
-        if not isinstance(self.dados_extraidos.endereco_empresa, dict):
+        if not isinstance(self.dados_extraidos.endereco_empresa, (dict, Endereco)):
             return {
                 'valid': False,
                 'percent_match': 0,
@@ -336,10 +332,10 @@ class ficha_registro_validate(ValidateDocument):
         - TRUE: Se os dígitos forem iguais;
         - FALSE: Caso contrário.
         """
-        cbo_referencia = ''.join(re.findall(r'\d+', self.dados_extraidos.cbo))
+        cbo_referencia = digits(self.dados_extraidos.cbo)
             
-        cbo_ctps = ''.join(re.findall(r'\d+', ctps['cbo'])) if ctps and ctps.get('cbo') else None
-        cbo_esocial = ''.join(re.findall(r'\d+', esocial['cbo'])) if esocial and esocial.get('cbo') else None
+        cbo_ctps = digits(ctps['cbo']) if ctps and ctps.get('cbo') else None
+        cbo_esocial = digits(esocial['cbo']) if esocial and esocial.get('cbo') else None
 
         if not cbo_ctps and not cbo_esocial:
             return {
@@ -1,11 +1,19 @@
+import os
 import re
 from typing import List, Dict, Any, Optional, Union
 from difflib import SequenceMatcher
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from dateutil import parser
 from datetime import datetime, timedelta
 
+# Pré-filtro da métrica 'sequential': com 'minhash', o SequenceMatcher só roda nos textos que o
+# near_duplicates.MinHashIndex aponta como candidatos (Jaccard estimado dos shingles >= SIMILARITY_PREFILTER_JACCARD).
+# Só é usado a partir de SIMILARITY_PREFILTER_MIN_DOCS documentos; abaixo disso, comparar todos é mais barato.
+SIMILARITY_PREFILTER = os.environ.get('SIMILARITY_PREFILTER', 'none')
+SIMILARITY_PREFILTER_JACCARD = float(os.environ.get('SIMILARITY_PREFILTER_JACCARD', '0.3'))
+SIMILARITY_PREFILTER_MIN_DOCS = int(os.environ.get('SIMILARITY_PREFILTER_MIN_DOCS', '50'))
+# Cálculo da métrica 'sequential': 'difflib' (SequenceMatcher) ou 'rapidfuzz' (fuzz.ratio, mais
+# rápido, mas mede a maior subsequência comum e não aplica o autojunk: os scores não são os mesmos)
+SIMILARITY_BACKEND = os.environ.get('SIMILARITY_BACKEND', 'difflib')
+
 
 class SimilarTextValidator:
     def __init__(self, corpus_texts: List[Dict[str, Any]]):
@@ -13,6 +21,7 @@ class SimilarTextValidator:
         corpus_texts: lista de dicts com {'text': str, 'id': qualquer}
         """
         self.corpus_texts = corpus_texts
+        self._index = None
 
     def preprocess_text(self, text: str) -> str:
         text = text.lower()
@@ -20,7 +29,9 @@ class SimilarTextValidator:
         text = re.sub(r'\s+', ' ', text).strip()
 
         try:
-            stop_words = set(stopwords.words('portuguese'))
+            from text_normalization import stop_words as load_stop_words, word_tokenize
+
+            stop_words = load_stop_words('portuguese')
             tokens = word_tokenize(text, language='portuguese')
             tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
             return ' '.join(tokens)
@@ -44,8 +55,53 @@ class SimilarTextValidator:
 
         return intersection / union
 
-    def sequential_similarity(self, text1: str, text2: str) -> float:
-        return SequenceMatcher(None, text1, text2).ratio()
+    def sequential_similarity(self, text1: str, text2: str, threshold: Optional[float] = None) -> float:
+        """
+        ratio() do SequenceMatcher entre os textos.
+
+        Com threshold, os pares que não podem passar dele são descartados (retorno 0.0) antes do
+        diff completo, em cascata: o limite pelos comprimentos (real_quick_ratio), o limite pelos
+        caracteres em comum (quick_ratio) e só então o ratio(). Os dois são limites superiores do
+        ratio(), então quem passa do threshold continua com o mesmo score de antes.
+
+        Com SIMILARITY_BACKEND='rapidfuzz' (opcional, desligado por padrão) o score é o
+        fuzz.ratio, que não é o mesmo do SequenceMatcher: as decisões mudam em alguns pares (8 de
+        2300 no scripts/bench_sequential_similarity.py), então só deve ser ligado depois de
+        recalibrar o threshold.
+        """
+        if SIMILARITY_BACKEND == 'rapidfuzz':
+            from rapidfuzz import fuzz
+
+            return fuzz.ratio(text1, text2, score_cutoff=None if threshold is None else threshold * 100) / 100
+
+        if threshold is None:
+            return SequenceMatcher(None, text1, text2).ratio()
+        # O mesmo cálculo do real_quick_ratio, sem montar o SequenceMatcher
+        total = len(text1) + len(text2)
+        if total and 2.0 * min(len(text1), len(text2)) / total <= threshold:
+            return 0.0
+        matcher = SequenceMatcher(None, text1, text2)
+        if matcher.quick_ratio() <= threshold:
+            return 0.0
+        score = matcher.ratio()
+        return score if score > threshold else 0.0
+
+    def candidates(self, text: Optional[str], metric="sequential") -> List[Dict[str, Any]]:
+        """
+        Itens do corpus a comparar com text: todos, ou só os candidatos do pré-filtro (na ordem
+        do corpus), se ele estiver ativo para a métrica e o corpus for grande o bastante.
+        """
+        if (metric != 'sequential' or SIMILARITY_PREFILTER != 'minhash' or not text
+                or len(self.corpus_texts) < SIMILARITY_PREFILTER_MIN_DOCS):
+            return self.corpus_texts
+
+        from near_duplicates import MinHashIndex
+
+        if self._index is None:
+            self._index = MinHashIndex(SIMILARITY_PREFILTER_JACCARD)
+            for i, item in enumerate(self.corpus_texts):
+                self._index.add(i, item['extracted_text'])
+        return [self.corpus_texts[i] for i, _ in sorted(self._index.query(text))]
 
     def validate(self, text: dict, threshold=0.9, metric="sequential") -> List[Dict[str, Any]]:
         """
@@ -57,7 +113,7 @@ class SimilarTextValidator:
 
         valid_metrics = {
             'jaccard': self.jaccard_similarity,
-            'sequential': self.sequential_similarity
+            'sequential': lambda text1, text2: self.sequential_similarity(text1, text2, threshold)
         }
 
         if metric not in valid_metrics:
@@ -66,7 +122,7 @@ class SimilarTextValidator:
         similarity_function = valid_metrics[metric]
         alerts = []
 
-        for item in self.corpus_texts:
+        for item in self.candidates(text.get('extracted_text'), metric):
             base_text = item['extracted_text']
             if base_text:
                 score = similarity_function(text.get('extracted_text'), base_text)
@@ -129,6 +185,8 @@ class ValidadorMetadadosPDF:
         return dt
     
     def converter_data(self, data):
+        from dateutil import parser
+
         try:
             x_str = str(data).strip()
 
@@ -182,6 +240,8 @@ class ValidadorMetadadosPDF:
     
     def _converter_data_emissao(self, data_emissao: Union[datetime, str]) -> Optional[datetime]:
         """Converte data de emissão para datetime com formatos expandidos"""
+        from dateutil import parser
+
         if isinstance(data_emissao, datetime):
             return self._normalizar_timezone(data_emissao)
         elif isinstance(data_emissao, str):
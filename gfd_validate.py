@@ -1,16 +1,13 @@
-import re
-import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
 from Distances import distances
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from fraud_tools import ValidadorMetadadosPDF
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Gfd:
     cnpj: str
     razao_social: str
@@ -34,8 +31,7 @@ class Gfd_validations:
     validacao_tag: str
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Gfd_fraud:
     creator: str 
     producer: str
@@ -52,13 +48,13 @@ class Gfd_fraud_validations:
 class gfd_validate(ValidateDocument):
     
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Gfd(**cartao_proposta)
+        self.cartao_proposta = Gfd.from_dict(cartao_proposta)
         self.message_type = message_type
 
         if (message_type == "fraud_metadata"):
-            self.dados_extraidos = Gfd_fraud(**dados_extraidos)
+            self.dados_extraidos = Gfd_fraud.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Gfd(**dados_extraidos)
+            self.dados_extraidos = Gfd.from_dict(dados_extraidos)
    
 
     def set_validate_functions_list(self):
@@ -81,8 +77,8 @@ class gfd_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1[:8] == s2[:8]:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -118,7 +114,7 @@ class gfd_validate(ValidateDocument):
         """
         
         tag = self.dados_extraidos.tag
-        cnpj = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        cnpj = digits(self.dados_extraidos.cnpj)
         competencia = self.dados_extraidos.competencia
 
         tag_comp = cnpj + " " + competencia + " MENSAL"
@@ -204,8 +200,8 @@ class gfd_validate(ValidateDocument):
                         "trecho_procurado": "", "trecho_encontrado": "",
                         "regras_subscricao_errors": 409}
         
-        data_vencimento1 = datetime.datetime.strptime(self.dados_extraidos.data_vencimento, '%d-%m-%Y').date()
-        data_vencimento2 = datetime.datetime.strptime(gfip_novo.get('data_vencimento'), '%d/%m/%Y').date()
+        data_vencimento1 = parse_date(self.dados_extraidos.data_vencimento, '%d-%m-%Y').date()
+        data_vencimento2 = parse_date(gfip_novo.get('data_vencimento'), '%d/%m/%Y').date()
 
         data_vencimento1_str = data_vencimento1.strftime('%d/%m/%Y')
         data_vencimento2_str = data_vencimento2.strftime('%d/%m/%Y')
@@ -232,8 +228,8 @@ class gfd_validate(ValidateDocument):
                         "trecho_procurado": "", "trecho_encontrado": "",
                         "regras_subscricao_errors": 409}
         
-        competencia1 = datetime.datetime.strptime(self.dados_extraidos.competencia, '%m/%Y').date()
-        competencia2 = datetime.datetime.strptime(gfip_novo.get('competencia'), '%m/%Y').date()
+        competencia1 = parse_date(self.dados_extraidos.competencia, '%m/%Y').date()
+        competencia2 = parse_date(gfip_novo.get('competencia'), '%m/%Y').date()
 
         competencia1_str = competencia1.strftime('%m/%Y')
         competencia2_str = competencia2.strftime('%m/%Y')
@@ -260,8 +256,8 @@ class gfd_validate(ValidateDocument):
                         "trecho_procurado": "", "trecho_encontrado": "",
                         "regras_subscricao_errors": 409}
         
-        s1 = ''.join(re.findall( r'\d+', gfip_novo.get('identificador')))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.identificador))
+        s1 = digits(gfip_novo.get('identificador'))
+        s2 = digits(self.dados_extraidos.identificador)
 
         score = 0
 
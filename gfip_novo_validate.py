@@ -1,17 +1,16 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
 from Distances import distances
 from collections import namedtuple
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from fraud_tools import ValidadorMetadadosPDF
+from normalized_fields import digits, parse_date
+from name_matching import compare_sets
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Gfip_novo:
     cnpj: str
     razao_social: str
@@ -34,8 +33,7 @@ class Gfip_novo_validations:
 
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Gfip_novo_fraud:
     creator: str 
     producer: str
@@ -70,6 +68,8 @@ tipo_vinculo = {
 
 
 class Name:
+    # O hash é o do texto exato: em set_1 - set_2 só nomes idênticos se encontram. A comparação
+    # aproximada dos conjuntos é feita por name_matching.compare_sets (ver _set_comparison).
     def __init__(self, nome, limiar):
         self.nome = nome
         self.limiar = limiar
@@ -77,7 +77,7 @@ class Name:
     # Lógica personalizada para comparação de igualdade
     def __eq__(self, other):
         if isinstance(other, Name):
-            score = distances(self.nome, other.nome).norm_score()
+            score = distances(self.nome, other.nome).norm_score(cutoff=self.limiar)
             return score >= self.limiar
         return False
 
@@ -85,19 +85,20 @@ class Name:
         return hash(self.nome)
 
     def __repr__(self):
-        return self.nome
+        # nome pode vir None da extração; o trecho do resultado mostra 'None'
+        return str(self.nome)
 
 
 class gfip_novo_validate(ValidateDocument):
 
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Gfip_novo(**cartao_proposta)
+        self.cartao_proposta = Gfip_novo.from_dict(cartao_proposta)
         self.message_type = message_type
 
         if (message_type == "fraud_metadata"):
-            self.dados_extraidos = Gfip_novo_fraud(**dados_extraidos)
+            self.dados_extraidos = Gfip_novo_fraud.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Gfip_novo(**dados_extraidos)
+            self.dados_extraidos = Gfip_novo.from_dict(dados_extraidos)
    
     def set_validate_functions_list(self):
         return list(Gfip_novo_validations.__annotations__.keys())
@@ -108,7 +109,7 @@ class gfip_novo_validate(ValidateDocument):
     def get_validate_type(self):
         return self.message_type
 
-    def _set_comparison(self, set_1, set_2, modo_comparacao):
+    def _set_comparison(self, set_1, set_2, modo_comparacao, limiar=None):
         """
         Lógica de Comparação:
         - 'somente_proposta': A comparação é feita apenas entre os nomes presentes na proposta e os nomes extraídos do documento ('trabalhadores_collection'). 
@@ -122,20 +123,22 @@ class gfip_novo_validate(ValidateDocument):
         - 'interseccao_completa': A comparação verifica se os dois conjuntos de nomes possuem exatamente os mesmos elementos, 
         ou seja, se a interseção entre os dois conjuntos é igual a ambos os conjuntos. 
         Retorna TRUE apenas se os dois conjuntos de nomes forem idênticos, sem diferenças.
+
+        Com `limiar`, os conjuntos são de Name e a comparação é aproximada (norm_score >= limiar),
+        feita por name_matching.compare_sets com índice de bloqueio; um Name sem nome (None) nunca
+        é encontrado. Sem `limiar`, é a comparação exata dos conjuntos (CPFs, vínculos).
         """
-        dif_s1_set = list(set_1 - set_2)
-        dif_s2_set = list(set_2 - set_1)
-        dif_simetric = list(set_1 ^ set_2)
-        match modo_comparacao:
-            case 'somente_proposta':
-                is_valid = len(dif_s1_set) == 0
-                missed = dif_s1_set
-            case 'somente_documento':
-                is_valid = len(dif_s2_set) == 0
-                missed = dif_s2_set
-            case 'interseccao_completa':
-                is_valid = len(dif_simetric) == 0
-                missed = dif_simetric
+        if limiar is not None:
+            missed = compare_sets(set_1, set_2, modo_comparacao, limiar, key=lambda name: name.nome)
+        else:
+            match modo_comparacao:
+                case 'somente_proposta':
+                    missed = list(set_1 - set_2)
+                case 'somente_documento':
+                    missed = list(set_2 - set_1)
+                case 'interseccao_completa':
+                    missed = list(set_1 ^ set_2)
+        is_valid = len(missed) == 0
 
         if is_valid:
             return {'valid': True, 'percent_match': 100,
@@ -167,7 +170,7 @@ class gfip_novo_validate(ValidateDocument):
                      for i in gfip_novo['funcionarios']])
         s2_set = set([Name(i['Nome Trabalhador'], limiar)
                      for i in self.dados_extraidos.trabalhadores_collection])
-        return self._set_comparison(s1_set, s2_set, modo_comparacao)
+        return self._set_comparison(s1_set, s2_set, modo_comparacao, limiar=limiar)
 
     #@validate
     #@required_docs('gfip_novo')
@@ -185,9 +188,9 @@ class gfip_novo_validate(ValidateDocument):
             return {'valid': False, 'percent_match': 0,
                         "trecho_procurado": "", "trecho_encontrado": "",
                         "regras_subscricao_errors": 409}
-        s1_set = set([''.join(re.findall(r'\d+', i['cpf']))
+        s1_set = set([digits(i['cpf'])
                      for i in gfip_novo['funcionarios']])
-        s2_set = set([''.join(re.findall(r'\d+', i['CPF']))
+        s2_set = set([digits(i['CPF'])
                      for i in self.dados_extraidos.trabalhadores_collection])
         return self._set_comparison(s1_set, s2_set, modo_comparacao)
 
@@ -200,10 +203,8 @@ class gfip_novo_validate(ValidateDocument):
         - TRUE: Se as raízes dos CNPJs forem iguais;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(
-            r'\d+', self.cartao_proposta.cnpj))[:8]
-        s2 = ''.join(re.findall(
-            r'\d+', self.dados_extraidos.cnpj.split('/')[0]))
+        s1 = digits(self.cartao_proposta.cnpj)[:8]
+        s2 = digits(self.dados_extraidos.cnpj.split('/')[0])
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
@@ -241,7 +242,7 @@ class gfip_novo_validate(ValidateDocument):
         - Se for uma coligada (CNPJ raiz diferente), cada CNPJ individualmente não pode ter mais de 99 vidas.
         """
         s1 = self.cartao_proposta.compulsoriedade
-        s2_list = [''.join(re.findall(r'\d+', i['Estabelecimento'].split('/')[0]))
+        s2_list = [digits(i['Estabelecimento'].split('/')[0])
                    for i in self.dados_extraidos.trabalhadores_collection]
 
         if int(s1) == int(compulsoriedade["FACULTATIVA"]):
@@ -270,11 +271,12 @@ class gfip_novo_validate(ValidateDocument):
         - TRUE: Caso a competência seja no máximo há dois meses antes da validação.
         - FALSE: Caso contrário.
         """
+        from dateutil.relativedelta import relativedelta
 
         now = datetime.datetime.now().date()
         
         competencia_str = self.dados_extraidos.competencia.strip()
-        extracted_competencia_date = datetime.datetime.strptime(competencia_str, "%m/%Y").date().replace(day=1)
+        extracted_competencia_date = parse_date(competencia_str, "%m/%Y").date().replace(day=1)
 
         limite_data = now - relativedelta(days=days)
 
@@ -316,9 +318,9 @@ class gfip_novo_validate(ValidateDocument):
         t_de = list(filter(lambda d: int(d['Categoria']) in [
                     101, 103], self.dados_extraidos.trabalhadores_collection))
 
-        t_cp_set = set([worker(cpf=''.join(re.findall(r'\d+', i['cpf'])),
+        t_cp_set = set([worker(cpf=digits(i['cpf']),
                        vinculo=int(i['tipo_vinculo'])) for i in t_cp])
-        t_de_set = set([worker(cpf=''.join(re.findall(r'\d+', i['CPF'])),
+        t_de_set = set([worker(cpf=digits(i['CPF']),
                        vinculo=int(categoria_vinculo_depara[i['Categoria']])) for i in t_de])
 
         return self._set_comparison(t_cp_set, t_de_set, modo_comparacao)
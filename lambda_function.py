@@ -1,8 +1,15 @@
+import copy
+import hashlib
 import json
 import logging
+import math
 import os
+import time
 import boto3
-from mongodb_connections import MongoDBConnections
+from mongodb_connections import MongoDBConnections, is_mongo_unavailable, mongo_breaker
+from circuit_breaker import CircuitBreaker
+from log_utils import LogPayload, dumps
+import normalized_fields
 
 logger = logging.getLogger()
 logger.setLevel("INFO")
@@ -11,6 +18,18 @@ SQS_RETRY_QUEUE = os.environ['SQS_RETRY_QUEUE']
 DELAY_SECONDS = os.environ['DELAY_SECONDS']
 FOLDER_NAME = os.environ['FOLDER_NAME']
 S3_BUCKET = os.environ['S3_BUCKET']
+# Tempo reservado, ao fim da invocação, para gravar os resultados no Mongo e enviar mensagens ao SQS
+DEADLINE_MARGIN_MS = int(os.environ.get('DEADLINE_MARGIN_MS', '3000'))
+IDEMPOTENCY_ENABLED = os.environ.get('IDEMPOTENCY_ENABLED', 'true').lower() not in {'false', '0', 'no'}
+MAX_SQS_DELAY_SECONDS = 900
+# Reenfileiramentos por Mongo indisponível antes de desistir da mensagem (com DELAY_SECONDS=2, cerca de 2h)
+MAX_UNAVAILABLE_REQUEUES = int(os.environ.get('MAX_UNAVAILABLE_REQUEUES', '10'))
+
+
+class MongoUnavailableError(Exception):
+  """
+  O Mongo continuou indisponível depois de MAX_UNAVAILABLE_REQUEUES reenfileiramentos.
+  """
 
 def get_object_from_s3(message):
   s3 = boto3.client('s3')
@@ -29,27 +48,119 @@ def get_object_from_s3(message):
     print(f"Erro ao buscar o arquivo JSON do S3: {e}")
     return None
 
-def process_document(message):
+def send_deferred_validations(sqs, message, pendentes, resultados_parciais):
+    """
+    Reenvia a mensagem para a fila com as validações que não couberam no tempo da invocação.
+    Os resultados já calculados seguem junto para não serem refeitos.
+    """
+    follow_up = dict(message)
+    follow_up['validacoes_pendentes'] = pendentes
+    follow_up['resultados_parciais'] = resultados_parciais
+    sqs.send_message(QueueUrl=SQS_RETRY_QUEUE, MessageBody=dumps(follow_up))
+    logger.info(f'[INFO] {len(pendentes)} validações adiadas para uma nova mensagem: {pendentes}')
+
+def requeue_unavailable(sqs, message):
+    """
+    Devolve a mensagem para a fila enquanto o Mongo estiver indisponível, com backoff exponencial
+    e nunca antes de o circuito permitir uma nova tentativa. Não conta como tentativa de validação.
+
+    Depois de MAX_UNAVAILABLE_REQUEUES reenfileiramentos a mensagem não volta mais para a fila:
+    MongoUnavailableError faz a invocação falhar, e a redrive policy da fila (ou o destino de
+    falha do SNS) leva a mensagem para a dead-letter queue.
+    """
+    requeue = message.get('tentativa_indisponivel', 0) + 1
+    if requeue > MAX_UNAVAILABLE_REQUEUES:
+      logger.error(f'[ERROR] Mongo indisponível após {MAX_UNAVAILABLE_REQUEUES} reenfileiramentos. Desistindo da mensagem.')
+      raise MongoUnavailableError(f'Mongo indisponível após {MAX_UNAVAILABLE_REQUEUES} reenfileiramentos')
+    follow_up = dict(message)
+    follow_up['tentativa_indisponivel'] = requeue
+    delay = min(MAX_SQS_DELAY_SECONDS, max(math.ceil(mongo_breaker.retry_after()), pow(int(DELAY_SECONDS), requeue)))
+    sqs.send_message(QueueUrl=SQS_RETRY_QUEUE, MessageBody=dumps(follow_up), DelaySeconds=delay)
+    logger.info(f'[INFO] Mongo indisponível. Mensagem reenfileirada com atraso de {delay}s.')
+
+def message_fingerprint(message):
+    """
+    Identifica uma mensagem pelo documento, tipo de mensagem, tentativa e conteúdo extraído.
+    Entregas repetidas da mesma mensagem pelo SQS geram o mesmo fingerprint.
+    """
+    information = json.dumps(message.get('document_information'), sort_keys=True, default=str)
+    key = json.dumps([
+        message.get('document_id'),
+        message.get('message_type'),
+        message.get('tentativa'),
+        hashlib.sha256(information.encode('utf-8')).hexdigest()
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def process_document(message, context=None):
     sqs = boto3.client('sqs')
     s3_object = None
+    sqs_message = message
+    # Cópia intacta da mensagem recebida, que é a reenfileirada se o Mongo estiver indisponível
+    # (uma continuação volta com as validações pendentes e os resultados parciais)
+    original_message = copy.deepcopy(message)
+    # Campos de uma mensagem de continuação (validações adiadas); não seguem para os retries
+    pendentes = message.pop('validacoes_pendentes', None)
+    resultados_parciais = message.pop('resultados_parciais', None) or {}
+
+    # Com o circuito aberto a mensagem volta para a fila sem executar validações
+    if mongo_breaker.state == CircuitBreaker.OPEN:
+      requeue_unavailable(sqs, original_message)
+      return None
+
     if message.get('flag_large_file'):
        s3_object = get_object_from_s3(message)
        if s3_object is not None:
           message = s3_object
 
+    fingerprint = None
+    mongo_conn = None
+    if IDEMPOTENCY_ENABLED:
+      fingerprint = message_fingerprint(message)
+      mongo_conn = MongoDBConnections()
+      try:
+        processed = mongo_conn.find_processed_message(fingerprint)
+      except Exception as e:
+        if not is_mongo_unavailable(e):
+          raise
+        requeue_unavailable(sqs, original_message)
+        return None
+      if processed is not None:
+        logger.info(f'[INFO] Mensagem {fingerprint} já processada. Retornando o resultado armazenado.')
+        return processed.get('payload')
+
     document_type = message["document_type"].lower()
   
     module = __import__(document_type+'_validate')
     cls_validate = getattr(module, document_type+'_validate')
 
-    obj_validate = cls_validate(message["cartao_proposta"], message["document_information"], message["message_type"])
-    validate = getattr(obj_validate, 'validate')
+    deadline = None
+    if context is not None:
+      deadline = time.monotonic() + (context.get_remaining_time_in_millis() - DEADLINE_MARGIN_MS) / 1000
+
+    # Os campos normalizados no construtor (ex.: a congênere da carta de permanência) são reaproveitados pelas validações
+    with normalized_fields.message_scope():
+      obj_validate = cls_validate(message["cartao_proposta"], message["document_information"], message["message_type"])
+      output = obj_validate.validate(deadline=deadline, only=pendentes)
+    if resultados_parciais:
+      output = resultados_parciais | output
+      output = {val: output[val] for val in obj_validate.get_validations_list() if val in output}
+
+    if any('SERVICO_INDISPONIVEL' in (doc.get('fraud_errors'), doc.get('regras_subscricao_errors')) for doc in output.values()):
+      requeue_unavailable(sqs, original_message)
+      return None
+
+    if obj_validate.validacoes_adiadas:
+      send_deferred_validations(sqs, sqs_message, obj_validate.validacoes_adiadas, output)
+      return None
 
-    output = validate()
     message['end_retry'] = True
     tentativa = 1 if message.get('tentativa') is None else message['tentativa']+1
     message['tentativa'] = tentativa
 
+    # Os retries só são enviados depois de gravados os resultados: se o Mongo cair na gravação,
+    # a mensagem original volta para a fila e não pode haver um retry dela já enviado
+    retries = []
     for doc in output.values():
       if ((doc.get('fraud_errors') == 'ESPERAR_DOCUMENTOS' or doc.get('fraud_errors') == 'ERRO_INTERNO') or \
         (doc.get('regras_subscricao_errors') == 'ESPERAR_DOCUMENTOS' or doc.get('regras_subscricao_errors') == 'ERRO_INTERNO')) and \
@@ -57,18 +168,37 @@ def process_document(message):
         message['end_retry'] = False
 
         delay = pow(int(DELAY_SECONDS), tentativa)
-        sqs.send_message(QueueUrl=SQS_RETRY_QUEUE, MessageBody=json.dumps(message),
-                          DelaySeconds=delay)
+        retries.append({'QueueUrl': SQS_RETRY_QUEUE, 'MessageBody': dumps(message), 'DelaySeconds': delay})
 
       if tentativa > 5:
           message['end_retry'] = True
           logger.info('[INFO] Mais de 5 tentativas. Parando.')
           break
 
-    logger.info(f'output {output}')
+    logger.info('output %s', LogPayload(output))
+
+    try:
+      payload = save_results(mongo_conn, message, output, document_type, fingerprint)
+    except Exception as e:
+      if not is_mongo_unavailable(e):
+        raise
+      requeue_unavailable(sqs, original_message)
+      return None
+
+    for retry in retries:
+      sqs.send_message(**retry)
 
-    mongo_conn = MongoDBConnections()
+    return payload
 
+def save_results(mongo_conn, message, output, document_type, fingerprint):
+    """
+    Grava os resultados da validação no Mongo (e a mensagem como processada, com idempotência)
+    e retorna o payload.
+    """
+    if mongo_conn is None:
+      mongo_conn = MongoDBConnections()
+
+    payload = None
     if 'validacao_metadado_datas' in output:
       mongo_conn.update_metadata_data(message, output)
     else:
@@ -83,21 +213,25 @@ def process_document(message):
       else:
         mongo_conn.update_subscription_rules(message, output)
 
-      payload = json.dumps({
+      payload_data = {
         "job_id": message['JobId'],
         "document_type": document_type,
         "document_id": message['document_id'],
         "cartao_proposta": message['cartao_proposta'],
         "dados_regras_subscricao": output
-      })
+      }
+      payload = dumps(payload_data)
+
+      logger.info('payload %s', LogPayload(payload_data))
+      logger.info('message %s', LogPayload(message))
 
-      logger.info(f'payload {payload}')
-      logger.info(f'message {message}')
+    if fingerprint is not None:
+      mongo_conn.save_processed_message(fingerprint, payload)
 
-      return payload
+    return payload
 
 def lambda_handler(event, context):
-  logger.info(event)
+  logger.info('%s', LogPayload(event))
   for record in event['Records']:
     if record.get('Sns'):
       message = json.loads(record['Sns']['Message'])
@@ -105,12 +239,12 @@ def lambda_handler(event, context):
       os.environ["AGREGADOR"] = message["agregador"]
       os.environ["DOCUMENT_ID"] = message["document_id"]
       os.environ["DOCUMENT_LABEL"] = message["document_label"]
-      return process_document(message)
+      return process_document(message, context)
     
-    print(record)
+    logger.info('%s', LogPayload(record))
     message = json.loads(record['body'])
     os.environ["UUID"] = message["uuid"]
     os.environ["AGREGADOR"] = message["agregador"]
     os.environ["DOCUMENT_ID"] = message["document_id"]
     os.environ["DOCUMENT_LABEL"] = message["document_label"]
-    return process_document(message)
+    return process_document(message, context)
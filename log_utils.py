@@ -0,0 +1,66 @@
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o json da biblioteca padrão
+    orjson = None
+
+# 'compact' trunca/oculta campos grandes nos logs; 'full' mantém o comportamento antigo
+LOG_PAYLOAD_MODE = os.environ.get('LOG_PAYLOAD_MODE', 'compact').lower()
+LOG_MAX_FIELD_CHARS = int(os.environ.get('LOG_MAX_FIELD_CHARS', '300'))
+LOG_MAX_LIST_ITEMS = int(os.environ.get('LOG_MAX_LIST_ITEMS', '20'))
+REDACTED_FIELDS = set(os.environ.get('LOG_REDACTED_FIELDS', 'extracted_text').split('|'))
+
+
+def dumps(obj):
+    """
+    Serializa obj para uma string JSON compacta, usando orjson quando disponível.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # orjson não aceita chaves não-string nem inteiros acima de 64 bits
+            pass
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def compact(obj, max_chars=LOG_MAX_FIELD_CHARS, max_items=LOG_MAX_LIST_ITEMS):
+    """
+    Retorna uma cópia de obj adequada para log: campos listados em REDACTED_FIELDS são
+    substituídos pelo tamanho, strings longas são truncadas e listas longas são resumidas.
+    """
+    if isinstance(obj, dict):
+        ret = {}
+        for key, value in obj.items():
+            if key in REDACTED_FIELDS and isinstance(value, str):
+                ret[key] = f'<{len(value)} caracteres omitidos>'
+            else:
+                ret[key] = compact(value, max_chars, max_items)
+        return ret
+    if isinstance(obj, (list, tuple)):
+        ret = [compact(value, max_chars, max_items) for value in obj[:max_items]]
+        if len(obj) > max_items:
+            ret.append(f'<+{len(obj) - max_items} itens>')
+        return ret
+    if isinstance(obj, str) and len(obj) > max_chars:
+        return f'{obj[:max_chars]}...<+{len(obj) - max_chars} caracteres>'
+    return obj
+
+
+class LogPayload:
+    """
+    Adia a formatação de um payload até o momento em que o logger realmente emitir o
+    registro. Uso: logger.info('output %s', LogPayload(output)).
+    """
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        if LOG_PAYLOAD_MODE == 'full':
+            return str(self.obj)
+        return str(compact(self.obj))
@@ -1,17 +1,14 @@
-import re
-import datetime
-from dateutil.relativedelta import relativedelta
-from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
+from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate, accesses, cacheable
 from Distances import distances
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from fraud_tools import ValidadorMetadadosPDF
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Mei:
     razao_social: str
     cnpj: str
@@ -37,8 +34,7 @@ class Mei_validations:
     validacao_data_abertura_empresa: str 
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Mei_fraud:
     creator: str 
     producer: str
@@ -53,15 +49,18 @@ class Mei_fraud_validations:
 
 
 class mei_validate(ValidateDocument):
-    
+
+    # Validações independentes entre si: podem executar em paralelo
+    parallel_validations = True
+
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Mei(**cartao_proposta)
+        self.cartao_proposta = Mei.from_dict(cartao_proposta)
         self.message_type = message_type
 
         if (message_type == "fraud_metadata"):
-            self.dados_extraidos = Mei_fraud(**dados_extraidos)
+            self.dados_extraidos = Mei_fraud.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Mei(**dados_extraidos)
+            self.dados_extraidos = Mei.from_dict(dados_extraidos)
 
     def set_validate_functions_list(self):
         return list(Mei_validations.__annotations__.keys())
@@ -103,8 +102,8 @@ class mei_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}   
         else:
@@ -145,6 +144,8 @@ class mei_validate(ValidateDocument):
             
             
     @validate
+    @cacheable(version=1)
+    @accesses(reads={'dados_extraidos.nome'})
     @required_docs('rg', 'cnh')
     def validacao_nome(self, rg, cnh, limiar=90):
         """
@@ -163,7 +164,7 @@ class mei_validate(ValidateDocument):
         s1 = rg['nome'] if rg is not None else cnh['nome']
         s2 = self.dados_extraidos.nome
         
-        sim_score = distances(s1.upper(), s2.upper()).norm_score()
+        sim_score = distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar)
         if sim_score >= limiar:
             return {'valid': True, 'percent_match': 100, 'target': 'nome',
                         "trecho_procurado": s2,
@@ -175,6 +176,8 @@ class mei_validate(ValidateDocument):
             
         
     @validate
+    @cacheable(version=1)
+    @accesses(reads={'dados_extraidos.cpf'})
     @required_docs('rg', 'cnh')
     def validacao_cpf(self, rg, cnh):
         """
@@ -192,8 +195,8 @@ class mei_validate(ValidateDocument):
         
         s1 = rg['cpf'] if rg is not None else cnh['cpf']
 
-        s1 = ''.join(re.findall(r'\d+', s1))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        s1 = digits(s1)
+        s2 = digits(self.dados_extraidos.cpf)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100, 'target': 'cpf',
                         "trecho_procurado": s2,
@@ -220,8 +223,8 @@ class mei_validate(ValidateDocument):
                         "trecho_procurado": "", "trecho_encontrado": "",
                         "regras_subscricao_errors": 409}
 
-        s1 = ''.join(re.findall( r'\d+', cnpj.get('numero_cnae')))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.numero_cnae))
+        s1 = digits(cnpj.get('numero_cnae'))
+        s2 = digits(self.dados_extraidos.numero_cnae)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100, 'target': 'numero_cnae',
                         "trecho_procurado": s2,
@@ -257,8 +260,8 @@ class mei_validate(ValidateDocument):
                         "trecho_procurado": s1,
                         "trecho_encontrado": s2}
 
-        date_1 = datetime.datetime.strptime(s1, '%d-%m-%Y')
-        date_2 = datetime.datetime.strptime(s2, '%d-%m-%Y')
+        date_1 = parse_date(s1, '%d-%m-%Y')
+        date_2 = parse_date(s2, '%d-%m-%Y')
 
         date_1_str = date_1.strftime('%d/%m/%Y')
         date_2_str = date_2.strftime('%d/%m/%Y')
@@ -297,8 +300,8 @@ class mei_validate(ValidateDocument):
                         "trecho_procurado": s1,
                         "trecho_encontrado": s2}
 
-        date_1 = datetime.datetime.strptime(s1, '%d-%m-%Y')
-        date_2 = datetime.datetime.strptime(s2, '%d-%m-%Y')
+        date_1 = parse_date(s1, '%d-%m-%Y')
+        date_2 = parse_date(s2, '%d-%m-%Y')
 
         date_1_str = date_1.strftime('%d/%m/%Y')
         date_2_str = date_2.strftime('%d/%m/%Y')
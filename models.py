@@ -0,0 +1,146 @@
+import typing
+
+
+def is_document_model(value):
+    return getattr(value, '_document_model', False)
+
+
+def _nested_model(annotation):
+    """
+    Retorna o modelo aninhado de um campo (ex.: Endereco ou Optional[Endereco]), se houver.
+    """
+    candidates = typing.get_args(annotation) or (annotation,)
+    for candidate in candidates:
+        if isinstance(candidate, type) and is_document_model(candidate):
+            return candidate
+    return None
+
+
+def _nested_field(campo, model):
+    """
+    Propriedade de um campo anotado com outro modelo. O valor fica no slot _campo como veio e o
+    dicionário só é convertido no modelo no primeiro acesso (a conversão fica guardada no slot).
+    Se faltar algum campo obrigatório, o dicionário é mantido, para que só a validação que o usa
+    falhe, como antes.
+    """
+    slot = f'_{campo}'
+
+    def get(self):
+        valor = getattr(self, slot)
+        if isinstance(valor, dict):
+            try:
+                valor = model.from_dict(valor)
+            except TypeError:
+                return valor
+            setattr(self, slot, valor)
+        return valor
+
+    def set(self, valor):
+        setattr(self, slot, valor)
+
+    return property(get, set)
+
+
+def _model_to_dict(self):
+    dados = {}
+    for campo in self._fields:
+        valor = getattr(self, campo)
+        dados[campo] = valor.to_dict() if is_document_model(valor) else valor
+    return dados
+
+
+def _model_eq(self, other):
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    return all(getattr(self, campo) == getattr(other, campo) for campo in self._fields)
+
+
+def _model_repr(self):
+    campos = ', '.join(f'{campo}={getattr(self, campo)!r}' for campo in self._fields)
+    return f'{self.__class__.__qualname__}({campos})'
+
+
+def document_model(cls):
+    """
+    Gera, a partir das anotações de cls, um modelo de documento com __slots__, no lugar de
+    @dataclass_json + @dataclass.
+
+    O construtor é Modelo.from_dict(dados), compilado uma única vez por modelo: lê cada campo
+    direto do dicionário, sem desempacotar argumentos nomeados, e
+    - ignora chaves desconhecidas, então aceita o JSON extraído como veio;
+    - continua exigindo os campos sem valor padrão (TypeError se faltarem, como no dataclass);
+    - converte dicionários em campos anotados com outro modelo (ex.: Endereco) na instância do
+      modelo, no primeiro acesso ao campo (se faltar algum campo obrigatório o dicionário é
+      mantido). Construir o modelo não paga a conversão, que só acontece se alguma validação
+      usar o campo.
+
+    Modelo(campo=valor, ...) continua disponível, com as mesmas regras. to_dict() faz o caminho
+    inverso, inclusive para os modelos aninhados.
+    """
+    annotations = cls.__dict__.get('__annotations__', {})
+    fields = tuple(annotations)
+    namespace = {'_new': object.__new__}
+    init_params = []
+    init_body = []
+    fast_body = []
+    slow_body = []
+    nested = {}
+    slots = []
+    for campo in fields:
+        # Campos com modelo aninhado guardam o valor cru no slot _campo (ver _nested_field)
+        model = _nested_model(annotations[campo])
+        if model is not None:
+            nested[campo] = _nested_field(campo, model)
+        slot = f'_{campo}' if model is not None else campo
+        slots.append(slot)
+
+        fast_body.append(f"self.{slot} = dados['{campo}']")
+        if campo in cls.__dict__:
+            namespace[f'_default_{campo}'] = cls.__dict__[campo]
+            init_params.append(f'{campo}=_default_{campo}')
+            slow_body.append(f"self.{slot} = dados['{campo}'] if '{campo}' in dados else _default_{campo}")
+        else:
+            init_params.append(campo)
+            slow_body.append(fast_body[-1])
+        init_body.append(f'self.{slot} = {campo}')
+
+    namespace['_required'] = [campo for campo in fields if campo not in cls.__dict__]
+    # from_dict tenta primeiro ler todos os campos direto (caso comum); se faltar algum,
+    # refaz a leitura usando os valores padrão e acusa os campos obrigatórios ausentes
+    source = '\n'.join([
+        f"def __init__(self, {', '.join(init_params + ['**_ignorados'])}):",
+        *['    ' + line for line in init_body or ['pass']],
+        '',
+        'def from_dict(cls, dados):',
+        '    self = _new(cls)',
+        '    try:',
+        *['        ' + line for line in fast_body or ['pass']],
+        '    except KeyError:',
+        '        faltantes = [campo for campo in _required if campo not in dados]',
+        '        if faltantes:',
+        '            raise TypeError(f"{cls.__name__}.from_dict() sem os campos obrigatórios: {faltantes}") from None',
+        *['        ' + line for line in slow_body],
+        '    return self',
+    ])
+    exec(source, namespace)
+
+    attrs = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in fields and key not in {'__dict__', '__weakref__'}
+    }
+    attrs.update(nested)
+    attrs.update({
+        '__slots__': tuple(slots),
+        '_document_model': True,
+        '_fields': fields,
+        '__init__': namespace['__init__'],
+        'from_dict': classmethod(namespace['from_dict']),
+        '__eq__': _model_eq,
+        '__hash__': None,
+        '__repr__': _model_repr,
+        'to_dict': _model_to_dict,
+    })
+    model = type(cls.__name__, cls.__bases__, attrs)
+    model.__init__.__qualname__ = f'{model.__qualname__}.__init__'
+    model.from_dict.__func__.__qualname__ = f'{model.__qualname__}.from_dict'
+    return model
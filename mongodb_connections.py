@@ -1,17 +1,51 @@
-from pymongo import MongoClient
 import os
 import json
 import boto3
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
-from datetime import datetime
+from datetime import datetime, timezone
+from circuit_breaker import CircuitBreaker, CircuitOpenError
 
 REGION_NAME     = os.environ['REGION_NAME']
 SECRET_NAME     = os.environ['SECRET_NAME']
 INFORMATION     = os.environ['INFORMATION']
 SIMILARITY_LIST = os.environ["SIMILARITY_LIST"]
-
-dynamodb = boto3.resource('dynamodb', region_name=REGION_NAME)
+PROCESSED_MESSAGES_COLLECTION = os.environ.get('PROCESSED_MESSAGES_COLLECTION', 'mensagens_processadas')
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', '86400'))
+RESULT_CACHE_COLLECTION = os.environ.get('RESULT_CACHE_COLLECTION', 'resultados_validacao')
+RESULT_CACHE_TTL_SECONDS = int(os.environ.get('RESULT_CACHE_TTL_SECONDS', '604800'))
+
+# Documentos com esses status não são usados nas validações
+DOCUMENT_STATUS_INVALIDOS = [
+    "ERRO_DOCUMENTO_NAO_IDENTIFICADO",
+    "TIPO_INVALIDO",
+    "ERRO_VALIDACAO_TIPO_DOCUMENTO"
+]
+
+# Os índices TTL só precisam ser garantidos uma vez por container
+_processed_messages_index_ready = False
+_result_cache_index_ready = False
+
+
+def is_mongo_unavailable(exc):
+    """
+    Indica se a exceção representa indisponibilidade do Mongo (timeout ou falha de conexão),
+    e não um erro nos dados ou na consulta.
+    """
+    if isinstance(exc, (CircuitOpenError, TimeoutError, ConnectionError)):
+        return True
+    try:
+        from pymongo.errors import ConnectionFailure, ExecutionTimeout
+    except ImportError:
+        return False
+    return isinstance(exc, (ConnectionFailure, ExecutionTimeout))
+
+
+mongo_breaker = CircuitBreaker(
+    'mongo',
+    failure_threshold=int(os.environ.get('MONGO_BREAKER_FAILURES', '3')),
+    reset_timeout=float(os.environ.get('MONGO_BREAKER_RESET_SECONDS', '30')),
+    is_failure=is_mongo_unavailable
+)
 
 class SecretsManager:
     def __init__(self):
@@ -42,6 +76,9 @@ class SecretsManager:
 class MongoDBConnections:
 
     def __init__(self):
+        # pymongo é importado aqui para não pesar no import dos módulos de validação
+        from pymongo import MongoClient
+
         self.secret_instance = SecretsManager()
         self.mongo_secret = self.secret_instance.get_secret()
 
@@ -53,9 +90,41 @@ class MongoDBConnections:
                                     retryWrites=False)
                                     
         self.mdb = self.mongo_client[self.mongo_secret['DB']]
+        # Quantidade de consultas feitas ao Mongo por esta conexão (usado nas métricas)
+        self.reads = 0
+
+    # Consultas à coleção de beneficiários usadas pelas buscas abaixo. Cada uma conta uma leitura;
+    # ficam separadas para que a validação em lote possa atendê-las com os dados pré-carregados.
+    def _find_beneficiario(self, uuid):
+        self.reads += 1
+        return self.mdb['beneficiarios'].find_one({"id": uuid})
+
+    def _find_documento(self, uuid, document_type):
+        self.reads += 1
+        return self.mdb["beneficiarios"].find_one(
+            {"id": uuid},
+            {
+                "documentos": {
+                    "$elemMatch": {
+                        "document_type": { "$eq": document_type.upper() },
+                        "status": {
+                            "$nin": DOCUMENT_STATUS_INVALIDOS
+                        }
+                    }
+                }
+            })
+
+    def _find_agregador(self, uuid):
+        self.reads += 1
+        return self.mdb["beneficiarios"].find_one({"id": uuid},{"agregador"})
+
+    def _find_beneficiarios_agregador(self, agregador):
+        self.reads += 1
+        return self.mdb['beneficiarios'].find({'agregador': agregador})
 
+    @mongo_breaker.protect
     def lookup_parent_company(self, uuid):
-        mdb_object = self.mdb['beneficiarios'].find_one({"id": uuid}) 
+        mdb_object = self._find_beneficiario(uuid)
 
         if mdb_object.get('tipo') != 'EMPRESA_FILIAL':
             return None
@@ -64,7 +133,7 @@ class MongoDBConnections:
             cnpj_matriz = mdb_object['cartao_proposta'].get('cnpj_matriz')
             agregador_matriz = mdb_object['agregador']
 
-        matriz_object = self.mdb['beneficiarios'].find({ 'agregador': agregador_matriz })
+        matriz_object = self._find_beneficiarios_agregador(agregador_matriz)
         ret = None
         for matriz_data in matriz_object:
             if matriz_data.get('tipo') == 'EMPRESA_MATRIZ' and matriz_data['cartao_proposta'].get('cnpj') == cnpj_matriz:
@@ -72,6 +141,7 @@ class MongoDBConnections:
                 return ret
         return ret
     
+    @mongo_breaker.protect
     def request_data_mongodb(self, document_type, document_label, UUID):
         '''
         mock_db = {
@@ -90,7 +160,7 @@ class MongoDBConnections:
             }
         '''
         if document_type.upper() == "NOTA_FISCAL":
-            request = self.mdb['beneficiarios'].find_one({"id": UUID})
+            request = self._find_beneficiario(UUID)
             mdb_object = {}
 
             for data in request['documentos']:
@@ -98,22 +168,7 @@ class MongoDBConnections:
                     mdb_object.update({'documentos': [data]})
 
         else:
-            mdb_object = self.mdb["beneficiarios"].find_one(
-            {"id": UUID},
-            {
-                "documentos": {
-                    "$elemMatch": {
-                        "document_type": { "$eq": document_type.upper() },
-                        "status": {                                      
-                            "$nin": [
-                                "ERRO_DOCUMENTO_NAO_IDENTIFICADO",
-                                "TIPO_INVALIDO",
-                                "ERRO_VALIDACAO_TIPO_DOCUMENTO"
-                            ]
-                        }
-                    }
-                }
-            })
+            mdb_object = self._find_documento(UUID, document_type)
 
         if mdb_object is None:
             return None
@@ -131,7 +186,8 @@ class MongoDBConnections:
             return None
 
         if document_type.upper() == "GFIP_NOVO":
-            agregador = self.mdb["beneficiarios"].find_one({"id": UUID},{"agregador"})
+            agregador = self._find_agregador(UUID)
+            self.reads += 1
             funcs = self.mdb["funcionario_empresa"].find(
                 {"agregador": agregador['agregador']}
             )
@@ -171,6 +227,7 @@ class MongoDBConnections:
         return {'doc_atual': doc_atual, 'doc_list': doc_list}
         
 
+    @mongo_breaker.protect
     def similarity_documents(self, agregador, document_type, current_doc_id):
         '''
         retorno é uma lista com seguinte estrutura
@@ -188,9 +245,7 @@ class MongoDBConnections:
             ]
         }
         '''
-        items = self.mdb.beneficiarios.find(
-                {'agregador': agregador}
-            )
+        items = self._find_beneficiarios_agregador(agregador)
 
         doc_list = []
         for benef in items:
@@ -206,6 +261,7 @@ class MongoDBConnections:
                     doc_list.append(ret)
         return self._return_similar_docs(doc_list, current_doc_id)
 
+    @mongo_breaker.protect
     def update_subscription_rules(self, message, output):
         
         information = INFORMATION.split("|")
@@ -263,6 +319,7 @@ class MongoDBConnections:
 
                     self.mdb['beneficiarios'].update_one(update_query, update_data)
 
+    @mongo_breaker.protect
     def update_similarity_data(self, message, output):
         if message['end_retry']:
             output['validacao_fraude_docs_similares']['fraud_errors'] = 'OK' if output['validacao_fraude_docs_similares']['fraud_errors'] == 'ESPERAR_DOCUMENTOS' else output['validacao_fraude_docs_similares']['fraud_errors']
@@ -278,6 +335,7 @@ class MongoDBConnections:
                     }
                 })
         
+    @mongo_breaker.protect
     def update_metadata_data(self, message, output):
         if message['end_retry']:
             self.mdb.beneficiarios.update_one({
@@ -290,4 +348,45 @@ class MongoDBConnections:
                     'documentos.$.timestamp.end_metadata_process_timestamp': f"{datetime.now().timestamp()}",
                     'documentos.$.metadata_validation_processed': True
                 }
-            })
\ No newline at end of file
+            })
+
+    @mongo_breaker.protect
+    def find_processed_message(self, fingerprint):
+        self.reads += 1
+        return self.mdb[PROCESSED_MESSAGES_COLLECTION].find_one({'_id': fingerprint})
+
+    @mongo_breaker.protect
+    def save_processed_message(self, fingerprint, payload):
+        global _processed_messages_index_ready
+        collection = self.mdb[PROCESSED_MESSAGES_COLLECTION]
+
+        if not _processed_messages_index_ready:
+            collection.create_index('created_at', expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS)
+            _processed_messages_index_ready = True
+
+        collection.update_one(
+            {'_id': fingerprint},
+            {'$set': {'payload': payload, 'created_at': datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    @mongo_breaker.protect
+    def find_cached_result(self, key):
+        self.reads += 1
+        cached = self.mdb[RESULT_CACHE_COLLECTION].find_one({'_id': key})
+        return cached.get('output') if cached is not None else None
+
+    @mongo_breaker.protect
+    def save_cached_result(self, key, output):
+        global _result_cache_index_ready
+        collection = self.mdb[RESULT_CACHE_COLLECTION]
+
+        if not _result_cache_index_ready:
+            collection.create_index('created_at', expireAfterSeconds=RESULT_CACHE_TTL_SECONDS)
+            _result_cache_index_ready = True
+
+        collection.update_one(
+            {'_id': key},
+            {'$set': {'output': output, 'created_at': datetime.now(timezone.utc)}},
+            upsert=True
+        )
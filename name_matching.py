@@ -0,0 +1,340 @@
+import functools
+import re
+from collections import defaultdict
+from typing import NamedTuple
+
+from Distances import score_matrix
+from text_normalization import fold, stop_words, TEXT_NORMALIZATION_CACHE_SIZE
+
+_PALAVRAS = re.compile(r'[a-z0-9]+')
+
+# Regras fonéticas simplificadas para nomes em português (no estilo do BuscaBR), aplicadas em
+# ordem sobre o texto já sem acentos. As letras maiúsculas são marcadores temporários.
+_FONETICA = [
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'th'), 't'),
+    (re.compile(r'lh'), 'l'),
+    (re.compile(r'nh'), 'n'),
+    (re.compile(r'[cs]h'), 'x'),
+    (re.compile(r'qu|gu(?=[eiy])'), 'K'),
+    (re.compile(r'c(?=[eiy])'), 's'),
+    (re.compile(r'g(?=[eiy])'), 'j'),
+    (re.compile(r'[cqK]'), 'k'),
+    (re.compile(r'y'), 'i'),
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'z'), 's'),
+    (re.compile(r'h'), ''),
+]
+_VOGAIS = re.compile(r'(?<=.)[aeiou]')
+_REPETIDAS = re.compile(r'(.)\1+')
+
+
+class Match(NamedTuple):
+    row: int
+    col: int
+    score: float
+
+
+@functools.lru_cache(maxsize=TEXT_NORMALIZATION_CACHE_SIZE)
+def phonetic_key(token):
+    """
+    Chave fonética de uma palavra (já sem acentos e em minúsculas): grafias que soam igual em
+    português, como 'souza'/'sousa', 'thiago'/'tiago' ou 'luiz'/'luis', geram a mesma chave.
+    Mantém a primeira letra e as consoantes, sem repetições.
+    """
+    for padrao, troca in _FONETICA:
+        token = padrao.sub(troca, token)
+    return _REPETIDAS.sub(r'\1', _VOGAIS.sub('', token))
+
+
+@functools.lru_cache(maxsize=TEXT_NORMALIZATION_CACHE_SIZE)
+def blocking_keys(name):
+    """
+    Chaves de bloqueio de um nome. Dois nomes só são comparados se tiverem alguma chave em comum.
+
+    Usa o primeiro e o último nome (sem stopwords), que raramente são abreviados:
+    - as chaves fonéticas dos dois, em ordem alfabética (cobre grafias diferentes e nomes invertidos);
+    - combinações dos 3 primeiros e dos 3 últimos caracteres de cada um (n-gramas de prefixo e
+      sufixo), para que um erro de OCR/digitação no começo ou no fim de uma palavra não separe
+      nomes que o norm_score considera iguais;
+    - cada um dos dois por inteiro com a inicial do outro, para palavras curtas demais para os
+      n-gramas (ex.: 'LUOS GOMES' e 'LUCAS GOMES');
+    - o mesmo com os 2 primeiros e os 2 últimos caracteres, para erros no começo e no fim da
+      mesma palavra (ex.: 'FRANCISCA ROCHA' e 'FRAECISCA ROHA');
+    - cada par de palavras vizinhas, para nomes compostos com o primeiro e o último nome errados
+      (ex.: 'LUCAS FREITAS BARBOSA NUNES' e 'LUAS FREITAS BARBOSA NENES');
+    - cada um dos dois por inteiro com o comprimento do outro, para erros espalhados numa
+      palavra só (ex.: 'FRANCISCO ALVES' e 'FRANCISCO ELVAS').
+
+    O bloqueio não garante encontrar todos os pares acima do limiar, só os que têm essas partes
+    em comum. Em 39 rols sintéticos de 300 nomes (scripts/bench_set_comparison.py --seeds 39,
+    limiar 90) não separou nenhum par; sem as três últimas chaves, separava cerca de 3 em 1000.
+    """
+    stop = stop_words()
+    palavras = [palavra for palavra in _PALAVRAS.findall(fold(name)) if palavra not in stop]
+    if not palavras:
+        return frozenset()
+    primeiro, ultimo = palavras[0], palavras[-1]
+    chaves = {('f',) + tuple(sorted((phonetic_key(primeiro), phonetic_key(ultimo))))}
+    for inicio in (primeiro[:3], primeiro[-3:]):
+        for fim in (ultimo[:3], ultimo[-3:]):
+            chaves.add(('g', inicio, fim))
+    chaves.add(('i', primeiro, ultimo[0]))
+    chaves.add(('i', primeiro[0], ultimo))
+    for inicio in (primeiro[:2], primeiro[-2:]):
+        for fim in (ultimo[:2], ultimo[-2:]):
+            chaves.add(('b', inicio, fim))
+    for palavra, seguinte in zip(palavras, palavras[1:]):
+        chaves.add(('t', palavra, seguinte))
+    chaves.add(('l', primeiro, len(ultimo)))
+    chaves.add(('l', len(primeiro), ultimo))
+    return frozenset(chaves)
+
+
+class BlockingIndex:
+    """
+    Índice de bloqueio sobre uma lista de nomes (ex.: o rol de trabalhadores de uma GFIP).
+
+    candidates(nome) devolve apenas as posições dos nomes que compartilham alguma chave de
+    bloqueio com ele, em vez da lista inteira; só esses pares seguem para o norm_score. O índice
+    pode ser montado uma vez e consultado por vários validadores.
+
+    max_block_size descarta, nas consultas, os blocos com mais nomes do que isso (chaves comuns
+    demais, que não separam nada); None não descarta nenhum.
+    """
+
+    def __init__(self, names=(), max_block_size=None):
+        self.names = []
+        self.max_block_size = max_block_size
+        self._blocos = defaultdict(list)
+        self._exatos = set()
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        posicao = len(self.names)
+        self.names.append(name)
+        chaves = blocking_keys(name)
+        for chave in chaves:
+            self._blocos[chave].append(posicao)
+        if chaves:
+            self._exatos.add(fold(name))
+        return posicao
+
+    def _compartilhadas(self, name):
+        # Quantas chaves de bloqueio cada nome do índice compartilha com name
+        compartilhadas = defaultdict(int)
+        for chave in blocking_keys(name):
+            bloco = self._blocos.get(chave)
+            if bloco and (self.max_block_size is None or len(bloco) <= self.max_block_size):
+                for posicao in bloco:
+                    compartilhadas[posicao] += 1
+        return compartilhadas
+
+    def candidates(self, name):
+        """
+        Posições (em ordem crescente) dos nomes do índice que podem ser iguais a name.
+        """
+        return sorted(self._compartilhadas(name))
+
+    def similar(self, name, threshold, jw_weight=1, ab_weight=0.2):
+        """
+        (posição, score) dos nomes do índice com norm_score >= threshold contra name, entre os candidatos.
+        """
+        posicoes = self.candidates(name)
+        if not posicoes:
+            return []
+        scores = score_matrix([name], [self.names[j] for j in posicoes], jw_weight, ab_weight, score_cutoff=threshold)[0]
+        return [(j, score) for j, score in zip(posicoes, scores) if score >= threshold]
+
+    def contains(self, name, threshold, jw_weight=1, ab_weight=0.2):
+        """
+        Se algum nome do índice tem norm_score >= threshold contra name.
+
+        Os candidatos são pontuados em grupos, começando pelos que compartilham mais chaves com
+        name (o mesmo nome com um erro de OCR costuma compartilhar quase todas), e a busca para
+        no primeiro grupo com um score acima do limiar. Um nome idêntico (depois de normalizado)
+        dispensa os scores: com alguma palavra que não é stopword, o norm_score dele é 100.
+        """
+        if threshold <= 100 and fold(name) in self._exatos:
+            return True
+        grupos = defaultdict(list)
+        for posicao, quantidade in self._compartilhadas(name).items():
+            grupos[quantidade].append(posicao)
+        for quantidade in sorted(grupos, reverse=True):
+            scores = score_matrix([name], [self.names[j] for j in grupos[quantidade]], jw_weight, ab_weight,
+                                  score_cutoff=threshold)[0]
+            if any(score >= threshold for score in scores):
+                return True
+        return False
+
+
+def similar_pairs(names_a, names_b, threshold, jw_weight=1, ab_weight=0.2, index=None):
+    """
+    Todos os pares (Match) de names_a x names_b com norm_score >= threshold, comparando só os
+    pares que compartilham um bloco. index pode ser um BlockingIndex já montado sobre names_b.
+    """
+    if index is None:
+        index = BlockingIndex(names_b)
+    return [Match(i, j, score)
+            for i, name in enumerate(names_a)
+            for j, score in index.similar(name, threshold, jw_weight, ab_weight)]
+
+
+def linear_sum_assignment(cost):
+    """
+    Algoritmo húngaro (Kuhn-Munkres) para uma matriz de custos retangular (lista de listas).
+
+    Retorna os pares (linha, coluna), ordenados pela linha, que minimizam a soma dos custos
+    atribuindo cada linha a no máximo uma coluna e vice-versa (min(linhas, colunas) pares).
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    if n == 0 or m == 0:
+        return []
+    transposta = n > m
+    if transposta:
+        cost = [list(coluna) for coluna in zip(*cost)]
+        n, m = m, n
+
+    # Potenciais u (linhas) e v (colunas); p[j] é a linha (base 1) atribuída à coluna j
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = inf
+            j1 = 0
+            linha = cost[i0 - 1]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = linha[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    pares = [(p[j] - 1, j - 1) for j in range(1, m + 1) if p[j]]
+    if transposta:
+        pares = [(coluna, linha) for linha, coluna in pares]
+    return sorted(pares)
+
+
+def assign(scores, threshold):
+    """
+    Emparelha linhas e colunas de uma matriz de scores (lista de listas, 0 a 100).
+
+    Só valem pares com score >= threshold. Entre as soluções, escolhe a que forma mais pares e,
+    empatando, a de maior soma dos scores; o resultado não depende da ordem das linhas ou colunas
+    (a não ser entre soluções com a mesma soma). Retorna (lista de Match ordenada pela linha, soma).
+    """
+    n = len(scores)
+    m = len(scores[0]) if n else 0
+    # O bônus por par supera qualquer diferença de soma, então o número de pares vem primeiro
+    bonus = 100 * (min(n, m) + 1)
+    cost = [[-(bonus + score) if score >= threshold else 0 for score in linha] for linha in scores]
+
+    pares = [Match(i, j, scores[i][j]) for i, j in linear_sum_assignment(cost) if scores[i][j] >= threshold]
+    return pares, sum(par.score for par in pares)
+
+
+def match_names(names_a, names_b, threshold, jw_weight=1, ab_weight=0.2):
+    """
+    Emparelha os nomes de names_a com os de names_b pelo norm_score (como em assign).
+
+    A matriz de scores é calculada numa única chamada (Distances.score_matrix), já descartando
+    os pares que não chegam ao threshold.
+    """
+    scores = score_matrix(names_a, names_b, jw_weight, ab_weight, score_cutoff=threshold)
+    return assign(scores, threshold)
+
+
+def _identity(item):
+    return item
+
+
+def fuzzy_difference(items, others, threshold, key=None, jw_weight=1, ab_weight=0.2, index=None):
+    """
+    Itens de items (na ordem) sem nenhum item de others com norm_score >= threshold: a diferença
+    items - others usando a igualdade aproximada dos nomes.
+
+    key extrai o nome de cada item (padrão: o próprio item). Os nomes de others são indexados uma
+    vez (BlockingIndex, ou index se já montado sobre eles) e cada nome distinto de items é
+    pontuado só contra os candidatos do seu bloco, então o custo cresce com o tamanho das listas
+    e não com o produto delas, inclusive quando quase nenhum nome é encontrado (rol errado). Um
+    par que o bloqueio separa aparece como faltante (ver blocking_keys). O bloqueio pressupõe
+    limiares no padrão dos validadores (90).
+
+    Nomes que não são texto (ex.: None de um campo que a extração não preencheu) não são
+    comparados: em items são sempre faltantes, em others são ignorados.
+    """
+    key = key or _identity
+    if index is None:
+        index = BlockingIndex(nome for nome in map(key, others) if isinstance(nome, str))
+    encontrados = {}
+    faltando = []
+    for item in items:
+        nome = key(item)
+        if not isinstance(nome, str):
+            faltando.append(item)
+            continue
+        achou = encontrados.get(nome)
+        if achou is None:
+            achou = encontrados[nome] = index.contains(nome, threshold, jw_weight, ab_weight)
+        if not achou:
+            faltando.append(item)
+    return faltando
+
+
+def fuzzy_intersection(items, others, threshold, key=None, jw_weight=1, ab_weight=0.2, index=None):
+    """
+    Itens de items (na ordem) com algum item de others com norm_score >= threshold.
+    """
+    faltando = {id(item) for item in fuzzy_difference(items, others, threshold, key, jw_weight, ab_weight, index)}
+    return [item for item in items if id(item) not in faltando]
+
+
+def compare_sets(set_1, set_2, modo_comparacao, threshold, key=None, jw_weight=1, ab_weight=0.2):
+    """
+    Itens sem correspondente (aproximado) segundo o modo de comparação:
+    - 'somente_proposta': os de set_1 que não estão em set_2;
+    - 'somente_documento': os de set_2 que não estão em set_1;
+    - 'interseccao_completa': os dois casos acima (a diferença simétrica).
+    Só as diferenças exigidas pelo modo são calculadas.
+    """
+    set_1, set_2 = list(set_1), list(set_2)
+    match modo_comparacao:
+        case 'somente_proposta':
+            return fuzzy_difference(set_1, set_2, threshold, key, jw_weight, ab_weight)
+        case 'somente_documento':
+            return fuzzy_difference(set_2, set_1, threshold, key, jw_weight, ab_weight)
+        case 'interseccao_completa':
+            return (fuzzy_difference(set_1, set_2, threshold, key, jw_weight, ab_weight)
+                    + fuzzy_difference(set_2, set_1, threshold, key, jw_weight, ab_weight))
+    raise ValueError(f'modo_comparacao desconhecido: {modo_comparacao}')
@@ -0,0 +1,147 @@
+import functools
+import hashlib
+import os
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+
+# Assinaturas já calculadas, reaproveitadas enquanto o container estiver quente: os mesmos
+# documentos do agregador são comparados a cada novo documento enviado. A chave é um digest do
+# texto, então o cache guarda só a assinatura (num_perm * 4 bytes) e não o texto do documento
+NEAR_DUPLICATES_CACHE_SIZE = int(os.environ.get('NEAR_DUPLICATES_CACHE_SIZE', '1024'))
+
+_ESPACOS = re.compile(r'\s+')
+
+_assinaturas = OrderedDict()
+_assinaturas_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _permutacoes(num_perm):
+    # h -> a * h + b (mod 2^32), com a ímpar, é uma permutação dos hashes de 32 bits; em uint32 o
+    # NumPy faz o módulo de graça (estouro), cerca de 10x mais rápido que um primo em uint64.
+    # Coeficientes fixos (semente constante) para que assinaturas de instâncias diferentes sejam comparáveis
+    import numpy as np
+
+    rng = random.Random(num_perm)
+    a = np.array([rng.randrange(1, 1 << 32, 2) for _ in range(num_perm)], dtype=np.uint32)
+    b = np.array([rng.randrange(0, 1 << 32) for _ in range(num_perm)], dtype=np.uint32)
+    return a[:, None], b[:, None]
+
+
+def shingles(text, shingle_size=5):
+    """
+    Conjunto de trechos de shingle_size caracteres do texto em minúsculas, com os espaços
+    (inclusive quebras de linha) reduzidos a um só. Textos mais curtos viram um único trecho.
+    """
+    text = _ESPACOS.sub(' ', text.lower()).strip()
+    if len(text) <= shingle_size:
+        return {text} if text else set()
+    return {text[i:i + shingle_size] for i in range(len(text) - shingle_size + 1)}
+
+
+def signature(text, num_perm=128, shingle_size=5):
+    """
+    Assinatura MinHash (array do NumPy com num_perm valores) dos shingles do texto, ou None se o
+    texto não tiver nenhum. A fração de posições iguais entre duas assinaturas estima o Jaccard
+    entre os conjuntos de shingles. O array é compartilhado pelo cache e não deve ser alterado.
+    """
+    chave = (hashlib.blake2b(text.encode(), digest_size=16).digest(), num_perm, shingle_size)
+    with _assinaturas_lock:
+        if chave in _assinaturas:
+            _assinaturas.move_to_end(chave)
+            return _assinaturas[chave]
+    assinatura = _calcular_assinatura(text, num_perm, shingle_size)
+    with _assinaturas_lock:
+        _assinaturas[chave] = assinatura
+        # Descarta as menos usadas recentemente (LRU)
+        while len(_assinaturas) > NEAR_DUPLICATES_CACHE_SIZE:
+            _assinaturas.popitem(last=False)
+    return assinatura
+
+
+def clear_signature_cache():
+    with _assinaturas_lock:
+        _assinaturas.clear()
+
+
+def _calcular_assinatura(text, num_perm, shingle_size):
+    import numpy as np
+
+    trechos = shingles(text, shingle_size)
+    if not trechos:
+        return None
+    hashes = np.fromiter((zlib.crc32(trecho.encode()) for trecho in trechos), dtype=np.uint32, count=len(trechos))
+    a, b = _permutacoes(num_perm)
+    return (a * hashes + b).min(axis=1)
+
+
+def lsh_bands(num_perm, threshold):
+    """
+    (bandas, linhas por banda) para o índice: dois textos viram candidatos se coincidirem em
+    todas as linhas de alguma banda, o que acontece com probabilidade 1 - (1 - J^linhas)^bandas
+    para um Jaccard J. Escolhe a divisão de num_perm com o maior limiar aproximado
+    (1 / bandas) ^ (1 / linhas) que ainda fique abaixo de threshold, favorecendo o recall.
+    """
+    opcoes = [(num_perm // linhas, linhas) for linhas in range(1, num_perm + 1) if num_perm % linhas == 0]
+    abaixo = [(bandas, linhas) for bandas, linhas in opcoes if (1 / bandas) ** (1 / linhas) <= threshold]
+    return max(abaixo, key=lambda opcao: (1 / opcao[0]) ** (1 / opcao[1])) if abaixo else opcoes[0]
+
+
+class MinHashIndex:
+    """
+    Índice LSH (bandas de assinaturas MinHash) para encontrar textos quase duplicados.
+
+    add() calcula a assinatura do texto e a registra em cada banda; query() junta os textos que
+    caem no mesmo balde em alguma banda e devolve só os que têm Jaccard estimado >= threshold.
+    O custo de uma consulta depende do número de candidatos, não do tamanho do índice; a
+    comparação exata (ex.: SequenceMatcher) fica para os candidatos.
+
+    O Jaccard é o dos shingles de caracteres, não o ratio do SequenceMatcher: o limiar deve ser
+    calibrado para o recall desejado (scripts/bench_near_duplicates.py).
+    """
+
+    def __init__(self, threshold=0.5, num_perm=128, shingle_size=5):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+        self._baldes = [defaultdict(list) for _ in range(self.bands)]
+        self._assinaturas = {}
+
+    def _chaves(self, assinatura):
+        for banda in range(self.bands):
+            yield banda, assinatura[banda * self.rows:(banda + 1) * self.rows].tobytes()
+
+    def add(self, key, text):
+        assinatura = signature(text, self.num_perm, self.shingle_size) if text else None
+        if assinatura is None:
+            return
+        self._assinaturas[key] = assinatura
+        for banda, chave in self._chaves(assinatura):
+            self._baldes[banda][chave].append(key)
+
+    def candidates(self, text):
+        """
+        Chaves que compartilham algum balde com text, sem filtrar pelo Jaccard estimado.
+        """
+        assinatura = signature(text, self.num_perm, self.shingle_size) if text else None
+        if assinatura is None:
+            return set()
+        encontrados = set()
+        for banda, chave in self._chaves(assinatura):
+            encontrados.update(self._baldes[banda].get(chave, ()))
+        return encontrados
+
+    def query(self, text):
+        """
+        Lista de (chave, Jaccard estimado) dos candidatos com estimativa >= threshold.
+        """
+        encontrados = self.candidates(text)
+        if not encontrados:
+            return []
+        assinatura = signature(text, self.num_perm, self.shingle_size)
+        estimados = ((key, float((self._assinaturas[key] == assinatura).mean())) for key in encontrados)
+        return [(key, jaccard) for key, jaccard in estimados if jaccard >= self.threshold]
@@ -0,0 +1,133 @@
+import contextvars
+import datetime
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+# Limite de scores memorizados por mensagem: matrizes grandes (cdist, compare_sets) não devem
+# ocupar a memória do Lambda com pares que dificilmente se repetem
+SCORE_MEMO_MAX_ENTRIES = int(os.environ.get('SCORE_MEMO_MAX_ENTRIES', '50000'))
+
+_DIGITOS = re.compile(r'\d+')
+
+_atual = contextvars.ContextVar('normalized_fields', default=None)
+
+# Consultas e acertos do memo de scores na thread atual, para as métricas de cada validação
+_contadores = threading.local()
+
+
+class NormalizedFields:
+    """
+    Formas normalizadas dos valores lidos durante o processamento de uma mensagem.
+
+    Os mesmos campos do cartao_proposta, dos dados_extraidos e dos documentos requeridos são
+    normalizados várias vezes, por validações diferentes (CPF/CNPJ só com dígitos, datas
+    convertidas). Cada forma é calculada na primeira vez que é pedida e reaproveitada até o
+    fim da mensagem; a chave é o próprio valor, então um campo alterado por uma validação gera
+    uma nova entrada em vez de devolver a forma antiga. (O texto sem acentos e os tokens usados
+    pelo Distances ficam em text_normalization, memorizados para todo o container.)
+
+    Só valores str são memorizados; os demais (None, dicts etc.) são repassados ao cálculo
+    original e falham com a mesma exceção de antes. Falhas também não são memorizadas.
+
+    Também guarda os norm_score já calculados na mensagem (Distances), chaveados pelos dois
+    textos normalizados e pelos pesos: o nome do titular, o da mãe ou a razão social são
+    comparados com os mesmos textos por várias validações. score_lookups e score_hits contam as
+    consultas e os acertos desse memo.
+    """
+
+    def __init__(self):
+        self._digits = {}
+        self._dates = {}
+        self._scores = {}
+        self.score_lookups = 0
+        self.score_hits = 0
+
+    def digits(self, value):
+        if not isinstance(value, str):
+            return _digits(value)
+        try:
+            return self._digits[value]
+        except KeyError:
+            result = self._digits[value] = _digits(value)
+            return result
+
+    def parse_date(self, value, fmt):
+        if not isinstance(value, str):
+            return datetime.datetime.strptime(value, fmt)
+        key = (value, fmt)
+        try:
+            return self._dates[key]
+        except KeyError:
+            # Em caso de ValueError/TypeError a exceção segue para a validação, como antes
+            result = self._dates[key] = datetime.datetime.strptime(value, fmt)
+            return result
+
+
+    def score(self, key):
+        """
+        norm_score memorizado para key, ou None.
+        """
+        # As validações paralelas compartilham o memo; os contadores são aproximados entre threads
+        score = self._scores.get(key)
+        self.score_lookups += 1
+        _contadores.lookups = getattr(_contadores, 'lookups', 0) + 1
+        if score is not None:
+            self.score_hits += 1
+            _contadores.hits = getattr(_contadores, 'hits', 0) + 1
+        return score
+
+    def store_score(self, key, score):
+        if len(self._scores) < SCORE_MEMO_MAX_ENTRIES:
+            self._scores[key] = score
+
+    def score_hit_rate(self):
+        return self.score_hits / self.score_lookups if self.score_lookups else 0.0
+
+
+def _digits(value):
+    return ''.join(_DIGITOS.findall(value))
+
+
+@contextmanager
+def message_scope():
+    """
+    Ativa uma NormalizedFields para o processamento de uma mensagem. Se já houver uma ativa
+    (ex.: validate() chamado dentro do process_document), ela é reaproveitada.
+    """
+    if _atual.get() is not None:
+        yield _atual.get()
+        return
+    token = _atual.set(NormalizedFields())
+    try:
+        yield _atual.get()
+    finally:
+        _atual.reset(token)
+
+
+def current():
+    return _atual.get()
+
+
+def score_counters():
+    """
+    (consultas, acertos) acumulados do memo de scores na thread atual.
+    """
+    return getattr(_contadores, 'lookups', 0), getattr(_contadores, 'hits', 0)
+
+
+def digits(value):
+    """
+    Apenas os dígitos de value, como ''.join(re.findall(r'\\d+', value)).
+    """
+    campos = _atual.get()
+    return campos.digits(value) if campos is not None else _digits(value)
+
+
+def parse_date(value, fmt):
+    """
+    datetime.datetime.strptime(value, fmt); o datetime devolvido é imutável e pode ser compartilhado.
+    """
+    campos = _atual.get()
+    return campos.parse_date(value, fmt) if campos is not None else datetime.datetime.strptime(value, fmt)
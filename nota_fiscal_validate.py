@@ -1,16 +1,14 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, required_docs, validate, fraud_validate
 from Distances import distances
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from validacao_endereco import Validacao_endereco, Endereco
 from fraud_tools import ValidadorMetadadosPDF
+from normalized_fields import digits, parse_date
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Nota_fiscal:
     razao_social_matriz: str
     cnpj_matriz: str
@@ -34,8 +32,7 @@ class Nota_fiscal_validations:
     validacao_data_emissao: str
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Nota_fiscal_fraud:
     creator: str 
     producer: str
@@ -53,13 +50,13 @@ class nota_fiscal_validate(ValidateDocument):
     
     
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Nota_fiscal(**cartao_proposta)
+        self.cartao_proposta = Nota_fiscal.from_dict(cartao_proposta)
         self.message_type = message_type
     
         if (message_type == "fraud_metadata"):
-            self.dados_extraidos = Nota_fiscal_fraud(**dados_extraidos)
+            self.dados_extraidos = Nota_fiscal_fraud.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Nota_fiscal(**dados_extraidos)
+            self.dados_extraidos = Nota_fiscal.from_dict(dados_extraidos)
    
     
     def set_validate_functions_list(self):
@@ -130,8 +127,8 @@ class nota_fiscal_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj_matriz))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj_matriz))
+        s1 = digits(self.cartao_proposta.cnpj_matriz)
+        s2 = digits(self.dados_extraidos.cnpj_matriz)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100, "target": "cnpj_matriz"}
         else:
@@ -147,8 +144,8 @@ class nota_fiscal_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100, "target": "cnpj"}
         else:
@@ -216,7 +213,7 @@ class nota_fiscal_validate(ValidateDocument):
         }
         intervalo = dias_permitidos.get(nota_fiscal_label)
 
-        data_emissao = datetime.datetime.strptime(self.dados_extraidos.data_emissao, "%d-%m-%Y").date()
+        data_emissao = parse_date(self.dados_extraidos.data_emissao, "%d-%m-%Y").date()
 
         hoje = datetime.date.today()
         diferenca_dias = (hoje - data_emissao).days
@@ -1,17 +1,16 @@
 import re
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, validate
-from Distances import distances
+from Distances import distances, iter_norm_scores
 
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Procuracao:
     razao_social: str
     cnpj: str
@@ -32,8 +31,7 @@ class Procuracao_validations:
     validacao_data_validade: str
     validacao_lista_poderes: str
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Procuracao_sign:
     ha_assinatura: str
     ha_selo_carimbo: str
@@ -52,14 +50,14 @@ class Procuracao_sign_validations:
 class procuracao_validate(ValidateDocument):
 
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
-        self.cartao_proposta = Procuracao(**cartao_proposta)
+        self.cartao_proposta = Procuracao.from_dict(cartao_proposta)
         self.message_type = message_type
 
         if (message_type == "signature"):
             self.dados_extraidos = Procuracao_sign(
                 **dados_extraidos)
         else:
-            self.dados_extraidos = Procuracao(**dados_extraidos)
+            self.dados_extraidos = Procuracao.from_dict(dados_extraidos)
 
     def set_validate_functions_list(self):
         return list(Procuracao_validations.__annotations__.keys())
@@ -80,8 +78,8 @@ class procuracao_validate(ValidateDocument):
         - FALSE: Caso contrário.
         """
 
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}   
         else:
@@ -99,8 +97,8 @@ class procuracao_validate(ValidateDocument):
         s2_list = self.dados_extraidos.cpfs_procuradores.split(",")
 
         for item in s2_list:
-            s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cpf_responsavel))
-            s2 = ''.join(re.findall(r'\d+', item))
+            s1 = digits(self.cartao_proposta.cpf_responsavel)
+            s2 = digits(item)
             if s1 == s2:
                 return {'valid': True, 'percent_match': 100, 'target': 'cpf_responsavel',
                         "trecho_procurado": s1,
@@ -130,8 +128,7 @@ class procuracao_validate(ValidateDocument):
         s2_list = self.dados_extraidos.procuradores.split(',')
         max_score = 0
         best_s2 = None
-        for s2 in s2_list:
-            score = distances(s1, s2.strip()).norm_score()
+        for s2, score in zip(s2_list, iter_norm_scores(s1, [s2.strip() for s2 in s2_list])):
             if score >= limiar:
                 return {'valid': True, 'percent_match': score, 'target': 'procuradores',
                         "trecho_procurado": s1,
@@ -159,9 +156,9 @@ class procuracao_validate(ValidateDocument):
         converted_dates = []
         for date in dates:
             try:
-                converted_dates.append(datetime.strptime(date, "%d-%m-%Y"))
+                converted_dates.append(parse_date(date, "%d-%m-%Y"))
             except ValueError:
-                converted_dates.append(datetime.strptime(date, "%d/%m/%Y"))
+                converted_dates.append(parse_date(date, "%d/%m/%Y"))
 
         # Data atual
         date_now = datetime.now()
@@ -1,17 +1,15 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
 from validacao_endereco import Validacao_endereco, Endereco
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Requerimento_empresario:
     razao_social: str
     cnpj: str
@@ -25,8 +23,7 @@ class Requerimento_empresario_validations:
     validacao_endereco_empresa: str
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Requerimento_empresario_sign:
     ha_assinatura: str
     ha_selo_carimbo: str
@@ -45,13 +42,13 @@ class Requerimento_empresario_sign_validations:
 class requerimento_empresario_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         self.message_type = message_type
-        self.cartao_proposta = Requerimento_empresario(**cartao_proposta)
+        self.cartao_proposta = Requerimento_empresario.from_dict(cartao_proposta)
 
         if (message_type == "signature"):
             self.dados_extraidos = Requerimento_empresario_sign(
                 **dados_extraidos)
         else:
-            self.dados_extraidos = Requerimento_empresario(**dados_extraidos)
+            self.dados_extraidos = Requerimento_empresario.from_dict(dados_extraidos)
 
     def set_validate_functions_list(self):
         return list(Requerimento_empresario_validations.__annotations__.keys())
@@ -90,8 +87,8 @@ class requerimento_empresario_validate(ValidateDocument):
         - TRUE: Se os CNPJs forem idênticos após a remoção de caracteres não numéricos;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(r'\d+', self.cartao_proposta.cnpj))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cnpj))
+        s1 = digits(self.cartao_proposta.cnpj)
+        s2 = digits(self.dados_extraidos.cnpj)
         if s1 == s2:
             return {'valid': True, 'percent_match': 100}
         else:
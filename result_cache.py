@@ -0,0 +1,76 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# Backend do cache de resultados das validações: '' (desligado), 'mongo' ou 'disk'
+RESULT_CACHE = os.environ.get('RESULT_CACHE', '').lower()
+RESULT_CACHE_DIR = os.environ.get('RESULT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'result_cache'))
+RESULT_CACHE_TTL_SECONDS = int(os.environ.get('RESULT_CACHE_TTL_SECONDS', '604800'))
+
+
+def enabled():
+    return RESULT_CACHE in {'mongo', 'disk'}
+
+
+def make_key(*parts):
+    """
+    Hash estável (sha256) das partes informadas. As chaves dos dicionários são ordenadas e
+    valores não serializáveis em JSON (datas, por exemplo) entram pela representação em texto.
+    """
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _disk_path(key):
+    return os.path.join(RESULT_CACHE_DIR, key[:2], f'{key}.json')
+
+
+def _disk_get(key):
+    path = _disk_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > RESULT_CACHE_TTL_SECONDS:
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _disk_put(key, output):
+    path = _disk_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Escreve num arquivo temporário e renomeia, para que uma leitura concorrente nunca veja o arquivo pela metade
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+
+
+def get(key, connection):
+    """
+    Busca o resultado guardado para a chave. connection é chamada apenas no backend 'mongo'
+    e deve retornar uma MongoDBConnections. Falhas no cache são tratadas como ausência do resultado.
+    """
+    try:
+        if RESULT_CACHE == 'mongo':
+            return connection().find_cached_result(key)
+        if RESULT_CACHE == 'disk':
+            return _disk_get(key)
+    except Exception as e:
+        logger.warning(f'[WARN] Falha ao consultar o cache de resultados: {e}')
+    return None
+
+
+def put(key, output, connection):
+    try:
+        if RESULT_CACHE == 'mongo':
+            connection().save_cached_result(key, output)
+        elif RESULT_CACHE == 'disk':
+            _disk_put(key, output)
+    except Exception as e:
+        logger.warning(f'[WARN] Falha ao gravar no cache de resultados: {e}')
@@ -1,16 +1,14 @@
-import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from ValidateDocument import ValidateDocument, validate
 from Distances import distances
 
 from dataclasses import dataclass
 from typing import Optional
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import digits, parse_date
 
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class RG:
     nome: str
     cpf: str
@@ -40,8 +38,8 @@ class rg_validate(ValidateDocument):
         
         cartao_proposta["responsavel_legal"] = "nome_responsavel" in cartao_proposta
 
-        self.cartao_proposta = RG(**cartao_proposta)
-        self.dados_extraidos = RG(**dados_extraidos)
+        self.cartao_proposta = RG.from_dict(cartao_proposta)
+        self.dados_extraidos = RG.from_dict(dados_extraidos)
         self.message_type = message_type
 
     def set_validate_functions_list(self):
@@ -79,8 +77,8 @@ class rg_validate(ValidateDocument):
         - TRUE: Se os CPFs forem iguais;
         - FALSE: Caso contrário.
         """
-        s1 = ''.join(re.findall(r'\d+', self.cartao_proposta.cpf))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cpf))
+        s1 = digits(self.cartao_proposta.cpf)
+        s2 = digits(self.dados_extraidos.cpf)
         is_valid = s1 == s2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
 
@@ -131,13 +129,13 @@ class rg_validate(ValidateDocument):
             'trecho_procurado': 'Validação não aplicável ao documento do representante legal',
             'trecho_encontrado': 'Validação não aplicável ao documento do representante legal'}
             
-        date_1 = datetime.datetime.strptime(s1, '%d/%m/%Y')
+        date_1 = parse_date(s1, '%d/%m/%Y')
         s2 = self.dados_extraidos.data_nascimento
 
         if(s2 == 'Not Found'):
             return {'valid': False, 'percent_match': 0}
 
-        date_2 = datetime.datetime.strptime(s2, '%d-%m-%Y')
+        date_2 = parse_date(s2, '%d-%m-%Y')
 
         is_valid = date_1 == date_2
         return {'valid': is_valid, 'percent_match': 100 if is_valid else 0}
@@ -151,13 +149,14 @@ class rg_validate(ValidateDocument):
         - TRUE: Se a data de expedição for dentro do período de 10 anos;
         - FALSE: Caso contrário.
         """
+        from dateutil.relativedelta import relativedelta
         now = datetime.datetime.now().date()
         extracted_date = self.dados_extraidos.data_expedicao
 
         if(extracted_date == 'Not Found'):
             return {'valid': False, 'percent_match': 0}
 
-        extracted_dispatch_date = datetime.datetime.strptime(
+        extracted_dispatch_date = parse_date(
             extracted_date, "%d-%m-%Y").date()
 
         is_valid = extracted_dispatch_date >= (now - relativedelta(years=10))
@@ -0,0 +1,159 @@
+"""
+Compara a validação de um lote de mensagens uma a uma (process_document/validate()) com
+batch_validation.validate_batch(), para o mei_validate e o ctps_validate.
+
+Usa um dublê da coleção de beneficiários em memória, com latência configurável por consulta,
+e confere que os resultados do lote são exatamente iguais aos da validação individual.
+
+Uso: python scripts/bench_batch_validation.py [--messages 200] [--latency-ms 2]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import bench_env
+
+bench_env.setup()
+
+import ValidateDocument
+import mongodb_connections
+from batch_validation import BatchMongoDBConnections, validate_batch
+
+NOMES = ['JOAO DA SILVA', 'MARIA APARECIDA DOS SANTOS', 'JOSE CARLOS PEREIRA', 'ANA PAULA OLIVEIRA',
+         'FRANCISCO DE ASSIS SOUZA', 'ANTONIA FERREIRA LIMA']
+EMPRESAS = ['ACME COMERCIO LTDA', 'PADARIA BOM PAO ME', 'OFICINA DO ZE EIRELI']
+ENDERECO = {'cep': '01310-100', 'rua': 'AVENIDA PAULISTA', 'numero': '1000', 'complemento': 'SALA 1',
+            'bairro': 'BELA VISTA', 'cidade': 'SAO PAULO', 'estado': 'SP'}
+
+
+class Latency:
+    seconds = 0.002
+    calls = 0
+
+    @classmethod
+    def wait(cls):
+        cls.calls += 1
+        time.sleep(cls.seconds)
+
+
+def _matches(benef, query):
+    for campo, cond in query.items():
+        if isinstance(cond, dict) and '$in' in cond:
+            if benef.get(campo) not in cond['$in']:
+                return False
+        elif benef.get(campo) != cond:
+            return False
+    return True
+
+
+class FakeCollection:
+
+    def __init__(self, beneficiarios):
+        self.beneficiarios = beneficiarios
+
+    def find_one(self, query, projection=None):
+        Latency.wait()
+        benef = next((b for b in self.beneficiarios if _matches(b, query)), None)
+        if benef is None or projection is None:
+            return json.loads(json.dumps(benef))
+        if 'documentos' in projection:
+            cond = projection['documentos']['$elemMatch']
+            docs = [d for d in benef['documentos'] if d['document_type'] == cond['document_type']['$eq']
+                    and d.get('status') not in cond['status']['$nin']]
+            return {'_id': benef['_id'], 'documentos': json.loads(json.dumps(docs[:1]))} if docs else {'_id': benef['_id']}
+        return {'_id': benef['_id'], 'agregador': benef['agregador']}
+
+    def find(self, query):
+        Latency.wait()
+        return json.loads(json.dumps([b for b in self.beneficiarios if _matches(b, query)]))
+
+
+def build_data(count):
+    beneficiarios = []
+    mei, ctps = [], []
+    for i in range(count):
+        nome, empresa = NOMES[i % len(NOMES)], EMPRESAS[i % len(EMPRESAS)]
+        uuid, agregador = f'uuid-{i}', f'agr-{i // 4}'
+        cnpj = f'12.345.{i % 1000:03d}/0001-90'
+        documentos = [
+            {'document_type': 'RG', 'status': 'OK', 'label': 'rg_1', 'extracted_information': {'nome': nome, 'cpf': '12345678900'}},
+            {'document_type': 'CNH', 'status': 'TIPO_INVALIDO', 'label': 'cnh_1', 'extracted_information': {'nome': 'X', 'cpf': '0'}},
+            {'document_type': 'CNPJ', 'status': 'OK', 'label': 'cnpj_1',
+             'extracted_information': {'numero_cnae': '4751-2/01', 'data_situacao_cadastral': '01-01-2020', 'data_abertura': '01-01-2020'}},
+            {'document_type': 'CTPS', 'status': 'OK', 'label': 'ctps_1', 'document_id': f'doc-{i}',
+             'extracted_text': f'CARTEIRA DE TRABALHO {nome} {empresa} ' * 20,
+             'extracted_information': {'data_emissao': '01-01-2015', 'documento_digital': 'Falso'}},
+        ]
+        beneficiarios.append({'_id': i, 'id': uuid, 'tipo': 'EMPRESA', 'agregador': agregador,
+                              'cartao_proposta': {'nome': nome}, 'documentos': documentos})
+        ids = {'uuid': uuid, 'agregador': agregador, 'document_label': 'label-1', 'message_type': 'regras'}
+        proposta_mei = {'razao_social': empresa, 'cnpj': cnpj, 'endereco_empresa': ENDERECO, 'nome': nome,
+                        'cpf': '123.456.789-00', 'situacao_cadastral': 'ATIVA', 'numero_cnae': '4751-2/01',
+                        'data_situacao_cadastral': '01-01-2020', 'data_abertura_empresa': '01-01-2020'}
+        mei.append(dict(ids, document_id=f'mei-{i}', cartao_proposta=proposta_mei,
+                        document_information=dict(proposta_mei, nome=nome.title())))
+        proposta_ctps = {'nome': nome, 'cpf': '123.456.789-00', 'data_nascimento': '10/05/1985', 'nome_mae': 'JOSEFA DOS SANTOS',
+                         'razao_social': empresa, 'cnpj': cnpj, 'endereco_empresa': ENDERECO, 'data_admissao': '01/02/2020',
+                         'cbo': '4110-10', 'documento_digital': 'Verdadeiro', 'data_assinatura': 'Not Found'}
+        ctps.append(dict(ids, document_id=f'doc-{i}', cartao_proposta=proposta_ctps,
+                         document_information=dict(proposta_ctps, data_nascimento='10-05-1985', data_admissao='01-02-2020')))
+    return beneficiarios, {'mei': mei, 'ctps': ctps}
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--messages', type=int, default=200)
+    args.add_argument('--latency-ms', type=float, default=2)
+    args = args.parse_args()
+
+    Latency.seconds = args.latency_ms / 1000
+    beneficiarios, lotes = build_data(args.messages)
+    collection = FakeCollection(beneficiarios)
+
+    class StandInMongo(mongodb_connections.MongoDBConnections):
+        def __init__(self):
+            self.mdb = {'beneficiarios': collection}
+            self.reads = 0
+
+    class StandInBatchMongo(BatchMongoDBConnections):
+        def __init__(self):
+            StandInMongo.__init__(self)
+            self._beneficiarios = {}
+            self._agregadores = {}
+
+    ValidateDocument.MongoDBConnections = StandInMongo
+
+    print(f'mensagens por lote: {args.messages}, latência por consulta: {args.latency_ms}ms')
+    print(f'{"validador":<14}{"individual":>12}{"consultas":>11}{"lote":>10}{"consultas":>11}{"speedup":>9}  mesmo resultado')
+    failures = 0
+    for document_type, messages in lotes.items():
+        cls = getattr(__import__(f'{document_type}_validate'), f'{document_type}_validate')
+
+        Latency.calls = 0
+        start = time.perf_counter()
+        individual = []
+        for message in messages:
+            for var, campo in (('UUID', 'uuid'), ('AGREGADOR', 'agregador'), ('DOCUMENT_ID', 'document_id'), ('DOCUMENT_LABEL', 'document_label')):
+                os.environ[var] = message[campo]
+            individual.append(cls(message['cartao_proposta'], message['document_information'], message['message_type']).validate())
+        individual_s, individual_calls = time.perf_counter() - start, Latency.calls
+
+        Latency.calls = 0
+        start = time.perf_counter()
+        lote = validate_batch(document_type, messages, connection=StandInBatchMongo())
+        lote_s, lote_calls = time.perf_counter() - start, Latency.calls
+
+        same = json.dumps(individual, default=str) == json.dumps(lote, default=str)
+        failures += not same
+        print(f'{document_type:<14}{individual_s:>11.2f}s{individual_calls:>11}{lote_s:>9.2f}s{lote_calls:>11}'
+              f'{individual_s / lote_s:>8.2f}x  {same}')
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
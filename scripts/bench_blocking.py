@@ -0,0 +1,70 @@
+"""
+Recall do índice de bloqueio do name_matching contra a comparação exaustiva.
+
+Monta um rol sintético (synthetic_corpus) e uma segunda lista com variantes de parte dos nomes
+(erros de OCR, abreviações) mais nomes novos. A comparação exaustiva pontua todos os pares
+com o score_matrix; a bloqueada (similar_pairs) pontua só os pares que compartilham um bloco.
+
+- recall: fração dos pares com norm_score >= limiar na exaustiva que a bloqueada também encontra;
+- pares comparados: quantos pares cada uma pontuou;
+- tempo de cada uma.
+
+As chaves foram pensadas para nomes de pessoas no limiar usual dos validadores (90). Em limiares
+mais baixos (ex.: 80) a exaustiva passa a aceitar pessoas diferentes com o mesmo sobrenome, que
+o bloqueio separa de propósito, e o recall cai.
+
+Uso: python scripts/bench_blocking.py [--roster 600] [--queries 600] [--threshold 90] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from Distances import score_matrix
+from name_matching import BlockingIndex, similar_pairs
+from synthetic_corpus import nome, roster, variante
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--roster', type=int, default=600)
+    args.add_argument('--queries', type=int, default=600)
+    args.add_argument('--threshold', type=float, default=90)
+    args.add_argument('--min-recall', type=float, default=0.95)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+
+    rng = random.Random(args.seed)
+    names_b = roster(args.roster, seed=args.seed)
+    names_a = [variante(rng, rng.choice(names_b)) if rng.random() < 0.7 else nome(rng) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    matrix = score_matrix(names_a, names_b, score_cutoff=args.threshold)
+    exhaustive_s = time.perf_counter() - start
+    esperados = {(i, j) for i, linha in enumerate(matrix) for j, score in enumerate(linha) if score >= args.threshold}
+
+    start = time.perf_counter()
+    index = BlockingIndex(names_b)
+    encontrados = similar_pairs(names_a, names_b, args.threshold, index=index)
+    blocked_s = time.perf_counter() - start
+    comparados = sum(len(index.candidates(name)) for name in names_a)
+
+    recall = len(esperados & {(m.row, m.col) for m in encontrados}) / len(esperados) if esperados else 1.0
+    scores_iguais = all(matrix[m.row][m.col] == m.score for m in encontrados)
+
+    print(f'rol: {len(names_b)}, consultas: {len(names_a)}, limiar: {args.threshold:g}, blocos: {len(index._blocos)}')
+    print(f'{"versão":<12}{"pares comparados":>18}{"pares >= limiar":>17}{"tempo":>12}')
+    print(f'{"exaustiva":<12}{len(names_a) * len(names_b):>18}{len(esperados):>17}{exhaustive_s * 1000:>10.1f}ms')
+    print(f'{"bloqueada":<12}{comparados:>18}{len(encontrados):>17}{blocked_s * 1000:>10.1f}ms')
+    print(f'recall: {recall:.4f}  speedup: {exhaustive_s / blocked_s:.1f}x')
+    for label, ok in ((f'recall >= {args.min_recall:g}', recall >= args.min_recall),
+                      ('scores da bloqueada iguais aos da exaustiva', scores_iguais)):
+        print(('OK    ' if ok else 'FALHA ') + label)
+    sys.exit(0 if recall >= args.min_recall and scores_iguais else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Custo por comparação de distances(s1, s2).norm_score(), antes e depois de text_normalization.
+
+A versão anterior do distances é reproduzida aqui: a cada construção acrescenta o diretório de
+dados em nltk.data.path, recarrega as stopwords e normaliza os dois textos. São medidos:
+- anterior: a versão reproduzida;
+- atual (frio): a versão atual com os caches de text_normalization limpos antes de cada rodada,
+  ou seja, todos os textos são inéditos;
+- atual (quente): a versão atual com os textos já vistos (o caso dos validadores, que comparam
+  os mesmos nomes várias vezes).
+
+Também confere que os scores são idênticos e mostra o crescimento de nltk.data.path. Como esse
+crescimento deixa cada busca de dados do nltk mais lenta, o custo da versão anterior aumenta com
+o número de comparações; por isso o padrão é de poucos pares.
+
+Uso: python scripts/bench_distances.py [--pairs 200] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import text_normalization
+from Distances import distances
+from synthetic_corpus import nome, ruido
+
+
+class legacy_distances(distances):
+    """
+    distances como era antes de text_normalization.
+    """
+
+    def __init__(self, s1, s2):
+        import nltk
+        import unidecode
+        from nltk.corpus import stopwords
+
+        self.s1 = s1
+        self.s2 = s2
+        nltk.data.path.append(text_normalization.NLTK_DATA_PATH)
+        self.stop_words = set(stopwords.words("portuguese"))
+        self.normalized_s1 = unidecode.unidecode(s1).lower()
+        self.normalized_s2 = unidecode.unidecode(s2).lower()
+
+    def find_abbreviation_match(self):
+        from nltk.tokenize import word_tokenize
+        from thefuzz import fuzz
+
+        s1_tokens = [word for word in word_tokenize(self.normalized_s1) if word not in self.stop_words]
+        s2_tokens = [word for word in word_tokenize(self.normalized_s2) if word not in self.stop_words]
+        return fuzz.ratio(" ".join(token[0] for token in s1_tokens), " ".join(token[0] for token in s2_tokens))
+
+
+def measure(build, pairs, before_round=None, repeat=3):
+    best = None
+    for _ in range(repeat):
+        if before_round is not None:
+            before_round()
+        start = time.perf_counter()
+        scores = [build(s1, s2).norm_score() for s1, s2 in pairs]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pairs) * 1e6, scores
+
+
+def clear_caches():
+    for fn in (text_normalization.fold, text_normalization.tokens, text_normalization.content_tokens):
+        fn.cache_clear()
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--pairs', type=int, default=200)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = []
+    for _ in range(args.pairs):
+        s1 = nome(rng)
+        pairs.append((s1, ruido(rng, s1) if rng.random() < 0.7 else nome(rng)))
+
+    import nltk
+    # Aquece imports e dados do nltk para medir só o custo por comparação
+    legacy_distances(*pairs[0]).norm_score()
+    distances(*pairs[0]).norm_score()
+    path_before = len(nltk.data.path)
+
+    legacy_us, legacy_scores = measure(legacy_distances, pairs)
+    path_growth = len(nltk.data.path) - path_before
+    cold_us, cold_scores = measure(distances, pairs, before_round=clear_caches)
+    warm_us, warm_scores = measure(distances, pairs)
+
+    print(f'pares: {len(pairs)}')
+    print(f'{"versão":<18}{"us/comparação":>15}{"speedup":>10}')
+    for label, us in (('anterior', legacy_us), ('atual (frio)', cold_us), ('atual (quente)', warm_us)):
+        print(f'{label:<18}{us:>15.1f}{legacy_us / us:>9.2f}x')
+    print(f'scores idênticos: {legacy_scores == cold_scores == warm_scores}')
+    print(f'nltk.data.path cresceu {path_growth} entradas na versão anterior; '
+          f'{len(nltk.data.path) - path_before - path_growth} na atual')
+
+    sys.exit(0 if legacy_scores == cold_scores == warm_scores else 1)
+
+
+if __name__ == '__main__':
+    main()
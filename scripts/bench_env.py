@@ -0,0 +1,22 @@
+"""
+Variáveis de ambiente que os módulos do Lambda leem no import (ValidateDocument,
+mongodb_connections, lambda_function), com valores locais para os scripts.
+
+Cada script chama setup() antes de importar esses módulos. Os padrões deste arquivo só
+preenchem o que o ambiente não define; os overrides (valores de que o script depende, ex.: o
+UUID dos dados do dublê do Mongo) são sempre aplicados, mesmo sobre o ambiente.
+"""
+import os
+
+DEFAULT_ENV = {
+    'UUID': 'bench', 'SQS_RETRY_QUEUE': 'bench', 'AGREGADOR': 'bench', 'SIMILARITY_LIST': 'ctps|comprovante_residencia',
+    'DOCUMENT_ID': 'bench', 'DOCUMENT_LABEL': 'bench', 'REGION_NAME': 'us-east-1', 'SECRET_NAME': 'bench',
+    'INFORMATION': 'bench', 'DELAY_SECONDS': '2', 'FOLDER_NAME': 'bench', 'S3_BUCKET': 'bench',
+    'METRICS_ENABLED': 'false',
+}
+
+
+def setup(**overrides):
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.update(overrides)
@@ -0,0 +1,81 @@
+"""
+Mede o custo de import a frio de cada módulo de validação usando `python -X importtime`.
+Cada módulo é importado num interpretador novo, então o número reportado é o que
+um cold start do Lambda pagaria para carregar aquele validador.
+
+Uso: python scripts/bench_import_time.py [--top 5] [--json resultado.json] [modulo ...]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+
+import bench_env
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def import_time(module):
+    env = dict(os.environ)
+    for key, value in bench_env.DEFAULT_ENV.items():
+        env.setdefault(key, value)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({'module': name, 'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                            'depth': len(indent) // 2})
+    total = next((e['cumulative_us'] for e in entries if e['module'] == module), None)
+    error = proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 else None
+    return total, entries, error
+
+
+def top_level_packages(entries, top):
+    # Agrupa pelo pacote raiz (nltk, pymongo, ...) somando o tempo próprio de cada submódulo
+    packages = {}
+    for e in entries:
+        root = e['module'].split('.')[0]
+        packages[root] = packages.get(root, 0) + e['self_us']
+    return sorted(packages.items(), key=lambda x: x[1], reverse=True)[:top]
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('modules', nargs='*')
+    args.add_argument('--top', type=int, default=5)
+    args.add_argument('--json', dest='json_path')
+    args = args.parse_args()
+
+    modules = args.modules or sorted(
+        os.path.basename(p)[:-3] for p in glob.glob(os.path.join(ROOT, '*_validate.py'))
+    )
+
+    report = {}
+    for module in modules:
+        total, entries, error = import_time(module)
+        report[module] = {
+            'cumulative_ms': total / 1000 if total is not None else None,
+            'top_packages_ms': {name: us / 1000 for name, us in top_level_packages(entries, args.top)},
+            'error': error,
+        }
+        if error:
+            print(f'{module:<42}{"falhou":>10}  {error}')
+            continue
+        tops = ', '.join(f'{name}={ms:.1f}' for name, ms in report[module]['top_packages_ms'].items())
+        print(f'{module:<42}{report[module]["cumulative_ms"]:>9.1f}ms  {tops}')
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
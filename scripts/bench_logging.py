@@ -0,0 +1,99 @@
+"""
+Mede o custo dos logs do lambda_function no modo antigo (f-strings com o payload
+completo) e no modo compacto do log_utils, além da serialização json x orjson.
+
+Uso: python scripts/bench_logging.py [--text-kb 2048] [--repeat 20]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import log_utils
+from log_utils import LogPayload, dumps
+
+
+def build_message(text_kb):
+    extracted_text = ('CARTEIRA DE TRABALHO E PREVIDENCIA SOCIAL NOME JOAO DA SILVA ' * 32)[:1024] * text_kb
+    return {
+        'uuid': 'b8c1c7a0-0000-4000-8000-000000000001',
+        'agregador': 'AGR-0001',
+        'document_id': 'DOC-0001',
+        'document_label': 'ctps_1',
+        'document_type': 'CTPS',
+        'message_type': 'regras',
+        'JobId': 'job-0001',
+        'cartao_proposta': {'nome': 'JOÃO DA SILVA', 'cpf': '123.456.789-00', 'razao_social': 'ACME LTDA'},
+        'document_information': {'nome': 'JOAO DA SILVA', 'cpf': '12345678900', 'extracted_text': extracted_text},
+    }
+
+
+def counting_logger():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('[%(levelname)s]\t%(asctime)s\t%(message)s'))
+    logger = logging.getLogger('bench_logging')
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger, stream
+
+
+def bench(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--text-kb', type=int, default=2048)
+    args.add_argument('--repeat', type=int, default=20)
+    args = args.parse_args()
+
+    message = build_message(args.text_kb)
+    output = {'validacao_nome': {'valid': True, 'target': 'nome', 'percent_match': 100.0,
+                                 'trecho_procurado': 'JOÃO DA SILVA', 'trecho_encontrado': 'JOAO DA SILVA',
+                                 'regras_subscricao_errors': 'OK'}}
+    event = {'Records': [{'body': json.dumps(message)}]}
+
+    logger, stream = counting_logger()
+
+    def old_path():
+        logger.info(event)
+        logger.info(f'output {output}')
+        logger.info(f'message {message}')
+
+    def new_path():
+        logger.info('%s', LogPayload(event))
+        logger.info('output %s', LogPayload(output))
+        logger.info('message %s', LogPayload(message))
+
+    results = {}
+    for label, fn in (('f-string completo', old_path), ('LogPayload compacto', new_path)):
+        stream.seek(0)
+        stream.truncate()
+        ms = bench(label, fn, args.repeat)
+        results[label] = (ms, len(stream.getvalue().encode('utf-8')) // args.repeat)
+
+    serializers = {'json.dumps': lambda: json.dumps(message)}
+    if log_utils.orjson is not None:
+        serializers['orjson (log_utils.dumps)'] = lambda: dumps(message)
+
+    print(f'texto extraído: {args.text_kb} KB, repetições: {args.repeat}')
+    print(f'{"logs por mensagem":<28}{"ms":>10}{"bytes ingeridos":>18}')
+    for label, (ms, size) in results.items():
+        print(f'{label:<28}{ms:>10.2f}{size:>18}')
+    print(f'\n{"serialização":<28}{"ms":>10}')
+    for label, fn in serializers.items():
+        print(f'{label:<28}{bench(label, fn, args.repeat):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Compara a construção dos modelos de documento gerados por @document_model com a construção
+anterior (@dataclass_json + @dataclass chamados como Modelo(**dados)) com Modelo.from_dict(dados).
+
+A versão anterior é reconstruída aqui a partir das anotações de cada modelo, com os mesmos
+campos e valores padrão. Sem o dataclasses_json instalado ela vira um @dataclass simples, bem
+mais rápido que o original (o __init__ do Undefined.EXCLUDE confere os argumentos a cada
+chamada), e a comparação fica contra esse limite inferior. Para cada modelo são medidos o tempo
+por construção e os bytes alocados por instância (tracemalloc), usando um payload com todos os
+campos preenchidos (endereços como dict, como chegam).
+
+Uso: python scripts/bench_models.py [--number 20000]
+"""
+import argparse
+import dataclasses
+import inspect
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import bench_env
+
+bench_env.setup()
+
+from carta_permanencia_validate import Carta_permanencia
+from comprovante_residencia_validate import Comprovante_residencia
+from contrato_estagio_validate import Contrato_estagio
+from ctps_validate import Cpts
+from ficha_registro_validate import Ficha_registro
+from mei_validate import Mei
+from validacao_endereco import Endereco
+
+try:
+    from dataclasses_json import dataclass_json, Undefined
+except ImportError:
+    dataclass_json = None
+
+ENDERECO = {'cep': '01310-100', 'rua': 'AVENIDA PAULISTA', 'numero': '1000', 'complemento': 'SALA 1',
+            'bairro': 'BELA VISTA', 'cidade': 'SAO PAULO', 'estado': 'SP'}
+
+
+def legacy_model(model):
+    """
+    Reconstrói o modelo como era antes: dataclass (com dataclass_json, se instalado).
+    """
+    params = inspect.signature(model.__init__).parameters
+    fields = []
+    for campo, annotation in model.__annotations__.items():
+        default = params[campo].default
+        if default is inspect.Parameter.empty:
+            fields.append((campo, annotation))
+        else:
+            fields.append((campo, annotation, dataclasses.field(default=default)))
+    cls = dataclasses.make_dataclass(model.__name__, fields)
+    if dataclass_json is not None:
+        cls = dataclass_json(undefined=Undefined.EXCLUDE)(cls)
+    return cls
+
+
+def sample_payload(model):
+    return {campo: ENDERECO if campo.startswith('endereco') else f'valor {campo}' for campo in model._fields}
+
+
+def bytes_per_instance(build, count=2000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [build() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del instances
+    return total / count
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--number', type=int, default=20000)
+    args = args.parse_args()
+
+    anterior = '@dataclass_json + @dataclass' if dataclass_json is not None else '@dataclass (sem dataclasses_json)'
+    print(f'anterior: {anterior}, construções por medida: {args.number}')
+    print(f'{"modelo":<24}{"campos":>7}{"anterior":>12}{"slots":>12}{"speedup":>9}{"bytes ant.":>12}{"bytes slots":>12}')
+    for model in (Endereco, Cpts, Mei, Carta_permanencia, Comprovante_residencia, Contrato_estagio, Ficha_registro):
+        legacy = legacy_model(model)
+        payload = sample_payload(model)
+
+        build_legacy = lambda: legacy(**payload)
+        build_model = lambda: model.from_dict(payload)
+
+        legacy_us = min(timeit.repeat(build_legacy, number=args.number, repeat=3)) / args.number * 1e6
+        model_us = min(timeit.repeat(build_model, number=args.number, repeat=3)) / args.number * 1e6
+        legacy_bytes = bytes_per_instance(build_legacy)
+        model_bytes = bytes_per_instance(build_model)
+
+        print(f'{model.__name__:<24}{len(model._fields):>7}{legacy_us:>10.2f}us{model_us:>10.2f}us'
+              f'{legacy_us / model_us:>8.2f}x{legacy_bytes:>12.0f}{model_bytes:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Confere e mede o emparelhamento de assinantes x responsáveis legais do name_matching.
+
+- linear_sum_assignment contra a força bruta (todas as permutações) em matrizes pequenas;
+- assign não depende da ordem das linhas/colunas (mesmo número de pares e mesma soma);
+- quadros sintéticos de diretoria (synthetic_corpus): o primeiro-que-serve anterior do
+  estatuto_social (reproduzido aqui) contra o verificar_assinaturas atual, contando os
+  quadros em que cada um encontra todos os cargos e o tempo total.
+
+Uso: python scripts/bench_name_matching.py [--boards 200] [--officers 12] [--seed 7]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import bench_env
+
+bench_env.setup(VALIDATION_THRESHOLD='90')
+
+from Distances import distances
+from name_matching import assign, linear_sum_assignment
+from synthetic_corpus import nome, variante
+
+
+def brute_force(cost):
+    n, m = len(cost), len(cost[0])
+    if n <= m:
+        return min(sum(cost[i][j] for i, j in enumerate(cols)) for cols in itertools.permutations(range(m), n))
+    return min(sum(cost[i][j] for j, i in enumerate(rows)) for rows in itertools.permutations(range(n), m))
+
+
+def greedy(vagas, nome_assinou, threshold):
+    """
+    verificar_assinaturas como era antes: cada cargo fica com o primeiro assinante que passa no limiar.
+    """
+    nomes_restantes = set(nome_assinou)
+    resultados = []
+    for cargos in vagas:
+        match = None
+        for nome_esperado in cargos:
+            nome_assinado = next((n for n in nomes_restantes
+                                  if distances(nome_esperado.upper(), n.upper()).norm_score() >= threshold), None)
+            if nome_assinado:
+                match = nome_assinado, nome_esperado
+                break
+        if not match:
+            return False, resultados
+        resultados.append(match[1])
+        nomes_restantes.remove(match[0])
+    return True, resultados
+
+
+def current(vagas, nome_assinou, threshold):
+    from estatuto_social_validate import estatuto_social_validate
+
+    validator = estatuto_social_validate.__new__(estatuto_social_validate)
+    cargos_eleitos = {f'cargo_{i}': cargos for i, cargos in enumerate(vagas)}
+    validator._obter_cargos = lambda eleitos, cargo: eleitos[cargo]
+    return validator.verificar_assinaturas(cargos_eleitos, list(cargos_eleitos), nome_assinou, threshold)
+
+
+def board(rng, officers):
+    """
+    Diretoria com officers nomes: a regra pede um diretor, um membro qualquer e um conselheiro;
+    assinam variantes dos nomes de dois diretores e de um conselheiro. O cargo do meio aceita
+    qualquer nome (conselheiros primeiro), então o primeiro-que-serve gasta nele o assinante do
+    último cargo.
+    """
+    nomes = [nome(rng) for _ in range(officers)]
+    metade = officers // 2
+    vagas = [nomes[:metade], nomes[metade:] + nomes[:metade], nomes[metade:]]
+    assinantes = [variante(rng, n) for n in rng.sample(nomes[:metade], 2) + [rng.choice(nomes[metade:])]]
+    rng.shuffle(assinantes)
+    return vagas, assinantes
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--boards', type=int, default=200)
+    args.add_argument('--officers', type=int, default=12)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+    rng = random.Random(args.seed)
+
+    checks = {}
+    ok = True
+    for _ in range(300):
+        n, m = rng.randint(1, 5), rng.randint(1, 5)
+        cost = [[rng.randint(-9, 9) for _ in range(m)] for _ in range(n)]
+        pares = linear_sum_assignment(cost)
+        ok &= (len(pares) == min(n, m) and len({i for i, _ in pares}) == len({j for _, j in pares}) == len(pares)
+               and sum(cost[i][j] for i, j in pares) == brute_force(cost))
+    checks['linear_sum_assignment == força bruta'] = ok
+
+    ok = True
+    for _ in range(200):
+        n, m = rng.randint(1, 6), rng.randint(1, 6)
+        scores = [[rng.choice([0, 85, 90, 93, 97, 100]) for _ in range(m)] for _ in range(n)]
+        pares, total = assign(scores, 90)
+        linhas, colunas = list(range(n)), list(range(m))
+        rng.shuffle(linhas)
+        rng.shuffle(colunas)
+        embaralhados, total_embaralhado = assign([[scores[i][j] for j in colunas] for i in linhas], 90)
+        ok &= len(pares) == len(embaralhados) and total == total_embaralhado
+    checks['assign independe da ordem'] = ok
+
+    boards = [board(rng, args.officers) for _ in range(args.boards)]
+    threshold = float(os.environ['VALIDATION_THRESHOLD'])
+    current(*boards[0], threshold)
+
+    start = time.perf_counter()
+    antes = [greedy(vagas, assinantes, threshold) for vagas, assinantes in boards]
+    greedy_s = time.perf_counter() - start
+    start = time.perf_counter()
+    depois = [current(vagas, assinantes, threshold) for vagas, assinantes in boards]
+    current_s = time.perf_counter() - start
+
+    # Todo quadro aprovado pelo primeiro-que-serve deve continuar aprovado
+    checks['aprovados antes continuam aprovados'] = all(d[0] for a, d in zip(antes, depois) if a[0])
+
+    print(f'quadros: {args.boards} ({args.officers} responsáveis, 3 cargos, 3 assinantes)')
+    print(f'{"versão":<22}{"aprovados":>10}{"tempo":>12}')
+    print(f'{"primeiro-que-serve":<22}{sum(a[0] for a in antes):>10}{greedy_s * 1000:>10.1f}ms')
+    print(f'{"húngaro":<22}{sum(d[0] for d in depois):>10}{current_s * 1000:>10.1f}ms')
+    for label, passed in checks.items():
+        print(('OK    ' if passed else 'FALHA ') + label)
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Recall, precisão e tempo do pré-filtro MinHash/LSH (near_duplicates) da validacao_fraude_docs_similares
+contra o SimilarTextValidator atual (SequenceMatcher contra todos os documentos).
+
+Monta um agregador sintético (synthetic_corpus): --docs documentos do mesmo tipo, todos com o
+mesmo cabeçalho, como os textos de CTPS ou de comprovantes de um mesmo emissor. Cada uma das
+--queries consultas é um documento novo; metade delas tem no agregador de 1 a 3 cópias com ruído
+de OCR (até --noise dos caracteres alterados) e, às vezes, uma linha trocada. Para cada limiar
+de Jaccard:
+
+- recall: fração dos alertas da comparação completa (ratio > --limiar) que o pré-filtro mantém;
+- precisão: fração dos candidatos do pré-filtro que viram alerta (o resto é SequenceMatcher gasto à toa);
+- tempo por consulta: com o índice montado a cada consulta (uma mensagem) e amortizado (um índice
+  para o agregador inteiro).
+
+Uso: python scripts/bench_near_duplicates.py [--docs 200] [--queries 40] [--jaccard 0.2 0.3 0.5]
+                                             [--limiar 0.85] [--noise 0.08] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import fraud_tools
+import near_duplicates
+from fraud_tools import SimilarTextValidator
+from synthetic_corpus import nome, ruido, texto_documento
+
+CABECALHO = ('MINISTERIO DO TRABALHO E EMPREGO\nCARTEIRA DE TRABALHO E PREVIDENCIA SOCIAL - DIGITAL\n'
+             'DADOS PESSOAIS\nCONTRATOS DE TRABALHO\n')
+
+
+def documento(rng):
+    return CABECALHO + texto_documento(rng, linhas=rng.randint(6, 16))
+
+
+def copia(rng, texto, noise):
+    """
+    O mesmo documento reenviado: ruído de OCR e, às vezes, uma linha adulterada.
+    """
+    linhas = texto.split('\n')
+    if rng.random() < 0.3:
+        linhas[rng.randrange(len(linhas))] = f'NOME: {nome(rng)}'
+    texto = '\n'.join(linhas)
+    return ruido(rng, texto, max_erros=int(len(texto) * noise))
+
+
+def agregador(rng, docs, queries, noise):
+    corpus = [documento(rng) for _ in range(docs)]
+    consultas = []
+    for _ in range(queries):
+        consulta = documento(rng)
+        if rng.random() < 0.5:
+            corpus += [copia(rng, consulta, noise) for _ in range(rng.randint(1, 3))]
+        consultas.append(consulta)
+    rng.shuffle(corpus)
+    return [{'nome': f'doc_{i}', 'extracted_text': texto} for i, texto in enumerate(corpus)], consultas
+
+
+def alertas(corpus, consultas, limiar, prefilter, amortizado=False):
+    fraud_tools.SIMILARITY_PREFILTER = prefilter
+    near_duplicates.clear_signature_cache()
+    resultado, candidatos = [], 0
+    validator = SimilarTextValidator(corpus)
+    start = time.perf_counter()
+    for consulta in consultas:
+        if not amortizado:
+            validator = SimilarTextValidator(corpus)
+            near_duplicates.clear_signature_cache()
+        candidatos += len(validator.candidates(consulta))
+        resultado.append({a['nome'] for a in validator.validate({'extracted_text': consulta}, threshold=limiar)})
+    return resultado, candidatos, (time.perf_counter() - start) / len(consultas)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--docs', type=int, default=200)
+    args.add_argument('--queries', type=int, default=40)
+    args.add_argument('--jaccard', type=float, nargs='+', default=[0.2, 0.3, 0.5])
+    args.add_argument('--limiar', type=float, default=0.85)
+    args.add_argument('--noise', type=float, default=0.08)
+    args.add_argument('--min-recall', type=float, default=0.99)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+
+    padrao = fraud_tools.SIMILARITY_PREFILTER_JACCARD
+    corpus, consultas = agregador(random.Random(args.seed), args.docs, args.queries, args.noise)
+    fraud_tools.SIMILARITY_PREFILTER_MIN_DOCS = 0
+    esperados, comparados, completo_s = alertas(corpus, consultas, args.limiar, 'none')
+    total = sum(map(len, esperados))
+
+    print(f'agregador: {len(corpus)} documentos, {len(consultas)} consultas, {total} alertas (ratio > {args.limiar:g})')
+    print(f'{"versão":<16}{"bandas x linhas":>16}{"comparações":>13}{"recall":>8}{"precisão":>10}'
+          f'{"por consulta":>14}{"amortizado":>12}')
+    print(f'{"completa":<16}{"":>16}{comparados:>13}{1:>8.3f}{total / comparados:>10.3f}{completo_s * 1000:>12.1f}ms'
+          f'{completo_s * 1000:>10.1f}ms')
+    ok = True
+    for jaccard in args.jaccard:
+        fraud_tools.SIMILARITY_PREFILTER_JACCARD = jaccard
+        encontrados, candidatos, consulta_s = alertas(corpus, consultas, args.limiar, 'minhash')
+        _, _, amortizado_s = alertas(corpus, consultas, args.limiar, 'minhash', amortizado=True)
+        mantidos = sum(len(e & f) for e, f in zip(esperados, encontrados))
+        recall = mantidos / total if total else 1.0
+        precisao = mantidos / candidatos if candidatos else 1.0
+        bandas = '{} x {}'.format(*near_duplicates.lsh_bands(128, jaccard))
+        print(f'{f"minhash {jaccard:g}":<16}{bandas:>16}{candidatos:>13}{recall:>8.3f}{precisao:>10.3f}'
+              f'{consulta_s * 1000:>12.1f}ms{amortizado_s * 1000:>10.1f}ms')
+        # Alertas fora da comparação completa seriam um erro: o pré-filtro só pode remover
+        ok &= all(f <= e for e, f in zip(esperados, encontrados))
+        if jaccard == padrao:
+            ok &= recall >= args.min_recall
+
+    print(('OK    ' if ok else 'FALHA ') + f'sem alertas novos; recall >= {args.min_recall:g} no limiar padrão ({padrao:g})')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Compara a execução sequencial e paralela de ValidateDocument.validate() para o ctps_validate
+e o mei_validate, usando um dublê do Mongo com latência configurável por consulta.
+Também confere que os dois modos produzem exatamente o mesmo resultado.
+
+Uso: python scripts/bench_parallel_validate.py [--latency-ms 20] [--repeat 5] [--workers 4]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import bench_env
+
+bench_env.setup(UUID='uuid-1', AGREGADOR='agr-1', DOCUMENT_ID='doc-1', DOCUMENT_LABEL='label-1')
+
+import ValidateDocument
+from ctps_validate import ctps_validate
+from mei_validate import mei_validate
+
+ENDERECO = {'cep': '01310-100', 'rua': 'AVENIDA PAULISTA', 'numero': '1000', 'complemento': 'SALA 1',
+            'bairro': 'BELA VISTA', 'cidade': 'SAO PAULO', 'estado': 'SP'}
+
+CTPS = {
+    'nome': 'MARIA APARECIDA DOS SANTOS', 'cpf': '123.456.789-00', 'data_nascimento': '10/05/1985',
+    'nome_mae': 'JOSEFA DOS SANTOS', 'razao_social': 'ACME COMERCIO LTDA', 'cnpj': '12.345.678/0001-90',
+    'endereco_empresa': ENDERECO, 'data_admissao': '01/02/2020', 'cbo': '4110-10', 'documento_digital': 'Verdadeiro',
+    'data_assinatura': 'Not Found',
+}
+CTPS_EXTRAIDO = dict(CTPS, data_nascimento='10-05-1985', data_admissao='01-02-2020')
+
+MEI = {
+    'razao_social': 'ACME COMERCIO LTDA', 'cnpj': '12.345.678/0001-90', 'endereco_empresa': ENDERECO,
+    'nome': 'JOAO DA SILVA', 'cpf': '123.456.789-00', 'situacao_cadastral': 'ATIVA', 'numero_cnae': '4751-2/01',
+    'data_situacao_cadastral': '01-01-2020', 'data_abertura_empresa': '01-01-2020',
+}
+
+DOCS = {
+    'rg': {'nome': 'JOAO DA SILVA', 'cpf': '12345678900'},
+    'cnh': {'nome': 'JOAO DA SILVA', 'cpf': '12345678900'},
+    'cnpj': {'numero_cnae': '4751-2/01', 'data_situacao_cadastral': '01-01-2020', 'data_abertura': '01-01-2020'},
+}
+SIMILARES = {
+    'doc_atual': {'document_id': 'doc-1', 'nome': 'MARIA', 'extracted_text': 'CARTEIRA DE TRABALHO MARIA APARECIDA ' * 40},
+    'doc_list': [{'document_id': f'doc-{i}', 'nome': f'PESSOA {i}',
+                  'extracted_text': f'CARTEIRA DE TRABALHO PESSOA {i} ' * 40} for i in range(2, 6)],
+}
+
+
+class LatencyMongo:
+    latency = 0.02
+
+    def __init__(self):
+        self.reads = 0
+
+    def _wait(self):
+        self.reads += 1
+        time.sleep(self.latency)
+
+    def lookup_parent_company(self, uuid):
+        self._wait()
+        return None
+
+    def request_data_mongodb(self, document_type, document_label, uuid):
+        self._wait()
+        doc = DOCS.get(document_type)
+        return dict(doc) if doc is not None else None
+
+    def similarity_documents(self, agregador, document_type, current_doc_id):
+        self._wait()
+        return json.loads(json.dumps(SIMILARES))
+
+
+def run(cls, proposta, extraido, parallel, repeat):
+    cls.parallel_validations = parallel
+    outputs = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = cls(proposta, dict(extraido), 'regras').validate()
+    return (time.perf_counter() - start) / repeat * 1000, outputs
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--latency-ms', type=float, default=20)
+    args.add_argument('--repeat', type=int, default=5)
+    args.add_argument('--workers', type=int, default=4)
+    args = args.parse_args()
+
+    LatencyMongo.latency = args.latency_ms / 1000
+    ValidateDocument.MongoDBConnections = LatencyMongo
+    ValidateDocument.PARALLEL_WORKERS = args.workers
+
+    print(f'latência por consulta: {args.latency_ms}ms, workers: {args.workers}, repetições: {args.repeat}')
+    print(f'{"validador":<16}{"sequencial":>14}{"paralelo":>14}{"speedup":>10}  mesmo resultado')
+    for name, cls, proposta, extraido in (('ctps_validate', ctps_validate, CTPS, CTPS_EXTRAIDO),
+                                          ('mei_validate', mei_validate, MEI, MEI)):
+        seq_ms, seq_out = run(cls, proposta, extraido, False, args.repeat)
+        par_ms, par_out = run(cls, proposta, extraido, True, args.repeat)
+        same = json.dumps(seq_out, sort_keys=False, default=str) == json.dumps(par_out, sort_keys=False, default=str)
+        print(f'{name:<16}{seq_ms:>12.1f}ms{par_ms:>12.1f}ms{seq_ms / par_ms:>9.2f}x  {same}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Confere e mede score_many/cdist do Distances contra o laço de distances(a, b).norm_score().
+
+- sem score_cutoff, os arrays (calculados em lote pelo rapidfuzz) devem ser idênticos aos scores
+  do laço, inclusive com textos vazios ou só de stopwords entre os candidatos;
+- com score_cutoff, os scores a partir do corte devem ser idênticos e os demais, 0;
+- iter_norm_scores gera os mesmos scores do laço, um candidato por vez: o laço dos validadores
+  que para no primeiro nome acima do corte só pontua os candidatos até ele.
+
+Uso: python scripts/bench_score_many.py [--queries 50] [--candidates 200] [--cutoff 90] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from synthetic_corpus import nome, ruido
+from Distances import cdist, distances, iter_norm_scores, score_many
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--queries', type=int, default=50)
+    args.add_argument('--candidates', type=int, default=200)
+    args.add_argument('--cutoff', type=float, default=90)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+
+    rng = random.Random(args.seed)
+    queries = [nome(rng) for _ in range(args.queries)]
+    candidates = [ruido(rng, rng.choice(queries)) if rng.random() < 0.3 else nome(rng) for _ in range(args.candidates)]
+    candidates += ['', 'DE', 'DA SILVA']
+    distances(queries[0], candidates[0]).norm_score()
+
+    loop_s, expected = timed(lambda: np.array([[distances(a, b).norm_score() for b in candidates] for a in queries]))
+    many_s, many = timed(lambda: np.array([score_many(a, candidates) for a in queries]))
+    cdist_s, matrix = timed(lambda: cdist(queries, candidates))
+    cutoff_s, cut = timed(lambda: cdist(queries, candidates, score_cutoff=args.cutoff))
+    iter_s, lazy = timed(lambda: np.array([list(iter_norm_scores(a, candidates)) for a in queries]))
+
+    def primeiro(a):
+        # Como os validadores: para no primeiro candidato a partir do corte
+        return next((j for j, score in enumerate(iter_norm_scores(a, candidates)) if score >= args.cutoff), None)
+
+    primeiro_s, _ = timed(lambda: [primeiro(a) for a in queries])
+
+    acima = expected >= args.cutoff
+    checks = {
+        'score_many == laço': np.array_equal(many, expected),
+        'cdist == laço': np.array_equal(matrix, expected),
+        'iter_norm_scores == laço': np.array_equal(lazy, expected),
+        f'cdist(score_cutoff={args.cutoff:g}) igual acima do corte': np.array_equal(cut[acima], expected[acima]),
+        f'cdist(score_cutoff={args.cutoff:g}) zera abaixo do corte': not cut[~acima].any(),
+    }
+
+    print(f'pares: {expected.size} ({args.queries} x {args.candidates}), acima do corte: {int(acima.sum())}')
+    print(f'{"método":<28}{"tempo":>10}{"speedup":>10}')
+    for label, elapsed in (('laço norm_score', loop_s), ('score_many', many_s), ('cdist', cdist_s),
+                           (f'cdist score_cutoff={args.cutoff:g}', cutoff_s), ('iter_norm_scores', iter_s),
+                           (f'iter até o 1º >= {args.cutoff:g}', primeiro_s)):
+        print(f'{label:<28}{elapsed * 1000:>8.1f}ms{loop_s / elapsed:>9.2f}x')
+    for label, ok in checks.items():
+        print(('OK    ' if ok else 'FALHA ') + label)
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Taxa de acertos e ganho do memo de norm_score por mensagem (normalized_fields).
+
+- validadores: ctps_validate e mei_validate (dublê do Mongo sem latência, como no
+  bench_parallel_validate) executados numa mesma mensagem, com e sem o memo; mostra consultas,
+  acertos e tempo, e confere que os resultados são idênticos;
+- repetição: o padrão que o memo ataca, com os mesmos nomes da proposta (titular, mãe, razão
+  social; synthetic_corpus) comparados por --validators validações com as versões extraídas de
+  cada documento.
+
+O memo é desligado zerando normalized_fields.SCORE_MEMO_MAX_ENTRIES (nada é guardado, mas as
+consultas continuam sendo contadas).
+
+Uso: python scripts/bench_score_memo.py [--proposals 200] [--validators 6] [--repeat 5] [--seed 7]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import bench_env
+
+bench_env.setup(UUID='uuid-1', AGREGADOR='agr-1', DOCUMENT_ID='doc-1', DOCUMENT_LABEL='label-1')
+
+import normalized_fields
+import text_normalization
+import ValidateDocument
+from bench_parallel_validate import CTPS, CTPS_EXTRAIDO, MEI, LatencyMongo
+from ctps_validate import ctps_validate
+from Distances import distances
+from mei_validate import mei_validate
+from synthetic_corpus import nome, razao_social, variante
+
+MEMO_MAX_ENTRIES = normalized_fields.SCORE_MEMO_MAX_ENTRIES
+
+
+def clear_caches():
+    for fn in (text_normalization.fold, text_normalization.tokens, text_normalization.content_tokens):
+        fn.cache_clear()
+
+
+def timed(enabled, fn, contadores):
+    normalized_fields.SCORE_MEMO_MAX_ENTRIES = MEMO_MAX_ENTRIES if enabled else 0
+    clear_caches()
+    contadores.clear()
+    start = time.perf_counter()
+    output = fn(contadores)
+    return time.perf_counter() - start, output
+
+
+def validators(contadores):
+    with normalized_fields.message_scope() as campos:
+        output = {name: cls(proposta, dict(extraido), 'regras').validate()
+                  for name, cls, proposta, extraido in (('ctps', ctps_validate, CTPS, CTPS_EXTRAIDO),
+                                                        ('mei', mei_validate, MEI, MEI))}
+    contadores.append((campos.score_lookups, campos.score_hits))
+    return output
+
+
+def proposals(rng, count, validators):
+    """
+    Para cada proposta, os nomes comparados por cada validação: o texto da proposta contra o
+    extraído de um dos documentos (as validações de um mesmo documento repetem o par).
+    """
+    mensagens = []
+    for _ in range(count):
+        campos = [nome(rng), nome(rng), razao_social(rng)]
+        documentos = [[variante(rng, campo) for campo in campos] for _ in range(2)]
+        mensagens.append([(campo, rng.choice(documentos)[i]) for _ in range(validators) for i, campo in enumerate(campos)])
+    return mensagens
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--proposals', type=int, default=200)
+    args.add_argument('--validators', type=int, default=6)
+    args.add_argument('--repeat', type=int, default=5)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+
+    LatencyMongo.latency = 0
+    ValidateDocument.MongoDBConnections = LatencyMongo
+    mensagens = proposals(random.Random(args.seed), args.proposals, args.validators)
+
+    def repeticao(contadores):
+        scores = []
+        for pares in mensagens:
+            with normalized_fields.message_scope() as campos:
+                scores.append([distances(a, b).norm_score() for a, b in pares])
+            contadores.append((campos.score_lookups, campos.score_hits))
+        return scores
+
+    validators([])  # aquecimento: imports e dados do nltk
+    print(f'{"carga":<14}{"memo":<6}{"consultas":>10}{"acertos":>9}{"taxa":>7}{"tempo":>12}')
+    ok = True
+    for carga, fn in (('validadores', validators), ('repetição', repeticao)):
+        resultados = {}
+        for enabled in (False, True):
+            tempos = []
+            contadores = []
+            for _ in range(args.repeat):
+                elapsed, resultados[enabled] = timed(enabled, fn, contadores)
+                tempos.append(elapsed)
+            lookups = sum(c[0] for c in contadores)
+            hits = sum(c[1] for c in contadores)
+            taxa = hits / lookups if lookups else 0.0
+            print(f'{carga:<14}{"sim" if enabled else "não":<6}{lookups:>10}{hits:>9}{taxa:>7.0%}'
+                  f'{min(tempos) * 1000:>10.1f}ms')
+        ok &= json.dumps(resultados[False], default=str) == json.dumps(resultados[True], default=str)
+
+    print(('OK    ' if ok else 'FALHA ') + 'resultados idênticos com e sem o memo')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Confere e mede a cascata de SimilarTextValidator.sequential_similarity(threshold=...) contra o
+SequenceMatcher.ratio() completo, e o backend opcional do rapidfuzz (SIMILARITY_BACKEND).
+
+Usa o agregador sintético do bench_near_duplicates (documentos do mesmo tipo com o mesmo
+cabeçalho e cópias com ruído de OCR) e pontua cada consulta contra todos os documentos:
+
+- decisões: com a cascata, os pares acima do limiar e os seus scores têm de ser os mesmos do
+  ratio() completo, em cada limiar de --limiares;
+- quantos pares cada etapa descartou (comprimentos, caracteres em comum) e quantos chegaram ao diff;
+- tempo total de cada versão;
+- rapidfuzz: quantas decisões diferem das do SequenceMatcher (não é o mesmo score) e o tempo.
+
+Uso: python scripts/bench_sequential_similarity.py [--docs 100] [--queries 20] [--limiares 0.85 0.9] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import fraud_tools
+from bench_near_duplicates import agregador
+from fraud_tools import SimilarTextValidator
+
+
+def etapa(text1, text2, threshold):
+    # Em que etapa da cascata o par para
+    total = len(text1) + len(text2)
+    if total and 2.0 * min(len(text1), len(text2)) / total <= threshold:
+        return 'comprimentos'
+    if SequenceMatcher(None, text1, text2).quick_ratio() <= threshold:
+        return 'caracteres'
+    return 'diff'
+
+
+def scores(pares, fn):
+    start = time.perf_counter()
+    resultado = [fn(a, b) for a, b in pares]
+    return resultado, time.perf_counter() - start
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--docs', type=int, default=100)
+    args.add_argument('--queries', type=int, default=20)
+    args.add_argument('--limiares', type=float, nargs='+', default=[0.85, 0.9])
+    args.add_argument('--noise', type=float, default=0.08)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+
+    corpus, consultas = agregador(random.Random(args.seed), args.docs, args.queries, args.noise)
+    pares = [(consulta, item['extracted_text']) for consulta in consultas for item in corpus]
+    validator = SimilarTextValidator(corpus)
+
+    fraud_tools.SIMILARITY_BACKEND = 'difflib'
+    completos, completo_s = scores(pares, validator.sequential_similarity)
+    print(f'pares: {len(pares)} ({len(consultas)} consultas x {len(corpus)} documentos); ratio() completo: {completo_s:.2f}s')
+    print(f'{"limiar":<8}{"alertas":>8}{"comprimentos":>14}{"caracteres":>12}{"diff":>7}{"cascata":>10}'
+          f'{"speedup":>9}{"rapidfuzz":>11}{"divergências":>14}')
+    ok = True
+    for limiar in args.limiares:
+        fraud_tools.SIMILARITY_BACKEND = 'difflib'
+        cascata, cascata_s = scores(pares, lambda a, b: validator.sequential_similarity(a, b, limiar))
+        esperados = [score if score > limiar else 0.0 for score in completos]
+        ok &= cascata == esperados
+        etapas = [etapa(a, b, limiar) for a, b in pares]
+
+        fraud_tools.SIMILARITY_BACKEND = 'rapidfuzz'
+        rapidos, rapido_s = scores(pares, lambda a, b: validator.sequential_similarity(a, b, limiar))
+        divergencias = sum((r > limiar) != (e > 0) for r, e in zip(rapidos, esperados))
+
+        print(f'{limiar:<8g}{sum(s > 0 for s in esperados):>8}{etapas.count("comprimentos"):>14}'
+              f'{etapas.count("caracteres"):>12}{etapas.count("diff"):>7}{cascata_s:>9.2f}s'
+              f'{completo_s / cascata_s:>8.1f}x{rapido_s:>10.2f}s{divergencias:>14}')
+
+    fraud_tools.SIMILARITY_BACKEND = 'difflib'
+    print(('OK    ' if ok else 'FALHA ') + 'cascata com as mesmas decisões e scores do ratio() completo')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
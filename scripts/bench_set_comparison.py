@@ -0,0 +1,118 @@
+"""
+Confere e mede a comparação aproximada de conjuntos de nomes (name_matching.compare_sets), usada
+pelo gfip_novo._set_comparison.
+
+- paridade: em --seeds rols pequenos, os faltantes de cada modo contra a comparação exaustiva
+  (todos os pares pelo score_matrix). Faltantes a mais são pares que o bloqueio separou (o
+  recall é a fração dos nomes encontrados pelo exaustivo que o bloqueio também encontra); a
+  menos seria um erro;
+- escala: tempo de compare_sets em rols maiores, com o documento certo e com outro rol no lugar
+  (quase nenhum nome encontrado), e o exaustivo estimado pelo custo por par medido na paridade,
+  porque rodar todos os pares levaria horas.
+
+O vocabulário do synthetic_corpus é pequeno (30 primeiros nomes x 37 sobrenomes), então os
+blocos crescem junto com o rol e o tempo fica acima do linear: é o pior caso. Em rols reais,
+com muito mais combinações de primeiro e último nome, os blocos ficam pequenos.
+
+Uso: python scripts/bench_set_comparison.py [--small 300] [--seeds 5] [--large 2000 5000] [--threshold 90]
+                                            [--min-recall 0.999] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from Distances import score_matrix
+from name_matching import compare_sets
+from synthetic_corpus import nome, roster, variante
+
+MODOS = ('somente_proposta', 'somente_documento', 'interseccao_completa')
+
+
+def listas(size, seed):
+    """
+    Proposta e documento: o documento tem variantes de 95% dos nomes da proposta mais nomes novos.
+    """
+    rng = random.Random(seed)
+    proposta = roster(size, seed=seed)
+    documento = [variante(rng, n) for n in proposta if rng.random() < 0.95]
+    documento += [nome(rng) for _ in range(size // 20)]
+    rng.shuffle(documento)
+    return proposta, documento
+
+
+def exhaustive(set_1, set_2, modo, threshold):
+    def faltando(items, others):
+        matrix = score_matrix(items, others, score_cutoff=threshold)
+        return [item for item, linha in zip(items, matrix) if not any(score >= threshold for score in linha)]
+
+    match modo:
+        case 'somente_proposta':
+            return faltando(set_1, set_2)
+        case 'somente_documento':
+            return faltando(set_2, set_1)
+        case 'interseccao_completa':
+            return faltando(set_1, set_2) + faltando(set_2, set_1)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--small', type=int, default=300)
+    args.add_argument('--large', type=int, nargs='*', default=[2000, 5000])
+    args.add_argument('--threshold', type=float, default=90)
+    args.add_argument('--seeds', type=int, default=5)
+    args.add_argument('--min-recall', type=float, default=0.999)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+
+    print(f'paridade: {args.seeds} rols de {args.small} nomes, limiar {args.threshold:g}')
+    print(f'{"modo":<24}{"faltantes":>10}{"exaustivo":>10}{"a mais":>8}{"a menos":>8}{"recall":>8}')
+    totais = {modo: [0, 0, 0, 0, 0] for modo in MODOS}
+    exaustivo_s = pares = 0
+    for seed in range(args.seed, args.seed + args.seeds):
+        proposta, documento = listas(args.small, seed)
+        start = time.perf_counter()
+        esperados = {modo: exhaustive(proposta, documento, modo, args.threshold) for modo in MODOS}
+        exaustivo_s += time.perf_counter() - start
+        # Os dois sentidos da intersecção contam em dobro
+        pares += 4 * len(proposta) * len(documento)
+        for modo in MODOS:
+            faltantes = compare_sets(proposta, documento, modo, args.threshold)
+            nomes = {'somente_proposta': len(proposta), 'somente_documento': len(documento)}.get(
+                modo, len(proposta) + len(documento))
+            total = totais[modo]
+            total[0] += len(faltantes)
+            total[1] += len(esperados[modo])
+            total[2] += len(set(faltantes) - set(esperados[modo]))
+            total[3] += len(set(esperados[modo]) - set(faltantes))
+            total[4] += nomes - len(esperados[modo])
+    por_par = exaustivo_s / pares
+    ok = True
+    for modo, (faltantes, esperados, a_mais, a_menos, encontrados) in totais.items():
+        recall = 1 - a_mais / encontrados if encontrados else 1.0
+        ok &= not a_menos and recall >= args.min_recall
+        print(f'{modo:<24}{faltantes:>10}{esperados:>10}{a_mais:>8}{a_menos:>8}{recall:>8.4f}')
+
+    print()
+    print(f'{"tamanho":>8}{"compare_sets":>15}{"outro rol":>12}{"exaustivo (estimado)":>22}')
+    for size in args.large:
+        proposta, documento = listas(size, args.seed)
+        outro = roster(size, seed=args.seed + 1000)
+        start = time.perf_counter()
+        compare_sets(proposta, documento, 'interseccao_completa', args.threshold)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        compare_sets(proposta, outro, 'interseccao_completa', args.threshold)
+        outro_s = time.perf_counter() - start
+        estimado = por_par * 2 * len(proposta) * len(documento)
+        print(f'{size:>8}{elapsed:>14.1f}s{outro_s:>11.1f}s{estimado:>21.0f}s')
+
+    print(('OK    ' if ok else 'FALHA ') + f'nenhum faltante a menos; recall >= {args.min_recall:g}')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
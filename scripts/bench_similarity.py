@@ -0,0 +1,173 @@
+"""
+Suíte de benchmarks da camada de similaridade de textos, com resultados em JSON para comparar
+versões.
+
+Mede, para cada tamanho de carga gerada pelo synthetic_corpus (semente fixa):
+- jaro_winkler, find_abbreviation_match e norm_score do Distances, em pares nome x variante
+  (ou outro nome), e norm_score com cutoff=90 (o limiar usual dos validadores);
+- SimilarTextValidator.validate com as métricas 'sequential' e 'jaccard', de um texto de
+  documento contra um corpus de N textos;
+- Validacao_endereco.validar_endereco, em pares endereço x endereço extraído.
+
+Cada rodada começa com os caches de text_normalization limpos; o resultado de cada benchmark é
+o tempo por operação da melhor rodada (e a mediana). Com --output os resultados são gravados em
+JSON; com --compare, comparados com um JSON anterior, e o script termina com erro se algum
+benchmark ficar mais lento do que --tolerance vezes o anterior. A comparação só faz sentido
+entre execuções na mesma máquina; em máquinas compartilhadas, use mais rodadas (--repeat).
+
+Uso: python scripts/bench_similarity.py [--sizes 100 1000] [--repeat 3] [--seed 7]
+                                        [--only norm_score ...] [--output atual.json]
+                                        [--compare anterior.json] [--tolerance 1.2]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import text_normalization
+from Distances import distances
+from fraud_tools import SimilarTextValidator
+from synthetic_corpus import endereco, endereco_ocr, nome, razao_social, texto_documento, variante
+from validacao_endereco import Validacao_endereco
+
+
+def name_pairs(rng, size):
+    pares = []
+    for _ in range(size):
+        atual = nome(rng) if rng.random() < 0.8 else razao_social(rng)
+        pares.append((atual, variante(rng, atual) if rng.random() < 0.7 else nome(rng)))
+    return pares
+
+
+def bench_jaro_winkler(rng, size):
+    pares = name_pairs(rng, size)
+    return size, lambda: [distances(a, b).jaro_winkler_similarity() for a, b in pares]
+
+
+def bench_find_abbreviation_match(rng, size):
+    pares = name_pairs(rng, size)
+    return size, lambda: [distances(a, b).find_abbreviation_match() for a, b in pares]
+
+
+def bench_norm_score(rng, size):
+    pares = name_pairs(rng, size)
+    return size, lambda: [distances(a, b).norm_score() for a, b in pares]
+
+
+def bench_norm_score_cutoff(rng, size):
+    pares = name_pairs(rng, size)
+    return size, lambda: [distances(a, b).norm_score(cutoff=90) for a, b in pares]
+
+
+def _similar_text(rng, size, metric):
+    corpus = [{'nome': f'doc_{i}', 'extracted_text': texto_documento(rng)} for i in range(size)]
+    validator = SimilarTextValidator(corpus)
+    # O documento consultado é a cópia com ruído de um do corpus, para haver alertas
+    consulta = {'extracted_text': variante(rng, rng.choice(corpus)['extracted_text'])}
+    return 1, lambda: validator.validate(consulta, metric=metric)
+
+
+def bench_similar_text_sequential(rng, size):
+    return _similar_text(rng, size, 'sequential')
+
+
+def bench_similar_text_jaccard(rng, size):
+    return _similar_text(rng, size, 'jaccard')
+
+
+def bench_validar_endereco(rng, size):
+    pares = []
+    for _ in range(size):
+        original = endereco(rng)
+        pares.append((original, endereco_ocr(rng, original) if rng.random() < 0.8 else endereco(rng)))
+    return size, lambda: [Validacao_endereco(a, b).validar_endereco() for a, b in pares]
+
+
+BENCHMARKS = {
+    'jaro_winkler': bench_jaro_winkler,
+    'find_abbreviation_match': bench_find_abbreviation_match,
+    'norm_score': bench_norm_score,
+    'norm_score_cutoff': bench_norm_score_cutoff,
+    'similar_text_sequential': bench_similar_text_sequential,
+    'similar_text_jaccard': bench_similar_text_jaccard,
+    'validar_endereco': bench_validar_endereco,
+}
+
+
+def clear_caches():
+    for fn in (text_normalization.fold, text_normalization.tokens, text_normalization.content_tokens):
+        fn.cache_clear()
+
+
+def run(name, size, seed, repeat):
+    operacoes, fn = BENCHMARKS[name](random.Random(f'{seed}:{name}:{size}'), size)
+    fn()  # aquecimento: imports e dados do nltk
+    tempos = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - start) / operacoes * 1e6)
+    return {'us_per_op': min(tempos), 'median_us': statistics.median(tempos), 'ops': operacoes, 'repeat': repeat}
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    args.add_argument('--repeat', type=int, default=3)
+    args.add_argument('--seed', type=int, default=7)
+    args.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    args.add_argument('--output')
+    args.add_argument('--compare')
+    args.add_argument('--tolerance', type=float, default=1.2)
+    args = args.parse_args()
+
+    anterior = None
+    if args.compare:
+        with open(args.compare) as f:
+            anterior = json.load(f)['results']
+
+    results = {}
+    regressoes = []
+    print(f'{"benchmark":<36}{"us/op":>12}{"mediana":>12}{"anterior":>12}{"razão":>8}')
+    for name in args.only:
+        for size in args.sizes:
+            chave = f'{name}[{size}]'
+            results[chave] = atual = run(name, size, args.seed, args.repeat)
+            linha = f'{chave:<36}{atual["us_per_op"]:>12.1f}{atual["median_us"]:>12.1f}'
+            if anterior and chave in anterior:
+                razao = atual['us_per_op'] / anterior[chave]['us_per_op']
+                linha += f'{anterior[chave]["us_per_op"]:>12.1f}{razao:>7.2f}x'
+                if razao > args.tolerance:
+                    regressoes.append(chave)
+                    linha += '  <- regressão'
+            print(linha, flush=True)
+
+    if args.output:
+        meta = {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'sizes': args.sizes,
+            'repeat': args.repeat,
+            'text_tokenizer': text_normalization.TEXT_TOKENIZER,
+        }
+        with open(args.output, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+        print(f'resultados gravados em {args.output}')
+
+    if regressoes:
+        print(f'FALHA {len(regressoes)} benchmark(s) mais lentos que {args.tolerance:g}x o anterior: {", ".join(regressoes)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Gerador determinístico (com semente) de dados sintéticos para os benchmarks: nomes de pessoas,
+razões sociais, endereços, textos de documentos e ruído de OCR/digitação.
+
+Uso nos scripts: from synthetic_corpus import nome, ruido, ...
+"""
+import random
+
+NOMES = ['JOAO', 'MARIA', 'JOSE', 'ANA', 'FRANCISCO', 'ANTONIA', 'CARLOS', 'PAULA', 'LUIZ', 'FERNANDA',
+         'CONCEIÇÃO', 'SEBASTIÃO', 'RAIMUNDO', 'FRANCISCA', 'PEDRO', 'ADRIANA', 'MARCOS', 'JULIANA', 'RAFAEL',
+         'PATRÍCIA', 'LUCAS', 'ALINE', 'GABRIEL', 'SANDRA', 'MATHEUS', 'CAMILA', 'THIAGO', 'VANESSA', 'ANDRÉ', 'LETÍCIA']
+NOMES_MEIO = ['APARECIDA', 'DE FATIMA', 'HENRIQUE', 'EDUARDO', 'CRISTINA', 'LUIZA', 'ANTONIO', 'VITORIA', 'AUGUSTO']
+SOBRENOMES = ['DA SILVA', 'DOS SANTOS', 'DE OLIVEIRA', 'SOUZA', 'PEREIRA', 'FERREIRA', 'RODRIGUES', 'ALVES', 'LIMA',
+              'GONÇALVES', 'GOMES', 'RIBEIRO', 'CARVALHO', 'DE ALMEIDA', 'LOPES', 'SOARES', 'FERNANDES', 'VIEIRA',
+              'BARBOSA', 'ROCHA', 'DIAS', 'NASCIMENTO', 'ANDRADE', 'MOREIRA', 'NUNES', 'MARQUES', 'MACHADO', 'MENDES',
+              'FREITAS', 'CARDOSO', 'RAMOS', 'TEIXEIRA', 'CAVALCANTI', 'ARAÚJO', 'CASTRO', 'MONTEIRO', 'CORRÊA']
+RAMOS_ATIVIDADE = ['COMERCIO', 'SERVICOS', 'TRANSPORTES', 'CONSTRUCOES', 'ALIMENTOS', 'TECNOLOGIA', 'CONSULTORIA',
+                   'DISTRIBUIDORA', 'INDUSTRIA', 'AGROPECUARIA']
+NATUREZAS = ['LTDA', 'ME', 'EIRELI', 'S.A.', 'LTDA ME', 'EPP']
+LOGRADOUROS = ['RUA', 'AVENIDA', 'TRAVESSA', 'ALAMEDA', 'ESTRADA', 'PRAÇA']
+BAIRROS = ['CENTRO', 'BELA VISTA', 'JARDIM AMÉRICA', 'VILA MARIANA', 'BOA VIAGEM', 'SAVASSI', 'MOOCA',
+           'COPACABANA', 'PARQUE SÃO JORGE', 'SANTA CECÍLIA', 'ALDEOTA', 'BARRA DA TIJUCA']
+CIDADES = [('SÃO PAULO', 'SP'), ('RIO DE JANEIRO', 'RJ'), ('BELO HORIZONTE', 'MG'), ('RECIFE', 'PE'),
+           ('FORTALEZA', 'CE'), ('PORTO ALEGRE', 'RS'), ('CURITIBA', 'PR'), ('SALVADOR', 'BA'), ('GOIÂNIA', 'GO')]
+COMPLEMENTOS = ['', 'APTO 12', 'APARTAMENTO 101', 'AP. 32 BLOCO B', 'CASA 2', 'SALA 1504', 'FUNDOS', 'LOJA 3']
+
+
+def nome(rng):
+    """
+    Nome completo: primeiro nome, às vezes um nome do meio, e de um a três sobrenomes.
+    """
+    partes = [rng.choice(NOMES)]
+    if rng.random() < 0.4:
+        partes.append(rng.choice(NOMES_MEIO))
+    partes.extend(rng.sample(SOBRENOMES, rng.randint(1, 3)))
+    return ' '.join(partes)
+
+
+def razao_social(rng):
+    sufixo = rng.choice(SOBRENOMES) if rng.random() < 0.5 else rng.choice(NOMES)
+    return f'{sufixo} {rng.choice(RAMOS_ATIVIDADE)} {rng.choice(NATUREZAS)}'
+
+
+def endereco(rng):
+    """
+    Endereço no formato do Endereco de validacao_endereco.
+    """
+    cidade, estado = rng.choice(CIDADES)
+    return {
+        'cep': f'{rng.randint(1000, 99999):05d}-{rng.randint(0, 999):03d}',
+        'rua': f'{rng.choice(LOGRADOUROS)} {nome(rng) if rng.random() < 0.7 else rng.choice(BAIRROS)}',
+        'numero': str(rng.randint(1, 4000)),
+        'complemento': rng.choice(COMPLEMENTOS),
+        'bairro': rng.choice(BAIRROS),
+        'cidade': cidade,
+        'estado': estado,
+    }
+
+
+def endereco_ocr(rng, original):
+    """
+    O mesmo endereço como extraído de um comprovante: ruído nos textos, às vezes abreviado.
+    """
+    extraido = dict(original)
+    for campo in ('rua', 'bairro', 'cidade', 'complemento'):
+        extraido[campo] = ruido(rng, extraido[campo], max_erros=1)
+    if rng.random() < 0.3:
+        extraido['rua'] = extraido['rua'].replace('AVENIDA', 'AV.').replace('RUA', 'R.')
+    if rng.random() < 0.1:
+        extraido['numero'] = 'Not Found'
+    return extraido
+
+
+def texto_documento(rng, linhas=8):
+    """
+    Texto corrido de um documento como sai do OCR: nomes, razão social, endereço, números.
+    """
+    partes = []
+    for _ in range(linhas):
+        escolha = rng.random()
+        if escolha < 0.3:
+            partes.append(f'NOME: {nome(rng)}')
+        elif escolha < 0.5:
+            partes.append(f'EMPRESA {razao_social(rng)} CNPJ {rng.randint(10**13, 10**14 - 1)}')
+        elif escolha < 0.8:
+            atual = endereco(rng)
+            partes.append(f"{atual['rua']}, {atual['numero']} - {atual['bairro']}, {atual['cidade']}/{atual['estado']}")
+        else:
+            partes.append(f'DATA {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(1990, 2025)} '
+                          f'VALOR R$ {rng.randint(10, 99999)},{rng.randint(0, 99):02d}')
+    return ruido(rng, '\n'.join(partes), max_erros=len(partes))
+
+
+def ruido(rng, texto, max_erros=2):
+    """
+    Erros típicos de OCR/digitação: letra removida, trocada ou em minúscula.
+    """
+    chars = list(texto)
+    for _ in range(rng.randint(0, max_erros)):
+        if not chars:
+            break
+        i = rng.randrange(len(chars))
+        chars[i] = rng.choice(['', chars[i].lower(), 'A', 'O', 'I', 'E'])
+    return ''.join(chars)
+
+
+def abreviado(rng, texto):
+    """
+    Abrevia um dos nomes do meio (ex.: 'MARIA APARECIDA DA SILVA' -> 'MARIA A. DA SILVA').
+    """
+    partes = texto.split()
+    meio = [i for i in range(1, len(partes) - 1) if len(partes[i]) > 3]
+    if meio:
+        i = rng.choice(meio)
+        partes[i] = partes[i][0] + '.'
+    return ' '.join(partes)
+
+
+def variante(rng, texto):
+    """
+    O mesmo nome como costuma aparecer em outro documento: com ruído e/ou abreviado.
+    """
+    if rng.random() < 0.3:
+        texto = abreviado(rng, texto)
+    return ruido(rng, texto)
+
+
+def roster(count, seed=0, unique=True):
+    """
+    Lista de count nomes (distintos, se unique) gerada com a semente informada.
+    """
+    rng = random.Random(seed)
+    nomes = []
+    vistos = set()
+    while len(nomes) < count:
+        atual = nome(rng)
+        if unique and atual in vistos:
+            continue
+        vistos.add(atual)
+        nomes.append(atual)
+    return nomes
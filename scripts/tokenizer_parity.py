@@ -0,0 +1,98 @@
+"""
+Paridade e custo do tokenizador por regex de text_normalization contra o word_tokenize do nltk.
+
+Gera um corpus sintético (synthetic_corpus) com as entradas dos dois pontos que tokenizam:
+- Distances.find_abbreviation_match: nomes e razões sociais sem acento e em minúsculas (fold),
+  com abreviações, ruído de OCR e pontuação;
+- SimilarTextValidator.preprocess_text: textos em minúsculas só com palavras e espaços;
+e, com --fuzz, textos com pontuação aleatória inserida para forçar os casos de borda.
+
+Para cada texto compara regex_word_tokenize com nltk_word_tokenize (português e inglês), mostra
+a fração resolvida só pela regex (o restante é repassado ao nltk) e o tempo de cada um.
+
+Uso: python scripts/tokenizer_parity.py [--size 5000] [--fuzz 5000] [--seed 7]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from text_normalization import fold, nltk_word_tokenize, regex_tokenizable, regex_word_tokenize
+from synthetic_corpus import abreviado, nome, razao_social, ruido, variante
+
+PONTUACAO = list('.,:;@#$%&/-+=()[]{}<>\'"?!*`') + ['..', '--', ' . ', ', ', ': ']
+
+
+def corpus(size, rng):
+    textos = []
+    for _ in range(size):
+        escolha = rng.random()
+        if escolha < 0.4:
+            texto = variante(rng, nome(rng))
+        elif escolha < 0.6:
+            texto = abreviado(rng, nome(rng))
+        elif escolha < 0.8:
+            texto = ruido(rng, razao_social(rng))
+        else:
+            # Como preprocess_text deixa o texto: minúsculo, só palavras separadas por espaço
+            texto = ' '.join(variante(rng, nome(rng)) for _ in range(rng.randint(1, 4))).lower()
+            textos.append(re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', texto)).strip())
+            continue
+        textos.append(fold(texto))
+    return textos
+
+
+def fuzz(size, rng, base):
+    textos = []
+    for _ in range(size):
+        chars = list(rng.choice(base))
+        for _ in range(rng.randint(1, 3)):
+            chars.insert(rng.randint(0, len(chars)), rng.choice(PONTUACAO))
+        textos.append(''.join(chars))
+    return textos
+
+
+def timed(fn, textos):
+    start = time.perf_counter()
+    for texto in textos:
+        fn(texto)
+    return (time.perf_counter() - start) / len(textos) * 1e6
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--size', type=int, default=5000)
+    args.add_argument('--fuzz', type=int, default=5000)
+    args.add_argument('--seed', type=int, default=7)
+    args = args.parse_args()
+    rng = random.Random(args.seed)
+
+    conjuntos = {'corpus': corpus(args.size, rng)}
+    if args.fuzz:
+        conjuntos['fuzz'] = fuzz(args.fuzz, rng, conjuntos['corpus'])
+    nltk_word_tokenize('aquecimento')
+
+    ok = True
+    print(f'{"conjunto":<10}{"textos":>8}{"só regex":>10}{"divergências":>14}{"nltk us":>10}{"regex us":>10}')
+    for label, textos in conjuntos.items():
+        divergencias = [(texto, language) for texto in textos for language in ('portuguese', 'english')
+                        if regex_word_tokenize(texto, language) != nltk_word_tokenize(texto, language)]
+        rapidos = sum(map(regex_tokenizable, textos)) / len(textos)
+        nltk_us = timed(lambda t: nltk_word_tokenize(t, 'portuguese'), textos)
+        regex_us = timed(lambda t: regex_word_tokenize(t, 'portuguese'), textos)
+        print(f'{label:<10}{len(textos):>8}{rapidos:>10.1%}{len(divergencias):>14}{nltk_us:>10.1f}{regex_us:>10.1f}')
+        for texto, language in divergencias[:10]:
+            print(f'    {texto!r} ({language}): nltk={nltk_word_tokenize(texto, language)} '
+                  f'regex={regex_word_tokenize(texto, language)}')
+        ok &= not divergencias
+
+    print(('OK    ' if ok else 'FALHA ') + 'tokens idênticos aos do nltk')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,17 @@
 from dataclasses import dataclass
-from ValidateDocument import ValidateDocument, validate
+from ValidateDocument import ValidateDocument, validate, accesses
 from Distances import distances
 from typing import Optional
 import re
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
+from normalized_fields import parse_date
 
 def interdoc(method):
     method._validation_type = 'interdoc'
     return method
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class Termo_guarda:
     nome_crianca: Optional[str] = None
     nome_primeiro_guardiao: Optional[str] = None
@@ -24,8 +23,7 @@ class Termo_guarda:
     is_provisorio: Optional[str] = None
     nome_titular: Optional[str] = None  
 
-@dataclass_json(undefined=Undefined.EXCLUDE)  
-@dataclass
+@document_model
 class Termo_guarda_sign:
     ha_logo_tribunal: str
     descricao_logo: Optional[str] = None
@@ -44,12 +42,12 @@ class Termo_guarda_sign_validations:
 class termo_guarda_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         self.message_type = message_type
-        self.cartao_proposta = Termo_guarda(**cartao_proposta)
+        self.cartao_proposta = Termo_guarda.from_dict(cartao_proposta)
 
         if (message_type == "signature"): 
-            self.dados_extraidos = Termo_guarda_sign(**dados_extraidos)
+            self.dados_extraidos = Termo_guarda_sign.from_dict(dados_extraidos)
         else:
-            self.dados_extraidos = Termo_guarda(**dados_extraidos)
+            self.dados_extraidos = Termo_guarda.from_dict(dados_extraidos)
         
     def set_validate_functions_list(self):
         return list(Termo_guarda_validations.__annotations__.keys())
@@ -74,7 +72,11 @@ class termo_guarda_validate(ValidateDocument):
             "trecho_encontrado": descricao
         }
         
-    @validate    
+    @validate
+    @accesses(
+        reads={'cartao_proposta.nome_titular', 'dados_extraidos.nome_primeiro_guardiao', 'dados_extraidos.nome_segundo_guardiao'},
+        writes={'dados_extraidos.nome_titular'}
+    )
     def validacao_nome_titular(self, limiar=90):
         """
         Valida se o nome do titular do cartão proposta corresponde ao nome de um dos guardiões extraídos da certidão.
@@ -118,8 +120,9 @@ class termo_guarda_validate(ValidateDocument):
         - TRUE: Se o documento não for provisório, ou se a data de expedição for nos últimos 12 meses;
         - FALSE: Caso contrário.
         """
+        from dateutil.relativedelta import relativedelta
         now = datetime.now().date()
-        extracted_dispatch_date = datetime.strptime(self.dados_extraidos.data_expedicao, "%d-%m-%Y").date()
+        extracted_dispatch_date = parse_date(self.dados_extraidos.data_expedicao, "%d-%m-%Y").date()
         data_expedicao = extracted_dispatch_date.strftime('%Y-%m-%d')
         if self.dados_extraidos.is_provisorio in {'False', 'false', False, 'Falso', 'falso', 'FALSO', 'FALSE'}:
             return {'valid': True, 'percent_match': 100, 'trecho_procurado': '', 'trecho_encontrado': 'termo de guarda permanente'}
@@ -2,12 +2,12 @@ import re
 import datetime
 from dataclasses import dataclass
 from typing import Optional, List, Dict
-from dataclasses_json import dataclass_json, Undefined
+from models import document_model
 from ValidateDocument import ValidateDocument, validate
 from Distances import distances
+from normalized_fields import parse_date
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@document_model
 class TermoReducaoCarencia:
     operadora: str
     produto: str
@@ -27,8 +27,8 @@ class TermoReducaoCarenciaValidations:
 class termo_reducao_carencia_validate(ValidateDocument):
     def __init__(self, cartao_proposta, dados_extraidos, message_type):
         self.message_type = message_type
-        self.cartao_proposta = TermoReducaoCarencia(**cartao_proposta)
-        self.dados_extraidos = TermoReducaoCarencia(**dados_extraidos)
+        self.cartao_proposta = TermoReducaoCarencia.from_dict(cartao_proposta)
+        self.dados_extraidos = TermoReducaoCarencia.from_dict(dados_extraidos)
 
     def set_validate_functions_list(self):
         return list(TermoReducaoCarenciaValidations.__annotations__.keys())
@@ -52,9 +52,9 @@ class termo_reducao_carencia_validate(ValidateDocument):
             return 0
         try:
             if re.match(r"\d{2}/\d{4}", vig):
-                dt = datetime.datetime.strptime(vig, "%m/%Y")
+                dt = parse_date(vig, "%m/%Y")
             elif re.match(r"\d{2}-\d{2}-\d{4}", vig):
-                dt = datetime.datetime.strptime(vig, "%d-%m-%Y")
+                dt = parse_date(vig, "%d-%m-%Y")
             else:
                 return 0
             hoje = datetime.datetime.now()
@@ -0,0 +1,13 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Variáveis lidas no import de ValidateDocument/mongodb_connections/lambda_function
+for key, value in {
+    'UUID': 'test', 'SQS_RETRY_QUEUE': 'test', 'AGREGADOR': 'test', 'SIMILARITY_LIST': 'ctps|comprovante_residencia',
+    'DOCUMENT_ID': 'test', 'DOCUMENT_LABEL': 'test', 'REGION_NAME': 'us-east-1', 'SECRET_NAME': 'test',
+    'INFORMATION': 'test', 'DELAY_SECONDS': '2', 'FOLDER_NAME': 'test', 'S3_BUCKET': 'test',
+    'METRICS_ENABLED': 'false',
+}.items():
+    os.environ.setdefault(key, value)
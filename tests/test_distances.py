@@ -0,0 +1,36 @@
+"""
+Scores em lote (cdist/score_many) e o gerador iter_norm_scores contra distances().norm_score().
+"""
+import pytest
+
+from Distances import cdist, distances, iter_norm_scores, score_many
+
+NOMES = ['MARIA DA SILVA', 'MARIA DA SILVA SANTOS', 'MARIA DA SILVA', 'JOAO PEREIRA', 'JOÃO PEREIRA',
+         'FRANCISCA ROCHA', 'FRAECISCA ROHA', 'DA SILVA', 'DE', '', 'ANA', 'ACME COMERCIO LTDA']
+
+
+def test_cdist_matches_norm_score():
+    matriz = cdist(NOMES, NOMES)
+    esperado = [[distances(a, b).norm_score() for b in NOMES] for a in NOMES]
+
+    assert matriz.tolist() == esperado
+
+
+def test_score_many_cutoff_zeroes_below():
+    esperado = [distances('MARIA DA SILVA', b).norm_score() for b in NOMES]
+
+    assert score_many('MARIA DA SILVA', NOMES, score_cutoff=90).tolist() == [s if s >= 90 else 0 for s in esperado]
+
+
+def test_cdist_with_empty_list():
+    assert cdist([], NOMES).shape == (0, len(NOMES))
+    assert cdist(NOMES, []).shape == (len(NOMES), 0)
+
+
+def test_iter_norm_scores_is_lazy():
+    scores = iter_norm_scores('MARIA DA SILVA', ['MARIA DA SILVA', None])
+
+    assert next(scores) == 100
+    # O None só é pontuado (e falha) se o laço chegar nele
+    with pytest.raises(AttributeError):
+        next(scores)
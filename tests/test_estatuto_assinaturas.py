@@ -0,0 +1,39 @@
+"""
+Assinaturas em conjunto do estatuto social (estatuto_social_validate.verificar_assinaturas).
+"""
+from estatuto_social_validate import estatuto_social_validate
+
+CARGOS_ELEITOS = {'Diretor': ['MARIA DA SILVA', 'JOAO PEREIRA'], 'Presidente': 'ANA SOUZA',
+                  'Conselheiro': 'CARLOS LIMA'}
+
+
+def verificar(regra, assinantes):
+    validator = estatuto_social_validate.__new__(estatuto_social_validate)
+    return validator.verificar_assinaturas(CARGOS_ELEITOS, regra, assinantes)
+
+
+def test_each_role_gets_a_distinct_signer():
+    # O primeiro assinante serve aos dois cargos; a distribuição não pode gastá-lo no Diretor
+    valido, nomes = verificar(['Diretor', 'Presidente'], ['ANA SOUZA', 'JOAO PEREIRA'])
+
+    assert valido is True
+    assert nomes == ['JOAO PEREIRA', 'ANA SOUZA']
+
+
+def test_failed_rule_keeps_roles_before_the_first_failure():
+    # O Conselheiro assinou, mas vem depois do Presidente, que não assinou
+    valido, nomes = verificar(['Diretor', 'Presidente', 'Conselheiro'], ['MARIA DA SILVA', 'CARLOS LIMA'])
+
+    assert valido is False
+    assert nomes == ['MARIA DA SILVA']
+
+
+def test_missing_role_keeps_roles_before_it():
+    valido, nomes = verificar(['Diretor', 'Tesoureiro', 'Conselheiro'], ['MARIA DA SILVA', 'CARLOS LIMA'])
+
+    assert valido is False
+    assert nomes == ['MARIA DA SILVA']
+
+
+def test_first_role_failing_returns_no_names():
+    assert verificar(['Presidente', 'Diretor'], ['MARIA DA SILVA']) == (False, [])
@@ -0,0 +1,186 @@
+"""
+Injeção de falhas no Mongo: circuit breaker, reenfileiramento com backoff e desistência.
+
+A conexão real é trocada por um dublê (mesma classe MongoDBConnections, com as coleções em
+memória) que pode ser colocado em modo lento/falho.
+"""
+import copy
+import time
+
+import pytest
+
+import ValidateDocument
+import lambda_function
+import mongodb_connections
+from circuit_breaker import CircuitBreaker
+from mei_validate import mei_validate
+
+LATENCY = 0.05
+
+PROPOSTA = {
+    'razao_social': 'ACME COMERCIO LTDA', 'cnpj': '12.345.678/0001-90',
+    'endereco_empresa': {'cep': '01310-100', 'rua': 'AVENIDA PAULISTA', 'numero': '1000', 'complemento': 'SALA 1',
+                         'bairro': 'BELA VISTA', 'cidade': 'SAO PAULO', 'estado': 'SP'},
+    'nome': 'JOAO DA SILVA', 'cpf': '123.456.789-00', 'situacao_cadastral': 'ATIVA', 'numero_cnae': '4751-2/01',
+    'data_situacao_cadastral': '01-01-2020', 'data_abertura_empresa': '01-01-2020',
+}
+
+BENEFICIARIO = {
+    'id': 'uuid-1', 'tipo': 'EMPRESA', 'agregador': 'agr-1',
+    'documentos': [
+        {'document_type': 'RG', 'status': 'OK', 'label': 'rg_1',
+         'extracted_information': {'nome': 'JOAO DA SILVA', 'cpf': '12345678900'}},
+        {'document_type': 'CNPJ', 'status': 'OK', 'label': 'cnpj_1',
+         'extracted_information': {'numero_cnae': '4751-2/01', 'data_situacao_cadastral': '01-01-2020',
+                                   'data_abertura': '01-01-2020'}},
+    ],
+}
+
+MESSAGE = {'document_type': 'MEI', 'message_type': 'regras', 'cartao_proposta': PROPOSTA,
+           'document_information': PROPOSTA, 'uuid': 'uuid-1', 'document_id': 'doc-1', 'JobId': 'job-1'}
+
+
+class FaultState:
+    failing = False
+    calls = 0
+
+
+class FakeCollection:
+
+    def _maybe_fail(self):
+        FaultState.calls += 1
+        if FaultState.failing:
+            time.sleep(LATENCY)
+            raise TimeoutError('dublê: timeout de seleção de servidor')
+
+    def find_one(self, query, projection=None):
+        self._maybe_fail()
+        if projection and 'documentos' in projection:
+            doc_type = projection['documentos']['$elemMatch']['document_type']['$eq']
+            docs = [d for d in BENEFICIARIO['documentos'] if d['document_type'] == doc_type]
+            return {'documentos': docs} if docs else {}
+        return BENEFICIARIO
+
+    def find(self, query):
+        self._maybe_fail()
+        return [BENEFICIARIO]
+
+    def update_one(self, query, update):
+        self._maybe_fail()
+
+
+class StandInMongo(mongodb_connections.MongoDBConnections):
+
+    def __init__(self):
+        self.mdb = {'beneficiarios': FakeCollection()}
+        self.reads = 0
+
+
+class FakeSQS:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, **kwargs):
+        self.sent.append(kwargs)
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = mongodb_connections.mongo_breaker
+    monkeypatch.setattr(breaker, 'reset_timeout', 0.2)
+    monkeypatch.setattr(ValidateDocument, 'MongoDBConnections', StandInMongo)
+    monkeypatch.setattr(lambda_function, 'MongoDBConnections', StandInMongo)
+    monkeypatch.setattr(lambda_function, 'IDEMPOTENCY_ENABLED', False)
+    FaultState.failing = False
+    FaultState.calls = 0
+    breaker.record_success()
+    yield breaker
+    FaultState.failing = False
+    breaker.record_success()
+
+
+@pytest.fixture
+def sqs(monkeypatch):
+    sqs = FakeSQS()
+    monkeypatch.setattr(lambda_function.boto3, 'client', lambda *args, **kwargs: sqs)
+    return sqs
+
+
+def run_validation():
+    output = mei_validate(PROPOSTA, dict(PROPOSTA), 'regras').validate()
+    return {out['regras_subscricao_errors'] for name, out in output.items() if name in {'validacao_nome', 'validacao_cnae'}}
+
+
+def open_circuit():
+    FaultState.failing = True
+    assert run_validation() == {'SERVICO_INDISPONIVEL'}
+
+
+def test_healthy_mongo(breaker):
+    assert run_validation() == {'OK'}
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_timeouts_open_circuit_and_fail_fast(breaker):
+    open_circuit()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    FaultState.calls = 0
+    start = time.perf_counter()
+    assert run_validation() == {'SERVICO_INDISPONIVEL'}
+    assert FaultState.calls == 0
+    assert time.perf_counter() - start < LATENCY
+
+
+def test_half_open_probe_reopens_then_recovers(breaker):
+    open_circuit()
+    time.sleep(breaker.reset_timeout)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert run_validation() == {'SERVICO_INDISPONIVEL'}
+    assert breaker.state == CircuitBreaker.OPEN
+
+    FaultState.failing = False
+    time.sleep(breaker.reset_timeout)
+    assert run_validation() == {'OK'}
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_circuit_requeues_unmodified_continuation(breaker, sqs):
+    open_circuit()
+    continuacao = dict(MESSAGE, validacoes_pendentes=['validacao_cnae'],
+                       resultados_parciais={'validacao_nome': {'valid': True, 'regras_subscricao_errors': 'OK'}})
+
+    assert lambda_function.process_document(copy.deepcopy(continuacao)) is None
+
+    assert len(sqs.sent) == 1
+    assert sqs.sent[0]['DelaySeconds'] >= 1
+    reenviada = lambda_function.json.loads(sqs.sent[0]['MessageBody'])
+    assert reenviada == dict(continuacao, tentativa_indisponivel=1)
+
+
+def test_gives_up_after_max_requeues(breaker, sqs):
+    open_circuit()
+    message = dict(MESSAGE, tentativa_indisponivel=lambda_function.MAX_UNAVAILABLE_REQUEUES)
+
+    with pytest.raises(lambda_function.MongoUnavailableError):
+        lambda_function.process_document(message)
+    assert not sqs.sent
+
+
+def test_unavailable_on_write_requeues_original(breaker, sqs, monkeypatch):
+    validate = mei_validate.validate
+
+    def validate_then_fail(self, *args, **kwargs):
+        # Validação com o Mongo saudável; ele cai antes da gravação dos resultados
+        output = validate(self, *args, **kwargs)
+        FaultState.failing = True
+        return output
+
+    monkeypatch.setattr(mei_validate, 'validate', validate_then_fail)
+
+    assert lambda_function.process_document(copy.deepcopy(MESSAGE)) is None
+
+    assert len(sqs.sent) == 1
+    assert sqs.sent[0]['DelaySeconds'] >= 1
+    assert lambda_function.json.loads(sqs.sent[0]['MessageBody']) == dict(MESSAGE, tentativa_indisponivel=1)
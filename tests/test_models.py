@@ -0,0 +1,33 @@
+"""
+Modelos de documento (models.document_model): endereços aninhados convertidos no acesso.
+"""
+from ctps_validate import Cpts
+from validacao_endereco import Endereco
+
+ENDERECO = {'cep': '01310-100', 'rua': 'AVENIDA PAULISTA', 'numero': '1000', 'complemento': 'SALA 1',
+            'bairro': 'BELA VISTA', 'cidade': 'SAO PAULO', 'estado': 'SP'}
+
+
+def cpts(endereco):
+    return Cpts.from_dict({**{campo: 'x' for campo in Cpts._fields}, 'endereco_empresa': endereco, 'extra': 1})
+
+
+def test_nested_address_is_converted_on_first_access():
+    modelo = cpts(ENDERECO)
+    assert modelo._endereco_empresa is ENDERECO
+
+    endereco = modelo.endereco_empresa
+    assert isinstance(endereco, Endereco)
+    assert endereco.to_dict() == ENDERECO
+    assert modelo.endereco_empresa is endereco
+    assert modelo.to_dict()['endereco_empresa'] == ENDERECO
+
+
+def test_incomplete_address_stays_dict():
+    assert cpts({'cep': '01310-100'}).endereco_empresa == {'cep': '01310-100'}
+
+
+def test_constructor_converts_too():
+    modelo = Cpts(**{campo: 'x' for campo in Cpts._fields} | {'endereco_empresa': ENDERECO})
+    assert isinstance(modelo.endereco_empresa, Endereco)
+    assert modelo == cpts(ENDERECO)
@@ -0,0 +1,46 @@
+"""
+Cache de assinaturas MinHash (near_duplicates.signature): chave pelo digest do texto, LRU limitado.
+"""
+import pytest
+
+import near_duplicates
+
+TEXTO = 'CARTEIRA DE TRABALHO NOME JOAO DA SILVA CPF 123.456.789-00 ADMISSAO 01/02/2020'
+
+
+@pytest.fixture(autouse=True)
+def cache_vazio(monkeypatch):
+    monkeypatch.setattr(near_duplicates, 'NEAR_DUPLICATES_CACHE_SIZE', 2)
+    near_duplicates.clear_signature_cache()
+    yield
+    near_duplicates.clear_signature_cache()
+
+
+def test_repeated_text_reuses_signature():
+    assinatura = near_duplicates.signature(TEXTO)
+
+    assert near_duplicates.signature(TEXTO) is assinatura
+    assert (assinatura == near_duplicates._calcular_assinatura(TEXTO, 128, 5)).all()
+
+
+def test_cache_keeps_digests_not_texts():
+    near_duplicates.signature(TEXTO)
+
+    (chave,) = near_duplicates._assinaturas
+    assert TEXTO not in chave
+    assert len(chave[0]) == 16
+
+
+def test_cache_is_bounded_lru():
+    antigo = near_duplicates.signature(TEXTO)
+    near_duplicates.signature(TEXTO + ' 1')
+    near_duplicates.signature(TEXTO)
+    near_duplicates.signature(TEXTO + ' 2')
+
+    assert len(near_duplicates._assinaturas) == 2
+    # O menos usado recentemente (TEXTO + ' 1') saiu; TEXTO continua no cache
+    assert near_duplicates.signature(TEXTO) is antigo
+
+
+def test_text_without_shingles_has_no_signature():
+    assert near_duplicates.signature('   ') is None
@@ -0,0 +1,90 @@
+"""
+Com o cache de resultados ativo, os documentos buscados para a chave são os mesmos passados à
+validação: cada documento é buscado uma vez e não conta como reaproveitamento.
+"""
+import pytest
+
+import ValidateDocument
+import result_cache
+from mei_validate import mei_validate
+
+ENDERECO = {'cep': '01310-100', 'rua': 'AVENIDA PAULISTA', 'numero': '1000', 'complemento': 'SALA 1',
+            'bairro': 'BELA VISTA', 'cidade': 'SAO PAULO', 'estado': 'SP'}
+MEI = {
+    'razao_social': 'ACME COMERCIO LTDA', 'cnpj': '12.345.678/0001-90', 'endereco_empresa': ENDERECO,
+    'nome': 'JOAO DA SILVA', 'cpf': '123.456.789-00', 'situacao_cadastral': 'ATIVA', 'numero_cnae': '4751-2/01',
+    'data_situacao_cadastral': '01-01-2020', 'data_abertura_empresa': '01-01-2020',
+}
+DOCS = {
+    'rg': {'nome': 'JOAO DA SILVA', 'cpf': '12345678900'},
+    'cnh': {'nome': 'JOAO DA SILVA', 'cpf': '12345678900'},
+}
+
+
+class CountingMongo:
+    requests = []
+
+    def __init__(self):
+        self.reads = 0
+
+    def lookup_parent_company(self, uuid):
+        self.reads += 1
+        return None
+
+    def request_data_mongodb(self, document_type, document_label, uuid):
+        self.reads += 1
+        self.requests.append(document_type)
+        doc = DOCS.get(document_type)
+        return dict(doc) if doc is not None else None
+
+
+@pytest.fixture
+def validator(monkeypatch, tmp_path):
+    monkeypatch.setattr(ValidateDocument, 'MongoDBConnections', CountingMongo)
+    monkeypatch.setattr(result_cache, 'RESULT_CACHE', 'disk')
+    monkeypatch.setattr(result_cache, 'RESULT_CACHE_DIR', str(tmp_path))
+    CountingMongo.requests = []
+    validator = mei_validate(MEI, dict(MEI), 'regras')
+    validator.parallel_validations = False
+    return validator
+
+
+def _record(validator, nome):
+    return next(rec for rec in validator._metrics.records if rec['validator'] == nome)
+
+
+def test_cache_key_docs_are_reused_by_the_validation(validator):
+    validator.validate(only=['validacao_nome'])
+
+    assert sorted(CountingMongo.requests) == ['cnh', 'rg']
+    assert _record(validator, 'validacao_nome')['required_docs_hits'] == 0
+    assert _record(validator, 'validacao_nome')['mongo_reads'] == 3
+
+
+def test_cached_result_fetches_docs_only_for_the_key(validator):
+    primeiro = validator.validate(only=['validacao_nome'])
+    segundo = mei_validate(MEI, dict(MEI), 'regras')
+    segundo.parallel_validations = False
+
+    assert segundo.validate(only=['validacao_nome']) == primeiro
+    assert sorted(CountingMongo.requests) == ['cnh', 'cnh', 'rg', 'rg']
+    assert _record(segundo, 'validacao_nome')['required_docs_hits'] == 0
+
+
+class UnavailableMongo(CountingMongo):
+
+    def lookup_parent_company(self, uuid):
+        self.reads += 1
+        self.requests.append('parent_company')
+        raise TimeoutError('dublê: timeout de seleção de servidor')
+
+
+def test_unavailable_mongo_is_not_fetched_again(validator, monkeypatch):
+    monkeypatch.setattr(ValidateDocument, 'MongoDBConnections', UnavailableMongo)
+    validator = mei_validate(MEI, dict(MEI), 'regras')
+    validator.parallel_validations = False
+
+    output = validator.validate(only=['validacao_nome'])
+
+    assert output['validacao_nome']['regras_subscricao_errors'] == 'SERVICO_INDISPONIVEL'
+    assert CountingMongo.requests == ['parent_company']
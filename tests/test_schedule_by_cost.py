@@ -0,0 +1,54 @@
+"""
+Ordem das validações com prazo (validate(deadline=...)) num container frio, sem custo histórico.
+"""
+import time
+
+import pytest
+
+import validation_metrics
+from ctps_validate import ctps_validate
+
+PESADA = 'validacao_fraude_docs_similares'
+
+
+@pytest.fixture
+def validator(monkeypatch):
+    monkeypatch.setattr(validation_metrics, '_historical_cost', {})
+    validator = ctps_validate.__new__(ctps_validate)
+    validator.message_type = 'regras'
+    validator.parallel_validations = False
+    return validator
+
+
+def test_cold_container_runs_heavy_validation_last(validator):
+    # A pesada declarada primeiro: a ordem não pode depender da declaração
+    validacoes = [PESADA] + [val for val in validator.get_validations_list() if val != PESADA]
+
+    agendadas = validator._schedule_by_cost(validacoes, 'ctps')
+
+    assert agendadas[-1] == PESADA
+    assert sorted(agendadas) == sorted(validacoes)
+
+
+def test_unknown_cost_is_not_free(validator):
+    restante = time.monotonic() + validation_metrics.UNKNOWN_COST_MS / 2000
+    assert validator._exceeds_deadline('validacao_nome', 'ctps', restante)
+    assert validator._exceeds_deadline(PESADA, 'ctps', time.monotonic() + 1)
+    assert not validator._exceeds_deadline('validacao_nome', 'ctps', time.monotonic() + 60)
+
+
+def test_history_replaces_default_cost(validator):
+    validation_metrics._historical_cost[('ctps', 'regras', PESADA)] = 1
+    validacoes = validator.get_validations_list()
+
+    assert validator._schedule_by_cost(validacoes, 'ctps')[0] == PESADA
+
+
+def test_cold_container_defers_heavy_validation_near_deadline(validator, monkeypatch):
+    executadas = []
+    monkeypatch.setattr(validator, '_run_single_validation', lambda val: executadas.append(val))
+
+    validator.validate(deadline=time.monotonic() + 2)
+
+    assert PESADA not in executadas
+    assert PESADA in validator.validacoes_adiadas
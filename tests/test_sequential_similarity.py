@@ -0,0 +1,45 @@
+"""
+Decisões da métrica 'sequential' (SimilarTextValidator) no backend padrão: as mesmas do
+SequenceMatcher.ratio() completo, inclusive nos pares em que o rapidfuzz decidiria diferente.
+"""
+from difflib import SequenceMatcher
+
+import pytest
+
+import fraud_tools
+from fraud_tools import SimilarTextValidator
+
+BASE = 'CARTEIRA DE TRABALHO NOME JOAO DA SILVA CPF 123.456.789-00 ADMISSAO 01/02/2020 '
+# ratio() 0.885; o fuzz.ratio do rapidfuzz dá 0.923 e passaria do limiar padrão (0.9)
+DIVERGENTE = 'CARTEIRA DE TRA4ALHO NOME JOAO DA SILVA C3FB23.456.7809-00 ADMISSAO 010222/0 '
+PARES = [
+    (BASE, BASE),
+    (BASE, DIVERGENTE),
+    (BASE, BASE.replace('JOAO', 'JOSE')),
+    (BASE, BASE[:40]),
+    (BASE, 'COMPROVANTE DE RESIDENCIA RUA DAS FLORES 100 SAO PAULO SP'),
+    (BASE, ''),
+]
+
+
+@pytest.fixture
+def validator():
+    return SimilarTextValidator([{'nome': 'doc_1', 'extracted_text': DIVERGENTE}])
+
+
+def test_default_backend_is_difflib():
+    assert fraud_tools.SIMILARITY_BACKEND == 'difflib'
+
+
+@pytest.mark.parametrize('threshold', [0.5, 0.85, 0.9, 0.95])
+def test_cascade_keeps_full_ratio_decisions(validator, threshold):
+    for text1, text2 in PARES:
+        completo = SequenceMatcher(None, text1, text2).ratio()
+        esperado = completo if completo > threshold else 0.0
+        assert validator.sequential_similarity(text1, text2, threshold) == esperado
+
+
+def test_divergent_pair_follows_sequence_matcher(validator):
+    assert validator.sequential_similarity(BASE, DIVERGENTE) == pytest.approx(0.8846, abs=1e-4)
+    assert validator.validate({'extracted_text': BASE}, threshold=0.9) == []
+    assert validator.validate({'extracted_text': BASE}, threshold=0.85) == [{'nome': 'doc_1', 'score': 88}]
@@ -0,0 +1,49 @@
+"""
+Comparação aproximada dos rols de nomes da GFIP (name_matching.compare_sets, gfip_novo._set_comparison).
+"""
+import pytest
+
+from gfip_novo_validate import Name, gfip_novo_validate
+from name_matching import BlockingIndex, blocking_keys, compare_sets
+
+# Pares com norm_score >= 90 e erros de OCR no primeiro e no último nome, que as chaves de
+# prefixo/sufixo de 3 caracteres e de nome inteiro não juntam
+ERROS_NAS_PONTAS = [('LUCAS FREITAS BARBOSA NUNES', 'LUAS FREITAS BARBOSA NENES'),
+                    ('FRANCISCA ROCHA', 'FRAECISCA ROHA'), ('FRANCISCO ALVES', 'FRANCISCO ELVAS')]
+
+
+@pytest.mark.parametrize('nome_a, nome_b', ERROS_NAS_PONTAS)
+def test_blocking_finds_names_with_errors_at_both_ends(nome_a, nome_b):
+    assert blocking_keys(nome_a) & blocking_keys(nome_b)
+    assert BlockingIndex([nome_b, 'MARIA DA SILVA']).contains(nome_a, 90)
+
+
+def test_pairs_with_errors_at_both_ends_are_not_missing():
+    proposta = [a for a, _ in ERROS_NAS_PONTAS] + ['MARIA DA SILVA']
+    documento = [b for _, b in ERROS_NAS_PONTAS] + ['MARIA DA SILVA']
+
+    assert compare_sets(proposta, documento, 'interseccao_completa', 90) == []
+
+
+def test_missing_names_are_still_reported():
+    faltantes = compare_sets(['MARIA DA SILVA', 'JOAO PEREIRA'], ['MARIA DA SILVA'], 'interseccao_completa', 90)
+    assert faltantes == ['JOAO PEREIRA']
+
+
+def test_names_that_are_not_text_are_unmatched():
+    proposta = ['MARIA DA SILVA', None]
+    documento = [None, 'MARIA DA SILVA']
+
+    assert compare_sets(proposta, documento, 'somente_proposta', 90) == [None]
+    assert compare_sets(proposta, documento, 'interseccao_completa', 90) == [None, None]
+
+
+def test_gfip_set_comparison_with_missing_name():
+    validator = gfip_novo_validate.__new__(gfip_novo_validate)
+    proposta = {Name('MARIA DA SILVA', 90), Name(None, 90)}
+    documento = {Name('MARIA DA SILVA', 90)}
+
+    resultado = validator._set_comparison(proposta, documento, 'somente_proposta', limiar=90)
+
+    assert resultado['valid'] is False
+    assert resultado['trecho_procurado'] == '[None]'
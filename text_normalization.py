@@ -0,0 +1,129 @@
+import functools
+import os
+import re
+
+import unidecode
+
+# nltk é importado no primeiro uso para reduzir o cold start
+
+NLTK_DATA_PATH = os.environ.get('NLTK_DATA_PATH', '/opt/nltk_data')
+TEXT_NORMALIZATION_CACHE_SIZE = int(os.environ.get('TEXT_NORMALIZATION_CACHE_SIZE', '8192'))
+# Tokenizador de word_tokenize/tokens: 'regex' (padrão, com o nltk só nos casos que ele não cobre) ou 'nltk'
+TEXT_TOKENIZER = os.environ.get('TEXT_TOKENIZER', 'regex')
+
+# Caracteres que o tokenizador por regex sabe tratar como o Treebank do nltk: letras, dígitos,
+# espaços e a pontuação que o Treebank apenas separa (ou mantém na palavra)
+_CARACTERES_REGEX = re.compile(r'[\w\s.,:;@#$%&/\-+=()\[\]{}<>]*')
+# Sequências em que as regras do Treebank dependem da ordem de aplicação ou de contrações do inglês
+_SEQUENCIAS_NLTK = re.compile(r'\.\.|--|[,:][,:]|\.(?![\w\s])|\b(?:cannot|gimme|gonna|gotta|lemme|wanna)\b',
+                              re.IGNORECASE)
+# Ponto seguido de outra palavra: candidato a fim de frase para o Punkt
+_PONTO_SEGUIDO = re.compile(r'(\S*)\.(?=\s+(\S))')
+_INICIAL = re.compile(r'[^\W\d_]')
+_TOKEN = re.compile(r'[;@#$%&()\[\]{}<>]|[,:](?!\d)|(?:[^\s;@#$%&()\[\]{}<>,:]|[,:](?=\d))+')
+
+
+@functools.lru_cache(maxsize=None)
+def _nltk():
+    """
+    Importa o nltk e registra o diretório de dados uma única vez por container
+    (antes cada distances() acrescentava o caminho de novo em nltk.data.path).
+    """
+    import nltk
+
+    if NLTK_DATA_PATH not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_PATH)
+    return nltk
+
+
+@functools.lru_cache(maxsize=None)
+def stop_words(language='portuguese'):
+    """
+    Stopwords do nltk para o idioma, carregadas uma vez e compartilhadas (frozenset).
+    """
+    _nltk()
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words(language))
+
+
+@functools.lru_cache(maxsize=None)
+def _word_tokenize():
+    _nltk()
+    from nltk.tokenize import word_tokenize
+
+    return word_tokenize
+
+
+def nltk_word_tokenize(text, language='english'):
+    """
+    nltk.tokenize.word_tokenize, com o caminho de dados do nltk já configurado.
+    """
+    return _word_tokenize()(text, language=language)
+
+
+def regex_tokenizable(text):
+    """
+    Se regex_word_tokenize dá para text os mesmos tokens do nltk sem precisar dele.
+
+    O nltk separa o texto em frases (Punkt) e cada frase em palavras (Treebank). Para os nomes e
+    textos de OCR comparados aqui, a única quebra de frase possível é um ponto seguido de outra
+    palavra; o único caso aceito é a inicial de um nome ('maria a. silva'), que o Punkt não
+    trata como fim de frase quando a palavra seguinte é minúscula. Abreviações como 'ltda.' ou
+    'cia.' no meio do texto dependem do modelo do Punkt e ficam com o nltk.
+    """
+    if not _CARACTERES_REGEX.fullmatch(text) or _SEQUENCIAS_NLTK.search(text):
+        return False
+    for palavra, seguinte in _PONTO_SEGUIDO.findall(text):
+        if len(palavra) != 1 or not _INICIAL.match(palavra) or not seguinte[0].islower():
+            return False
+    return True
+
+
+def regex_word_tokenize(text, language='english'):
+    """
+    Os mesmos tokens de nltk_word_tokenize com uma única regex compilada: pontuação como
+    ;@#$%& e parênteses em tokens próprios, vírgula e dois-pontos separados quando não vêm antes
+    de um dígito e o ponto final do texto separado da última palavra. Textos fora do que
+    regex_tokenizable cobre são repassados ao nltk.
+    """
+    if not regex_tokenizable(text):
+        return nltk_word_tokenize(text, language=language)
+    resultado = _TOKEN.findall(text)
+    if resultado and len(resultado[-1]) > 1 and resultado[-1].endswith('.'):
+        resultado[-1:] = [resultado[-1][:-1], '.']
+    return resultado
+
+
+def word_tokenize(text, language='english'):
+    """
+    Tokens de text como o nltk.tokenize.word_tokenize, pelo tokenizador de TEXT_TOKENIZER.
+    """
+    if TEXT_TOKENIZER == 'nltk':
+        return nltk_word_tokenize(text, language=language)
+    return regex_word_tokenize(text, language=language)
+
+
+@functools.lru_cache(maxsize=TEXT_NORMALIZATION_CACHE_SIZE)
+def fold(value):
+    """
+    value sem acentos e em minúsculas, como unidecode.unidecode(value).lower().
+    """
+    return unidecode.unidecode(value).lower()
+
+
+@functools.lru_cache(maxsize=TEXT_NORMALIZATION_CACHE_SIZE)
+def tokens(value):
+    """
+    Tokens de value segundo o word_tokenize (tupla, para poder ser compartilhada).
+    """
+    return tuple(word_tokenize(value))
+
+
+@functools.lru_cache(maxsize=TEXT_NORMALIZATION_CACHE_SIZE)
+def content_tokens(value):
+    """
+    tokens(value) sem as stopwords em português.
+    """
+    stop = stop_words()
+    return tuple(token for token in tokens(value) if token not in stop)
@@ -1,12 +1,12 @@
-from dataclasses import dataclass
 from typing import Optional
 import re
 import datetime
-from dateutil.relativedelta import relativedelta
 from Distances import distances
+from models import document_model
+from normalized_fields import digits
 
 
-@dataclass
+@document_model
 class Endereco:
     cep: str
     rua: str
@@ -20,12 +20,21 @@ class Endereco:
 class Validacao_endereco:
     
     def __init__(self, cartao_proposta_endereco, dados_extraidos_endereco):
-        self.cartao_proposta = Endereco(**cartao_proposta_endereco)
-        self.dados_extraidos = Endereco(**dados_extraidos_endereco)
+        # Cópias locais: validar_numero e _preprocessamento_complemento alteram numero/complemento
+        # apenas aqui, sem afetar os dados_extraidos do validador que chamou
+        self.cartao_proposta = self._copia_endereco(cartao_proposta_endereco)
+        self.dados_extraidos = self._copia_endereco(dados_extraidos_endereco)
+
+    @staticmethod
+    def _copia_endereco(endereco):
+        # Os modelos convertem os campos anotados como Endereco (no acesso); os demais chegam como dict
+        if isinstance(endereco, Endereco):
+            endereco = endereco.to_dict()
+        return Endereco.from_dict(endereco)
     
     def validar_cep(self):
-        s1 = ''.join(re.findall( r'\d+', self.cartao_proposta.cep))
-        s2 = ''.join(re.findall(r'\d+', self.dados_extraidos.cep))
+        s1 = digits(self.cartao_proposta.cep)
+        s2 = digits(self.dados_extraidos.cep)
         if s1 == s2:
             return True
         else:
@@ -36,7 +45,7 @@ class Validacao_endereco:
         s1 = self.cartao_proposta.rua
         s2 = self.dados_extraidos.rua
         
-        sim_score = distances(s1.upper(), s2.upper()).norm_score()
+        sim_score = distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar)
         if sim_score >=limiar:
             return True
         else:
@@ -88,7 +97,7 @@ class Validacao_endereco:
         s1 = self._preprocessamento_complemento(s1)
         s2 = self._preprocessamento_complemento(s2)
         
-        sim_score = distances(s1.upper(), s2.upper()).norm_score()
+        sim_score = distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar)
         if sim_score >= limiar:
             return True
         else:
@@ -99,7 +108,7 @@ class Validacao_endereco:
         s1 = self.cartao_proposta.bairro
         s2 = self.dados_extraidos.bairro
         
-        sim_score = distances(s1.upper(), s2.upper()).norm_score()
+        sim_score = distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar)
         if sim_score >= limiar:
             return True
         else:
@@ -109,7 +118,7 @@ class Validacao_endereco:
         s1 = self.cartao_proposta.cidade
         s2 = self.dados_extraidos.cidade
         
-        sim_score = distances(s1.upper(), s2.upper()).norm_score()
+        sim_score = distances(s1.upper(), s2.upper()).norm_score(cutoff=limiar)
         if sim_score >= limiar:
             return True
         else:
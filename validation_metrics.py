@@ -0,0 +1,128 @@
+import json
+import os
+import time
+
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'DocumentoRag')
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() not in {'false', '0', 'no'}
+
+METRIC_DEFINITIONS = [
+    {'Name': 'WallTime', 'Unit': 'Milliseconds'},
+    {'Name': 'CpuTime', 'Unit': 'Milliseconds'},
+    {'Name': 'MongoReads', 'Unit': 'Count'},
+    {'Name': 'RequiredDocsHits', 'Unit': 'Count'},
+    {'Name': 'ScoreMemoLookups', 'Unit': 'Count'},
+    {'Name': 'ScoreMemoHits', 'Unit': 'Count'},
+    {'Name': 'Invocations', 'Unit': 'Count'},
+]
+DIMENSIONS = ['document_type', 'message_type', 'validator']
+
+# Custo histórico (média móvel exponencial do tempo de parede, em ms) de cada validação,
+# mantido enquanto o container do Lambda estiver quente
+COST_EWMA_ALPHA = 0.3
+_historical_cost = {}
+
+# Custo inicial (ms) das validações sabidamente caras, usado enquanto o container ainda não tem
+# histórico (cold start). VALIDATION_DEFAULT_COSTS (JSON {validação: ms}) complementa ou substitui
+# estes valores, por exemplo com custos medidos em produção.
+DEFAULT_COSTS_MS = {
+    'validacao_fraude_docs_similares': 3000,
+    **json.loads(os.environ.get('VALIDATION_DEFAULT_COSTS', '{}'))
+}
+# Custo assumido para validações sem histórico nem custo inicial: desconhecido conta como caro
+UNKNOWN_COST_MS = float(os.environ.get('VALIDATION_UNKNOWN_COST_MS', '1000'))
+
+
+def estimated_cost_ms(document_type, message_type, validator):
+    """
+    Custo histórico da validação neste container ou, sem histórico, o custo inicial de
+    DEFAULT_COSTS_MS; None se não houver nenhum dos dois.
+    """
+    cost = _historical_cost.get((document_type, message_type, validator))
+    return cost if cost is not None else DEFAULT_COSTS_MS.get(validator)
+
+
+class ValidationMetrics:
+    """
+    Acumula as métricas de cada validação executada para uma mensagem
+    (tempo de parede, tempo de CPU, código de resultado, leituras no Mongo, documentos
+    de required_docs reaproveitados e consultas/acertos do memo de norm_score)
+    e as emite no formato EMF (Embedded Metric Format) do CloudWatch.
+
+    O EMF só aceita um valor por dimensão em cada documento, então cada validação
+    gera o seu próprio documento; todos são escritos juntos, num único print, ao
+    final da mensagem.
+    """
+
+    def __init__(self, document_type, message_type):
+        self.document_type = document_type
+        self.message_type = message_type
+        self.records = []
+
+    def record(self, validator, wall_ms, cpu_ms, result_code, mongo_reads=0, required_docs_hits=0,
+               score_memo_lookups=0, score_memo_hits=0, update_cost=True):
+        self.records.append({
+            'validator': validator,
+            'wall_ms': wall_ms,
+            'cpu_ms': cpu_ms,
+            'result_code': result_code,
+            'mongo_reads': mongo_reads,
+            'required_docs_hits': required_docs_hits,
+            'score_memo_lookups': score_memo_lookups,
+            'score_memo_hits': score_memo_hits
+        })
+
+        if not update_cost:
+            return
+        key = (self.document_type, self.message_type, validator)
+        previous = _historical_cost.get(key)
+        _historical_cost[key] = wall_ms if previous is None else \
+            COST_EWMA_ALPHA * wall_ms + (1 - COST_EWMA_ALPHA) * previous
+
+    def to_emf(self):
+        timestamp = int(time.time() * 1000)
+        documents = []
+        for rec in self.records:
+            documents.append({
+                '_aws': {
+                    'Timestamp': timestamp,
+                    'CloudWatchMetrics': [{
+                        'Namespace': METRICS_NAMESPACE,
+                        'Dimensions': [DIMENSIONS],
+                        'Metrics': METRIC_DEFINITIONS
+                    }]
+                },
+                'document_type': self.document_type,
+                'message_type': self.message_type,
+                'validator': rec['validator'],
+                'result_code': rec['result_code'],
+                'WallTime': round(rec['wall_ms'], 3),
+                'CpuTime': round(rec['cpu_ms'], 3),
+                'MongoReads': rec['mongo_reads'],
+                'RequiredDocsHits': rec['required_docs_hits'],
+                'ScoreMemoLookups': rec['score_memo_lookups'],
+                'ScoreMemoHits': rec['score_memo_hits'],
+                'Invocations': 1
+            })
+        return documents
+
+    def emit(self):
+        if not METRICS_ENABLED or not self.records:
+            return
+        # O Lambda encaminha o stdout sem prefixo para o CloudWatch, o que é exigido pelo EMF
+        print('\n'.join(json.dumps(doc, separators=(',', ':')) for doc in self.to_emf()), flush=True)
+
+
+class ValidationTimer:
+    """
+    Mede o tempo de parede e de CPU de um trecho de código.
+    """
+
+    def __init__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+
+    def elapsed_ms(self):
+        return (
+            (time.perf_counter() - self.wall_start) * 1000,
+            (time.thread_time() - self.cpu_start) * 1000
+        )
@@ -0,0 +1,139 @@
+import cProfile
+import json
+import logging
+import marshal
+import os
+import pstats
+import random
+import tempfile
+import threading
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Tipo de captura: '' (desligado), 'cpu' (cProfile), 'memory' (tracemalloc) ou 'all'
+PROFILING_MODE = os.environ.get('VALIDATION_PROFILING', '').lower()
+# Fração das mensagens que é perfilada (0.01 = 1%)
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', '0.01'))
+# Diretório local ou prefixo no S3 (s3://bucket/prefixo) onde os perfis são gravados
+PROFILING_OUTPUT = os.environ.get('PROFILING_OUTPUT', os.path.join(tempfile.gettempdir(), 'validation_profiles'))
+PROFILING_TOP_ALLOCATIONS = int(os.environ.get('PROFILING_TOP_ALLOCATIONS', '10'))
+
+CPU_PROFILING = PROFILING_MODE in {'cpu', 'all'}
+MEMORY_PROFILING = PROFILING_MODE in {'memory', 'all'}
+
+# Os perfis são acumulados enquanto o container estiver quente; cada container grava os próprios arquivos
+_CONTAINER_ID = uuid.uuid4().hex[:12]
+_lock = threading.Lock()
+_cpu_stats = {}
+_allocations = {}
+
+
+def should_sample():
+    return (CPU_PROFILING or MEMORY_PROFILING) and random.random() < PROFILING_SAMPLE_RATE
+
+
+def _write(relative_path, data):
+    if PROFILING_OUTPUT.startswith('s3://'):
+        import boto3
+
+        bucket, _, prefix = PROFILING_OUTPUT[len('s3://'):].partition('/')
+        key = '/'.join(part for part in (prefix.strip('/'), relative_path) if part)
+        boto3.client('s3').put_object(Bucket=bucket, Key=key, Body=data)
+    else:
+        path = os.path.join(PROFILING_OUTPUT, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+class ValidationProfiler:
+    """
+    Perfil de CPU (cProfile) e de alocações (tracemalloc) das validações de uma mensagem amostrada.
+
+    Os resultados são somados aos das mensagens anteriores do mesmo document_type neste container
+    e gravados em PROFILING_OUTPUT ao final da mensagem:
+    - <document_type>/<validação>/<container>.pstats: estatísticas do cProfile (abrir com pstats.Stats);
+    - <document_type>/<container>.allocations.json: pico de memória e linhas que mais alocaram por validação.
+    """
+
+    def __init__(self, document_type):
+        self.document_type = document_type
+        self.validators = set()
+        self._started_tracemalloc = False
+        if MEMORY_PROFILING and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @contextmanager
+    def capture(self, validator):
+        snapshot = None
+        if MEMORY_PROFILING:
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+        profile = cProfile.Profile() if CPU_PROFILING else None
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            try:
+                self._collect(validator, profile, snapshot)
+            except Exception as e:
+                logger.warning(f'[WARN] Falha ao coletar o perfil de {validator}: {e}')
+
+    def _collect(self, validator, profile, snapshot):
+        diff, peak = [], 0
+        if snapshot is not None:
+            _, peak = tracemalloc.get_traced_memory()
+            diff = tracemalloc.take_snapshot().compare_to(snapshot, 'lineno')
+
+        with _lock:
+            self.validators.add(validator)
+            if profile is not None:
+                key = (self.document_type, validator)
+                if key in _cpu_stats:
+                    _cpu_stats[key].add(profile)
+                else:
+                    _cpu_stats[key] = pstats.Stats(profile)
+
+            if snapshot is not None:
+                alloc = _allocations.setdefault(self.document_type, {}).setdefault(
+                    validator, {'samples': 0, 'peak_bytes_max': 0, 'lines': {}})
+                alloc['samples'] += 1
+                alloc['peak_bytes_max'] = max(alloc['peak_bytes_max'], peak)
+                for stat in diff:
+                    if stat.size_diff > 0:
+                        line = str(stat.traceback[0])
+                        alloc['lines'][line] = alloc['lines'].get(line, 0) + stat.size_diff
+
+    def flush(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        try:
+            with _lock:
+                files = {}
+                for validator in self.validators:
+                    stats = _cpu_stats.get((self.document_type, validator))
+                    if stats is not None:
+                        files[f'{self.document_type}/{validator}/{_CONTAINER_ID}.pstats'] = marshal.dumps(stats.stats)
+
+                if self.document_type in _allocations:
+                    report = {}
+                    for validator, alloc in _allocations[self.document_type].items():
+                        top = sorted(alloc['lines'].items(), key=lambda x: x[1], reverse=True)[:PROFILING_TOP_ALLOCATIONS]
+                        report[validator] = {
+                            'samples': alloc['samples'],
+                            'peak_bytes_max': alloc['peak_bytes_max'],
+                            'top_allocations': [{'line': line, 'bytes': size} for line, size in top]
+                        }
+                    files[f'{self.document_type}/{_CONTAINER_ID}.allocations.json'] = json.dumps(report, indent=2).encode('utf-8')
+
+            for relative_path, data in files.items():
+                _write(relative_path, data)
+        except Exception as e:
+            logger.warning(f'[WARN] Falha ao gravar os perfis de {self.document_type}: {e}')